@@ -0,0 +1,63 @@
+#!/usr/bin/python
+"""
+Benchmark of build-db with and without bulk mode (--bulk)
+
+Imports the same dependency-closed subset of datafiles into fresh scratch databases, once
+committing every write and once in bulk mode, compares the wall-clock time and checks that both
+databases end up with the same content.
+
+Usage: python bin/benchmarks/bulk_import.py [--size N] [--bulk-batch-size N]
+"""
+import argparse
+import tempfile
+
+import common
+
+from lokaord import handlers
+from lokaord import importer
+from lokaord.database import db
+
+
+def import_subset(datafiles: list[str], bulk_batch_size: int | None) -> float:
+	"""
+	import @datafiles into a fresh scratch database, in bulk mode with @bulk_batch_size unless it
+	is None, returns wall-clock seconds
+	"""
+	with common.Timer() as timer:
+		with handlers.kennistrengur_resolver(), handlers.datafile_cache():
+			if bulk_batch_size is None:
+				importer.import_list_of_datafiles_to_db(datafiles)
+			else:
+				with db.bulk_mode(bulk_batch_size):
+					importer.import_list_of_datafiles_to_db(datafiles)
+	return timer.seconds
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark build-db with and without --bulk.')
+	parser.add_argument('--size', type=int, default=4000, help='Datafiles to seed subset with.')
+	parser.add_argument('--bulk-batch-size', type=int, default=500, help='Orð per commit.')
+	args = parser.parse_args()
+	common.init()
+	datafiles = common.get_subset(args.size)
+	print('Subset of %s datafiles.' % (len(datafiles), ))
+	with tempfile.TemporaryDirectory() as directory:
+		common.init_scratch_db(directory)
+		seconds = import_subset(datafiles, None)
+		tables = common.dump_tables()
+		print('%-40s %8.1fs' % ('build-db', seconds))
+		common.init_scratch_db(directory)
+		seconds_bulk = import_subset(datafiles, args.bulk_batch_size)
+		tables_bulk = common.dump_tables()
+		print('%-40s %8.1fs' % (
+			'build-db --bulk --bulk-batch-size %s' % (args.bulk_batch_size, ), seconds_bulk
+		))
+		db.Session.remove()
+		db.Engine.dispose()
+	print('Speedup %.1fx, database content %s.' % (
+		seconds / seconds_bulk, 'identical' if tables == tables_bulk else 'DIFFERS'
+	))
+
+
+if __name__ == '__main__':
+	main()
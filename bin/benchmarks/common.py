@@ -0,0 +1,124 @@
+#!/usr/bin/python
+"""
+Shared benchmark functionality
+
+Picking dependency-closed subsets of datafiles and setting up scratch databases to import them
+into, so benchmarks don't touch the database in "lokaord/database/disk".
+"""
+import os
+import sys
+import time
+
+import sqlalchemy
+
+Repo_Dir = os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..'))
+sys.path.insert(0, Repo_Dir)
+
+from lokaord import handlers  # noqa: E402
+from lokaord import logman  # noqa: E402
+from lokaord import manifest  # noqa: E402
+from lokaord.database import db  # noqa: E402
+
+
+def init(loglevel: str = 'warn'):
+	"""
+	run from repository root, like main.py, with cli logging only
+	"""
+	os.chdir(Repo_Dir)
+	logman.init('benchmark', level=loglevel, log_to_file=False)
+
+
+def get_datafiles_index() -> dict[str, str]:
+	"""
+	Usage:  index = get_datafiles_index()
+	Before: Nothing.
+	After:  @index is a dict of kennistrengur -> datafile path (relative to
+			"lokaord/database/data") for every datafile, read from the datafile tails.
+	"""
+	index = {}
+	for datafile, _ in manifest.walk_datafiles(handlers.Ord.datafiles_dir):
+		kennistrengur, _ = handlers.read_datafile_tail(
+			os.path.join(handlers.Ord.datafiles_dir, datafile)
+		)
+		index[kennistrengur] = datafile
+	return index
+
+
+def get_subset(size: int, index: dict[str, str] = None) -> list[str]:
+	"""
+	Usage:  datafiles = get_subset(size, index)
+	Before: @size is the amount of datafiles to seed the subset with, @index is optional result of
+			get_datafiles_index.
+	After:  @datafiles is a sorted list of every @size-th fraction of all datafiles (evenly spread
+			over orðflokkar) together with the orðhlutar of samsett orð and the frasi of
+			skammstafanir they depend on, transitively, so it can be imported to an empty
+			database.
+	"""
+	if index is None:
+		index = get_datafiles_index()
+	all_datafiles = sorted(index.values())
+	step = max(len(all_datafiles) // max(size, 1), 1)
+	datafiles = set()
+	stack = all_datafiles[::step]
+	while len(stack) > 0:
+		datafile = stack.pop()
+		if datafile in datafiles:
+			continue
+		datafiles.add(datafile)
+		data = handlers.Ord.load_json(datafile)
+		stack += [index[ohl['kennistrengur']] for ohl in data.get('samsett') or []]
+		stack += [index[kennistrengur] for kennistrengur in data.get('frasi') or []]
+	return sorted(datafiles)
+
+
+def init_scratch_db(directory: str):
+	"""
+	Usage:  init_scratch_db(directory)
+	Before: @directory is an existing directory.
+	After:  Database connection is set up for an empty SQLite database file "db.sqlite" within
+			@directory, replacing the connection and any database file there before.
+	"""
+	sqlite_db_file = os.path.join(directory, 'db.sqlite')
+	if db.Session is not None:
+		db.Session.remove()
+		db.Engine.dispose()
+	if os.path.isfile(sqlite_db_file):
+		os.remove(sqlite_db_file)
+	db.setup_connection('sqlite:///%s' % (sqlite_db_file, ))
+	db.init_db()
+	handlers.set_fallbeyging_dedup(False)
+	# derived beygingar cached from the previous database would make runs after the first faster
+	handlers.Ordhluti_Beygingar_Cache.clear()
+	handlers.Ordhluti_Beygingar_Cache_Keys.clear()
+
+
+def dump_tables() -> dict[str, list[tuple]]:
+	"""
+	Usage:  tables = dump_tables()
+	Before: Database connection has been set up.
+	After:  @tables is a dict of table name -> sorted list of rows, without the Edited and Created
+			timestamp columns, for comparing databases built in different ways.
+	"""
+	tables = {}
+	for table in db.Base.metadata.sorted_tables:
+		columns = [column for column in table.columns if column.name not in ('Edited', 'Created')]
+		tables[table.name] = sorted(
+			(tuple(row) for row in db.Session.execute(sqlalchemy.select(*columns))), key=repr
+		)
+	return tables
+
+
+class Timer:
+	"""
+	with Timer() as timer:
+		..
+	timer.seconds
+	"""
+
+	def __enter__(self):
+		self.started = time.perf_counter()
+		self.seconds = None
+		return self
+
+	def __exit__(self, *args):
+		self.seconds = time.perf_counter() - self.started
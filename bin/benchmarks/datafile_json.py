@@ -0,0 +1,83 @@
+#!/usr/bin/python
+"""
+Benchmark of writing datafile JSON
+
+Parses datafiles with Decimal floats, as load_json does, and times writing all of them with
+dumps_datafile_json and with the reference encoder in tests/datafile_json_reference.py (the
+MyIndentJSONEncoder before dumps_datafile_json), alternating runs. Outputs of both are compared
+with the datafiles on disk. No database is needed.
+
+Usage: python bin/benchmarks/datafile_json.py [--files N] [--repeat N]
+"""
+import argparse
+from decimal import Decimal
+import json
+import os
+import sys
+
+import common
+
+from lokaord import handlers
+from lokaord import manifest
+
+sys.path.insert(0, os.path.join(common.Repo_Dir, 'tests'))
+import datafile_json_reference  # noqa: E402
+
+
+def time_dumps(dumps, documents: list[dict]) -> float:
+	"""
+	write every document in @documents with @dumps, returns wall-clock seconds
+	"""
+	with common.Timer() as timer:
+		for data in documents:
+			dumps(data)
+	return timer.seconds
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark writing datafile JSON.')
+	parser.add_argument('--files', type=int, help='Datafiles to use, every one by default.')
+	parser.add_argument('--repeat', type=int, default=3, help='Runs, best one is reported.')
+	args = parser.parse_args()
+	common.init()
+	contents = []
+	for datafile, _ in manifest.walk_datafiles(handlers.Ord.datafiles_dir):
+		filename_abs = os.path.join(handlers.Ord.datafiles_dir, datafile)
+		with open(filename_abs, mode='r', encoding='utf-8') as fi:
+			contents.append((datafile, fi.read()))
+		if args.files is not None and len(contents) >= args.files:
+			break
+	documents = [json.loads(content, parse_float=Decimal) for _, content in contents]
+	megabytes = sum(len(content.encode('utf-8')) for _, content in contents) / 1e6
+	mismatches = [
+		datafile for (datafile, content), data in zip(contents, documents) if (
+			handlers.dumps_datafile_json(data) != content or
+			datafile_json_reference.dumps(data) != content
+		)
+	]
+	print('%s datafiles (%.1f MB), %s not written as on disk.' % (
+		len(contents), megabytes, len(mismatches)
+	))
+	for datafile in mismatches:
+		print('  %s' % (datafile, ))
+	seconds_reference = None
+	seconds = None
+	for _ in range(args.repeat):
+		run_seconds_reference = time_dumps(datafile_json_reference.dumps, documents)
+		run_seconds = time_dumps(handlers.dumps_datafile_json, documents)
+		if seconds is None or run_seconds < seconds:
+			seconds = run_seconds
+		if seconds_reference is None or run_seconds_reference < seconds_reference:
+			seconds_reference = run_seconds_reference
+	print('%-40s %8.0f docs/s %6.1f MB/s' % (
+		'reference encoder', len(documents) / seconds_reference, megabytes / seconds_reference
+	))
+	print('%-40s %8.0f docs/s %6.1f MB/s' % (
+		'dumps_datafile_json', len(documents) / seconds, megabytes / seconds
+	))
+	if len(mismatches) > 0:
+		sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
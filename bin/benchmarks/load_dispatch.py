@@ -0,0 +1,74 @@
+#!/usr/bin/python
+"""
+Benchmark of loading orð data into structs, per orðflokkur
+
+Times Ord.load_from_dict on kjarna orð datafiles of each handler, once picking the struct by
+undirflokkur (see Ord.get_data_struct) and once trying every struct in the data annotation in
+order, as load_from_dict did before get_data_struct. Datafiles are parsed up front and samsett
+orð are left out, so only validation and hashing is timed, no database is needed.
+
+Usage: python bin/benchmarks/load_dispatch.py [--files N] [--repeat N]
+"""
+import argparse
+from contextlib import contextmanager
+
+import common
+
+from lokaord import handlers
+
+
+@contextmanager
+def without_dispatch(handler: handlers.Ord):
+	"""
+	make load_from_dict of @handler try every annotated struct, by hiding its get_data_struct
+	"""
+	handler.get_data_struct = classmethod(lambda cls, data: None)
+	try:
+		yield
+	finally:
+		del handler.get_data_struct
+
+
+def load_all(handler: handlers.Ord, documents: list[dict]) -> float:
+	"""
+	load every document in @documents with @handler, returns wall-clock seconds
+	"""
+	with common.Timer() as timer:
+		for data in documents:
+			handler().load_from_dict(data, derive_samsett=False)
+	return timer.seconds
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark load_from_dict struct dispatch.')
+	parser.add_argument('--files', type=int, default=2000, help='Datafiles per handler, at most.')
+	parser.add_argument('--repeat', type=int, default=3, help='Runs, best one is reported.')
+	args = parser.parse_args()
+	common.init()
+	print('%-12s %6s %14s %14s' % ('handler', 'files', 'every us/orð', 'dispatch us/orð'))
+	for handler in handlers.list_handlers():
+		if handler is handlers.Skammstofun:
+			continue
+		documents = []
+		for folder in handler.get_folders():
+			for datafile in handler.get_files_list(folder):
+				data = handlers.Ord.load_json(datafile)
+				if 'samsett' not in data:
+					documents.append(data)
+				if len(documents) >= args.files:
+					break
+			if len(documents) >= args.files:
+				break
+		if len(documents) == 0:
+			continue
+		with without_dispatch(handler):
+			seconds_every = min(load_all(handler, documents) for _ in range(args.repeat))
+		seconds_dispatch = min(load_all(handler, documents) for _ in range(args.repeat))
+		print('%-12s %6s %14.1f %14.1f' % (
+			handler.__name__, len(documents),
+			seconds_every / len(documents) * 1e6, seconds_dispatch / len(documents) * 1e6
+		))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,122 @@
+#!/usr/bin/python
+"""
+Differential check and benchmark of deriving samsett orð beygingar
+
+For every samsett orð in a database, derives its beygingar from its datafile with
+Ord.derive_beygingar_from_samsett and with the reference derivation in tests/samsett_reference.py
+(the derivation before prepend_to_beygingar), and checks that the datahash of both is the same.
+Then times both derivations per samsett orð, alternating runs, with a warm orðhluti beygingar
+cache.
+
+By default a subset of datafiles is imported into a scratch database first, with --db an existing
+database is used, for example the one build-db builds, to check the full corpus.
+
+Usage: python bin/benchmarks/samsett_derivation.py [--size N | --db FILE] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import common
+
+from lokaord import handlers
+from lokaord import importer
+from lokaord.database import db
+from lokaord.database.models import isl
+
+sys.path.insert(0, os.path.join(common.Repo_Dir, 'tests'))
+import samsett_reference  # noqa: E402
+
+
+def get_samsett_datafiles() -> list[tuple[handlers.Ord, str]]:
+	"""
+	(handler, datafile) of samsett orð in database, by Ord_id
+	"""
+	handlers_map = handlers.get_handlers_map()
+	samsett_datafiles = []
+	for isl_ord in db.Session.query(isl.Ord).filter_by(Samsett=True).order_by(isl.Ord.Ord_id):
+		handler = handlers_map[isl_ord.Ordflokkur.name]
+		samsett_datafiles.append((handler, handler().load_filename_from_db(isl_ord)))
+	return samsett_datafiles
+
+
+def compare(samsett_datafiles: list[tuple[handlers.Ord, str]]) -> list[str]:
+	"""
+	returns datafiles of @samsett_datafiles where the two derivations give different datahash
+	"""
+	mismatches = []
+	for handler, datafile in samsett_datafiles:
+		isl_ord = handler()
+		isl_ord.load_from_file(datafile)
+		if isl_ord.data.datahash != samsett_reference.load_ord(handler, datafile).data.datahash:
+			mismatches.append(datafile)
+	return mismatches
+
+
+def time_derivation(derive, ord_datas: list[tuple[handlers.Ord, dict]]) -> float:
+	"""
+	derive beygingar of every samsett orð in @ord_datas with @derive, returns wall-clock seconds
+	"""
+	with common.Timer() as timer:
+		for isl_ord, data in ord_datas:
+			derive(isl_ord, data)
+	return timer.seconds
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Compare and time samsett orð derivation.')
+	parser.add_argument('--size', type=int, default=4000, help='Datafiles to seed subset with.')
+	parser.add_argument('--db', help='Existing SQLite database file to use instead of a subset.')
+	parser.add_argument('--repeat', type=int, default=3, help='Runs, best one is reported.')
+	args = parser.parse_args()
+	db_file = None if args.db is None else os.path.abspath(args.db)
+	common.init()
+	with tempfile.TemporaryDirectory() as directory:
+		if db_file is None:
+			datafiles = common.get_subset(args.size)
+			print('Importing subset of %s datafiles.' % (len(datafiles), ))
+			common.init_scratch_db(directory)
+			with handlers.kennistrengur_resolver(), handlers.datafile_cache():
+				importer.import_list_of_datafiles_to_db(datafiles)
+		else:
+			db.setup_connection('sqlite:///%s' % (db_file, ))
+		samsett_datafiles = get_samsett_datafiles()
+		mismatches = compare(samsett_datafiles)
+		print('%s samsett orð, %s with different datahash.' % (
+			len(samsett_datafiles), len(mismatches)
+		))
+		for datafile in mismatches:
+			print('  %s' % (datafile, ))
+		ord_datas = []
+		for handler, datafile in samsett_datafiles:
+			isl_ord = handler()
+			isl_ord.load_from_dict(handlers.Ord.load_json(datafile), datafile, derive_samsett=False)
+			ord_datas.append((isl_ord, isl_ord.data.dict()))
+		seconds_reference = None
+		seconds = None
+		for _ in range(args.repeat):
+			run_seconds_reference = time_derivation(
+				samsett_reference.derive_beygingar_from_samsett, ord_datas
+			)
+			run_seconds = time_derivation(
+				lambda isl_ord, data: isl_ord.derive_beygingar_from_samsett(data), ord_datas
+			)
+			if seconds is None or run_seconds < seconds:
+				seconds = run_seconds
+			if seconds_reference is None or run_seconds_reference < seconds_reference:
+				seconds_reference = run_seconds_reference
+		db.Session.remove()
+		db.Engine.dispose()
+	print('%-40s %8.1f us/orð' % (
+		'reference derivation', seconds_reference / len(ord_datas) * 1e6
+	))
+	print('%-40s %8.1f us/orð' % (
+		'derive_beygingar_from_samsett', seconds / len(ord_datas) * 1e6
+	))
+	if len(mismatches) > 0:
+		sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
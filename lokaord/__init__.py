@@ -8,15 +8,20 @@ import pathlib
 import git
 import typer
 
+from lokaord import checkpoint
+from lokaord import dedup
 from lokaord import exporter
 from lokaord import handlers
 from lokaord import importer
+from lokaord import instrumentation
 from lokaord import logman
+from lokaord import manifest
 from lokaord import seer
 from lokaord import stats
 from lokaord import tui
+from lokaord import validator
 from lokaord.database import db
-from lokaord.exc import OrdToDeleteHasDependentsError
+from lokaord.exc import CheckpointError, OrdToDeleteHasDependentsError
 from lokaord.version import __version__  # noqa
 
 Name = 'lokaord'
@@ -46,6 +51,14 @@ class LogLevel(str, Enum):
 		return self.name
 
 
+class DbProfile(str, Enum):
+	default = 'default'
+	build = 'build'
+
+	def __str__(self):
+		return self.name
+
+
 class TimeOffset(str, Enum):
 	last2min = 'last2min'
 	last10min = 'last10min'
@@ -104,6 +117,7 @@ def use_backup(name: str = None, filename: str = None):
 		logman.info(f'Backup filename "{filename}.')
 	logman.info(f'Using backup in "{name}", filename "{filename}.sqlite".')
 	db.use_backup_sqlite_db_file(name, filename)
+	manifest.delete_manifest(Name)  # manifest describes the database being replaced
 	db.init(Name)
 	if (
 		filename in backup_handling['handling'] and
@@ -135,25 +149,96 @@ def use_backup(name: str = None, filename: str = None):
 		files_import = []
 		if 'files_import' in backup_handling['handling'][filename]:
 			files_import = backup_handling['handling'][filename]['files_import']
-		importer.import_changed_datafiles_since_commit_to_db(commit_id, files_import)
+		with handlers.kennistrengur_resolver(), handlers.datafile_cache():
+			importer.import_changed_datafiles_since_commit_to_db(commit_id, files_import)
 	logman.info('Backup ready for use.')
 
 
-def build_db(rebuild: bool = False, changes_only: bool = False, since_commit: str = None):
+def build_db(
+	rebuild: bool = False, changes_only: bool = False, since_commit: str = None,
+	bulk: bool = False, bulk_batch_size: int = 0, jobs: int = 1, use_manifest: bool = False,
+	doc_cache_size: int = 32768, resume: bool = False, dedup_fallbeygingar: bool = False,
+	db_profile: str = 'default'
+):
 	if rebuild is True:
 		db.delete_sqlite_db_file(Name)
+		manifest.delete_manifest(Name)
+		handlers.set_fallbeyging_dedup(dedup_fallbeygingar)
 	db.init(Name)
-	if since_commit is not None:
-		importer.import_changed_datafiles_since_commit_to_db(since_commit, [])
-	if changes_only is True:
-		importer.import_changed_datafiles_to_db()
-	else:
-		importer.import_datafiles_to_db()
+	if dedup_fallbeygingar is True and not handlers.is_fallbeyging_dedup():
+		dedup.dedup_fallbeygingar(vacuum=False)
+	resume_from = None
+	if resume is True:
+		resume_from = checkpoint.load_checkpoint(Name)
+		if resume_from is None:
+			raise CheckpointError('No checkpoint found to resume build-db from.')
+		checkpoint.verify_checkpoint(resume_from)
+		logman.info('Resuming import run %s from phase %s, index %s.' % (
+			resume_from['run_id'], resume_from['phase'], resume_from['index']
+		))
+	datafiles_scan = None
+	if use_manifest is True:
+		manifest_files = manifest.load_manifest(Name)
+		if changes_only is True and manifest_files is None:
+			logman.warning('No manifest from previous import, importing all datafiles.')
+			changes_only = False
+		datafiles_scan = manifest.scan_datafiles(manifest_files)
+	with db.connection_profile(Name, db_profile):
+		if bulk is True:
+			logman.info('Bulk mode, batch size: %s.' % (bulk_batch_size or 'per phase', ))
+			with db.bulk_mode(bulk_batch_size):
+				_build_db_import(
+					changes_only, since_commit, jobs, datafiles_scan, doc_cache_size, resume_from
+				)
+		else:
+			_build_db_import(
+				changes_only, since_commit, jobs, datafiles_scan, doc_cache_size, resume_from
+			)
+		if handlers.is_fallbeyging_dedup():
+			dedup.gc_fallbeygingar()
+	if datafiles_scan is not None:
+		manifest.write_manifest(Name, datafiles_scan['files'])
+
+
+def _build_db_import(
+	changes_only: bool = False, since_commit: str = None, jobs: int = 1,
+	datafiles_scan: dict = None, doc_cache_size: int = 32768, resume_from: dict = None
+):
+	with (
+		instrumentation.instrumented(db.Engine), handlers.kennistrengur_resolver(),
+		handlers.datafile_cache(doc_cache_size)
+	):
+		if since_commit is not None:
+			importer.import_changed_datafiles_since_commit_to_db(since_commit, [])
+		if changes_only is True and datafiles_scan is not None:
+			importer.import_changed_datafiles_by_manifest_to_db(datafiles_scan)
+		elif changes_only is True:
+			importer.import_changed_datafiles_to_db()
+		else:
+			with checkpoint.checkpoints(Name, resume_from):
+				importer.import_datafiles_to_db(jobs=jobs, resume_from=resume_from)
+
+
+def dedup_db():
+	db.init(Name)
+	dedup.dedup_fallbeygingar()
+
+
+def gc_db():
+	db.init(Name)
+	dedup.gc_fallbeygingar()
+
+
+def validate(jobs: int = 1) -> int:
+	"""
+	validate datafiles without building database, returns amount of errors found
+	"""
+	return len(validator.validate_datafiles(jobs=jobs))
 
 
-def write_files(ts: datetime.datetime = None):
+def write_files(ts: datetime.datetime = None, jobs: int = 1, verify: bool = False):
 	db.init(Name)
-	exporter.write_datafiles_from_db(ts)
+	exporter.write_datafiles_from_db(ts, jobs=jobs, verify=verify)
 
 
 def webpack(words_per_pack: int = seer.WPP):
@@ -0,0 +1,220 @@
+#!/usr/bin/python
+"""
+Checkpoint functionality
+
+Recording progress of a full import of datafiles to SQL database, so that an interrupted build-db
+can be resumed from the last committed datafile instead of starting over.
+"""
+from contextlib import contextmanager
+import json
+import os
+import time
+import uuid
+
+from sqlalchemy import event
+
+from lokaord import logman
+from lokaord.database import db
+from lokaord.database.models import isl
+from lokaord.exc import CheckpointError
+
+Checkpoint_Version = 1
+Import_Phases = ('kjarna', 'samsett', 'skammstafanir')
+Checkpoint_Interval_Seconds = 10  # least time between checkpoint file writes
+
+# run-scoped checkpoint recording, active within checkpoints context
+Checkpoint_Name = None
+Checkpoint_Run_Id = None
+Checkpoint_Resume_From = None  # checkpoint being resumed from, earlier progress isn't recorded
+Checkpoint_Progress = None  # progress of last datafile fully written to session
+Checkpoint_Written_Ts = 0
+
+
+def get_checkpoint_file(name: str) -> str:
+	"""
+	checkpoint lives next to the SQLite database file it describes
+	"""
+	if '/' in name or '.' in name:
+		raise Exception('Bad name provided!')
+	return os.path.join(
+		os.path.dirname(os.path.realpath(__file__)), 'database', 'disk', name, 'checkpoint.json'
+	)
+
+
+def load_checkpoint(name: str) -> dict | None:
+	"""
+	Usage:  checkpoint = load_checkpoint(name)
+	Before: @name is database name.
+	After:  @checkpoint is a dict with 'run_id', 'phase', 'index', 'file', 'kennistrengur' and
+			'datahash' from the last written checkpoint, or None if there is no (usable) checkpoint.
+	"""
+	checkpoint_file = get_checkpoint_file(name)
+	if not os.path.isfile(checkpoint_file):
+		return None
+	with open(checkpoint_file, mode='r', encoding='utf-8') as fi:
+		checkpoint = json.loads(fi.read())
+	if checkpoint.get('version') != Checkpoint_Version:
+		logman.warning('Ignoring checkpoint with unknown version "%s".' % (
+			checkpoint.get('version'),
+		))
+		return None
+	return checkpoint
+
+
+def write_checkpoint(name: str, checkpoint: dict):
+	"""
+	Usage:  write_checkpoint(name, checkpoint)
+	Before: @name is database name, @checkpoint is a dict as returned by load_checkpoint, describing
+			progress that has been committed to database.
+	After:  checkpoint file has been (atomically) replaced.
+	"""
+	checkpoint_file = get_checkpoint_file(name)
+	checkpoint_file_tmp = '%s.tmp' % (checkpoint_file, )
+	with open(checkpoint_file_tmp, mode='w', encoding='utf-8') as fo:
+		fo.write(json.dumps(
+			dict(checkpoint, version=Checkpoint_Version), ensure_ascii=False, separators=(',', ':')
+		))
+	os.replace(checkpoint_file_tmp, checkpoint_file)
+	logman.debug('Wrote checkpoint, phase %s, index %s.' % (
+		checkpoint['phase'], checkpoint['index']
+	))
+
+
+def delete_checkpoint(name: str):
+	checkpoint_file = get_checkpoint_file(name)
+	if os.path.isfile(checkpoint_file):
+		os.remove(checkpoint_file)
+		logman.info('Deleted checkpoint.')
+
+
+def verify_checkpoint(checkpoint: dict):
+	"""
+	Usage:  verify_checkpoint(checkpoint)
+	Before: Database connection has been initialized, @checkpoint is a dict from load_checkpoint.
+	After:  Returns if database has the last datafile recorded in @checkpoint, with the same
+			datahash, else raises CheckpointError.
+	"""
+	if checkpoint['phase'] not in Import_Phases:
+		raise CheckpointError('Checkpoint has unknown phase "%s".' % (checkpoint['phase'], ))
+	if checkpoint['index'] == 0:
+		return
+	db_model = isl.Skammstofun if checkpoint['phase'] == 'skammstafanir' else isl.Ord
+	db_datahash = db.Session.query(db_model.Datahash).filter_by(
+		Kennistrengur=checkpoint['kennistrengur']
+	).scalar()
+	if db_datahash is None or db_datahash != checkpoint['datahash']:
+		raise CheckpointError((
+			'Database is not consistent with checkpoint, "%s" from datafile "%s" is missing or '
+			'differs, run build-db without --resume.'
+		) % (checkpoint['kennistrengur'], checkpoint['file']))
+
+
+def get_resume_index(checkpoint: dict | None, phase: str) -> int | None:
+	"""
+	Usage:  skip = get_resume_index(checkpoint, phase)
+	Before: @checkpoint is a dict from load_checkpoint or None, @phase is one of Import_Phases.
+	After:  @skip is the amount of datafiles in @phase already committed according to
+			@checkpoint, None if the whole phase is done.
+	"""
+	if checkpoint is None:
+		return 0
+	checkpoint_phase_index = Import_Phases.index(checkpoint['phase'])
+	phase_index = Import_Phases.index(phase)
+	if phase_index < checkpoint_phase_index:
+		return None
+	if phase_index > checkpoint_phase_index:
+		return 0
+	return checkpoint['index']
+
+
+def check_resume_datafile(checkpoint: dict, datafile: str):
+	"""
+	raises CheckpointError if @datafile, the last datafile skipped when resuming, isn't the one
+	recorded in @checkpoint, meaning datafiles were added or removed since the checkpoint
+	"""
+	if datafile != checkpoint['file']:
+		raise CheckpointError((
+			'Datafiles have changed since checkpoint, expected "%s" at index %s of phase %s but '
+			'found "%s", run build-db without --resume.'
+		) % (checkpoint['file'], checkpoint['index'], checkpoint['phase'], datafile))
+
+
+@contextmanager
+def checkpoints(name: str, checkpoint: dict = None):
+	"""
+	Usage:  with checkpoints(name, checkpoint):
+				...
+	Before: Database connection has been initialized, @name is database name, @checkpoint is
+			optional dict from load_checkpoint when resuming.
+	After:  Inside the context progress set with set_progress is written to the checkpoint file
+			after database commits, at most every Checkpoint_Interval_Seconds, with the run id of
+			@checkpoint or a new one. Leaving the context without exception (the import completed)
+			deletes the checkpoint file.
+	"""
+	global Checkpoint_Name, Checkpoint_Run_Id, Checkpoint_Resume_From, Checkpoint_Progress
+	global Checkpoint_Written_Ts
+	Checkpoint_Name = name
+	Checkpoint_Run_Id = checkpoint['run_id'] if checkpoint is not None else uuid.uuid4().hex
+	Checkpoint_Resume_From = checkpoint
+	Checkpoint_Progress = None
+	Checkpoint_Written_Ts = time.monotonic()
+	logman.info('Import run id %s.' % (Checkpoint_Run_Id, ))
+	event.listen(db.Session, 'after_commit', _write_progress_after_commit)
+	try:
+		yield
+		delete_checkpoint(name)
+	finally:
+		event.remove(db.Session, 'after_commit', _write_progress_after_commit)
+		Checkpoint_Name = None
+		Checkpoint_Run_Id = None
+		Checkpoint_Resume_From = None
+		Checkpoint_Progress = None
+
+
+def set_progress(
+	phase: str, index: int, datafile: str = None, kennistrengur: str = None,
+	datahash: str = None, committed: bool = False
+):
+	"""
+	Usage:  set_progress(phase, index, datafile, kennistrengur, datahash, committed)
+	Before: @index datafiles of @phase have been written to session, the last one being @datafile
+			containing @kennistrengur with @datahash. @committed is True if session has been
+			committed since.
+	After:  Progress is written to checkpoint file after the next database commit, or right away
+			if @committed. Does nothing outside checkpoints context, or when behind the checkpoint
+			being resumed from.
+	"""
+	global Checkpoint_Progress
+	if Checkpoint_Name is None:
+		return
+	if Checkpoint_Resume_From is not None and (
+		(Import_Phases.index(phase), index) < (
+			Import_Phases.index(Checkpoint_Resume_From['phase']), Checkpoint_Resume_From['index']
+		)
+	):
+		return
+	Checkpoint_Progress = {
+		'run_id': Checkpoint_Run_Id,
+		'phase': phase,
+		'index': index,
+		'file': datafile,
+		'kennistrengur': kennistrengur,
+		'datahash': datahash,
+	}
+	if committed is True:
+		_write_progress()
+
+
+def _write_progress_after_commit(session):
+	if Checkpoint_Progress is None:
+		return
+	if time.monotonic() - Checkpoint_Written_Ts < Checkpoint_Interval_Seconds:
+		return
+	_write_progress()
+
+
+def _write_progress():
+	global Checkpoint_Progress, Checkpoint_Written_Ts
+	write_checkpoint(Checkpoint_Name, Checkpoint_Progress)
+	Checkpoint_Progress = None
+	Checkpoint_Written_Ts = time.monotonic()
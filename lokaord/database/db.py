@@ -1,18 +1,41 @@
 #!/usr/bin/python
+from contextlib import contextmanager
 import datetime
+import json
 import os
 import shutil
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import DeclarativeBase, scoped_session, sessionmaker
 
+from lokaord import instrumentation
 from lokaord import logman
+from lokaord.exc import DatabaseIntegrityError
 
 # SQLAlchemy - Declare models
 # https://docs.sqlalchemy.org/en/20/orm/quickstart.html#declare-models
 
 Engine = None
 Session = None
+Name = None  # name of database initialized, see init
+
+# bulk mode, when Bulk_Batch_Size is set then commits are deferred (session is only flushed) and
+# done in batches of Bulk_Batch_Size units of work, or once per phase if Bulk_Batch_Size is 0
+Bulk_Batch_Size = None
+Bulk_Counter = 0
+
+# connection profiles, PRAGMA statements run on every new SQLite connection, the build profile
+# trades durability for speed and is only used within connection_profile
+Connection_Profiles = {
+	'default': {},
+	'build': {
+		'journal_mode': 'WAL',  # unlike OFF or MEMORY a crashed process can't corrupt database
+		'synchronous': 'OFF',
+		'cache_size': -262144,  # negative is in KiB, so 256 MiB
+		'temp_store': 'MEMORY',
+	},
+}
+Connection_Profile = 'default'
 
 
 class Base(DeclarativeBase):
@@ -105,9 +128,15 @@ def delete_sqlite_db_file(folder_name: str):
 		if not os.path.isfile(abs_sqlite_db_file):
 			raise Exception('File to delete not found!')
 		os.remove(abs_sqlite_db_file)
+	for leftover_file in (
+		'%s-wal' % (abs_sqlite_db_file, ), '%s-shm' % (abs_sqlite_db_file, ),
+		get_profile_marker_file(folder_name)
+	):
+		if os.path.isfile(leftover_file):
+			os.remove(leftover_file)
 
 
-def create_db_uri(db_name: str):
+def create_db_uri(db_name: str, read_only: bool = False):
 	if '/' in db_name:
 		raise Exception('Bad name provided!')
 	if '.' in db_name:
@@ -116,6 +145,10 @@ def create_db_uri(db_name: str):
 	use_sqlite = True
 	if use_sqlite:
 		db_uri = 'sqlite:///lokaord/database/disk/{db_name}/db.sqlite'.format(db_name=db_name)
+		if read_only is True:
+			db_uri = (
+				'sqlite:///file:lokaord/database/disk/{db_name}/db.sqlite?mode=ro&uri=true'
+			).format(db_name=db_name)
 	return db_uri
 
 
@@ -124,9 +157,65 @@ def session_has_changes():
 	return bool(Session.new) or bool(Session.dirty) or bool(Session.deleted)
 
 
+def commit():
+	"""
+	Commit session changes, or in bulk mode only flush them so they get written in batches.
+	"""
+	global Session, Bulk_Batch_Size
+	if Bulk_Batch_Size is None:
+		with instrumentation.phase('commit'):
+			Session.commit()
+	else:
+		Session.flush()
+
+
+def commit_batch(force: bool = False):
+	"""
+	Usage:  commit_batch(force)
+	Before: Called when a unit of work (usually an orð) has been written to session.
+	After:  In bulk mode, session has been committed if batch size was reached or @force is True,
+			outside of bulk mode this does nothing.
+	"""
+	global Session, Bulk_Batch_Size, Bulk_Counter
+	if Bulk_Batch_Size is None:
+		return
+	Bulk_Counter += 1
+	if force is True or (Bulk_Batch_Size > 0 and Bulk_Counter >= Bulk_Batch_Size):
+		with instrumentation.phase('commit'):
+			Session.commit()
+		Bulk_Counter = 0
+
+
+@contextmanager
+def bulk_mode(batch_size: int = 0):
+	"""
+	Usage:  with bulk_mode(batch_size):
+				...
+	Before: @batch_size is the amount of units of work (see commit_batch) per commit, 0 means only
+			commit on forced commit_batch calls and when leaving the context.
+	After:  Inside the context commit() only flushes, commits are done by commit_batch. Remaining
+			changes are committed when leaving the context without error.
+	"""
+	global Session, Bulk_Batch_Size, Bulk_Counter
+	if batch_size < 0:
+		raise ValueError('Bulk batch size should be zero or positive.')
+	Bulk_Batch_Size = batch_size
+	Bulk_Counter = 0
+	try:
+		yield
+		Session.commit()
+	except Exception:
+		Session.rollback()
+		raise
+	finally:
+		Bulk_Batch_Size = None
+		Bulk_Counter = 0
+
+
 def setup_connection(db_uri: str, db_echo: bool = False):
 	global Engine, Session, Base
 	Engine = create_engine(db_uri, echo=db_echo)
+	event.listen(Engine, 'connect', apply_connection_profile)
 	Session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=Engine))
 	Base.query = Session.query_property()
 
@@ -138,13 +227,174 @@ def init_db():
 	#
 	from lokaord.database import models
 	Base.metadata.create_all(bind=Engine)
+	add_missing_columns()
 
 
-def init(name: str):
-	global Session
-	if Session is None:
+def add_missing_columns():
+	"""
+	create_all only creates missing tables, so columns added to models after a database (or a
+	backup of one) was created are added here, as nullable columns without data
+	"""
+	global Base, Engine
+	inspector = inspect(Engine)
+	with Engine.begin() as connection:
+		for table in Base.metadata.sorted_tables:
+			db_columns = set(column['name'] for column in inspector.get_columns(table.name))
+			for column in table.columns:
+				if column.name in db_columns:
+					continue
+				column_type = column.type.compile(dialect=Engine.dialect)
+				connection.execute(text(
+					f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+				))
+				logman.info(f'Added missing column "{column.name}" to table "{table.name}".')
+
+
+def init(name: str, read_only: bool = False):
+	"""
+	Usage:  init(name, read_only)
+	Before: @name is name of database, @read_only is True for a read-only connection to an existing
+			database (for example in worker processes), which doesn't create or alter anything.
+	After:  Database connection has been initialized, unless it already was.
+	"""
+	global Session, Name
+	if Session is None and read_only is True:
+		setup_connection(create_db_uri(name, read_only=True), db_echo=False)
+		Name = name
+		logman.debug('Read-only database connection initialized.')
+	elif Session is None:
+		Name = name
 		setup_data_directory(name)
 		db_uri = create_db_uri(name)
 		setup_connection(db_uri, db_echo=False)
+		check_profile_marker(name)
 		init_db()
 		logman.info('Database connection initialized.')
+
+
+def apply_connection_profile(dbapi_connection, connection_record):
+	"""
+	connect event listener, runs the PRAGMA statements of Connection_Profile on new connections
+	"""
+	cursor = dbapi_connection.cursor()
+	for pragma, value in Connection_Profiles[Connection_Profile].items():
+		cursor.execute('PRAGMA %s = %s' % (pragma, value))
+	cursor.close()
+
+
+def get_profile_marker_file(name: str) -> str:
+	"""
+	marker file, next to the SQLite database file, exists while a connection profile other than
+	default is in use (or if the process using it died)
+	"""
+	if '/' in name or '.' in name:
+		raise Exception('Bad name provided!')
+	return os.path.join(os.path.dirname(os.path.realpath(__file__)), 'disk', name, 'profile.json')
+
+
+def check_profile_marker(name: str):
+	"""
+	Usage:  check_profile_marker(name)
+	Before: Database connection has been set up for database @name.
+	After:  If a process using a connection profile other than default on the database died,
+			leaving the marker file behind, journal_mode has been restored, database integrity
+			checked, see check_integrity, and the marker removed.
+	"""
+	profile_marker_file = get_profile_marker_file(name)
+	if not os.path.isfile(profile_marker_file):
+		return
+	with open(profile_marker_file, mode='r', encoding='utf-8') as fi:
+		profile_marker = json.loads(fi.read())
+	logman.warning((
+		'Database was used with connection profile "%s" (started %s) by a process that didn\'t '
+		'finish, checking database integrity ..'
+	) % (profile_marker['profile'], profile_marker['started']))
+	restore_journal_mode()
+	check_integrity()
+	os.remove(profile_marker_file)
+
+
+def restore_journal_mode():
+	"""
+	journal_mode WAL persists in the database file, so it is set back to the default explicitly
+	"""
+	with Engine.connect() as connection:
+		connection.execute(text('PRAGMA journal_mode = DELETE'))
+
+
+def check_integrity():
+	"""
+	Usage:  check_integrity()
+	Before: Database connection has been set up.
+	After:  Returns if PRAGMA integrity_check reports database as ok, else raises
+			DatabaseIntegrityError.
+	"""
+	with Engine.connect() as connection:
+		problems = connection.execute(text('PRAGMA integrity_check')).scalars().all()
+	if problems != ['ok']:
+		raise DatabaseIntegrityError((
+			'Database failed integrity check, rebuild it (build-db -r), first problems: %s'
+		) % ('; '.join(problems[:5]), ))
+	logman.info('Database integrity check ok.')
+
+
+@contextmanager
+def connection_profile(name: str, profile: str = 'default'):
+	"""
+	Usage:  with connection_profile(name, profile):
+				...
+	Before: Database connection has been initialized for database @name, @profile is a key in
+			Connection_Profiles.
+	After:  Inside the context database connections use @profile. For a profile other than default
+			a marker file is kept next to the database file while inside the context, see
+			check_profile_marker, and when leaving it (also on error) connections go back to the
+			default profile, journal_mode is restored, database integrity checked and PRAGMA
+			optimize run before the marker is removed. If leaving on error the error from inside
+			the context is re-raised, a failing integrity check is then only logged and the marker
+			kept so the check is repeated on next init.
+	"""
+	if profile not in Connection_Profiles:
+		raise ValueError('Unknown connection profile "%s".' % (profile, ))
+	if profile == 'default':
+		yield
+		return
+	profile_marker_file = get_profile_marker_file(name)
+	with open(profile_marker_file, mode='w', encoding='utf-8') as fo:
+		fo.write(json.dumps({
+			'profile': profile, 'started': datetime.datetime.utcnow().isoformat()
+		}))
+	_reconnect(profile)
+	logman.info('Using database connection profile "%s".' % (profile, ))
+	try:
+		yield
+	except BaseException:
+		# keep the error from inside the context primary, a failing integrity check is only logged
+		_reconnect('default')
+		try:
+			restore_journal_mode()
+			check_integrity()
+		except Exception as err:
+			logman.error('Restoring default connection profile after error failed: %s' % (
+				repr(err),
+			))
+		else:
+			os.remove(profile_marker_file)
+		raise
+	else:
+		_reconnect('default')
+		restore_journal_mode()
+		check_integrity()
+		with Engine.connect() as connection:
+			connection.execute(text('PRAGMA optimize'))
+		os.remove(profile_marker_file)
+		logman.info('Restored default database connection profile.')
+
+
+def _reconnect(profile: str):
+	"""
+	close session and pooled connections so that new connections get @profile
+	"""
+	global Connection_Profile
+	Session.remove()
+	Engine.dispose()
+	Connection_Profile = profile
@@ -106,6 +106,7 @@ class Ord(Base):
 	Erlent = utils.boolean_default_false()
 	Merking = utils.word()
 	Kennistrengur = utils.word(nullable=False, unique=True)
+	Datahash = utils.sha256_hexdigest()
 	Edited = utils.timestamp_edited()
 	Created = utils.timestamp_created()
 
@@ -290,6 +291,7 @@ class Fallbeyging(Base):
 	Tholfall = utils.word()
 	Thagufall = utils.word()
 	Eignarfall = utils.word()
+	Hash = utils.integer()  # content address, only set when fallbeygingar are deduplicated
 	Edited = utils.timestamp_edited()
 	Created = utils.timestamp_created()
 
@@ -506,6 +508,7 @@ class Skammstofun(Base):
 	Skammstofun = utils.word(nullable=False)
 	Merking = utils.word()
 	Kennistrengur = utils.word(nullable=False, unique=True)
+	Datahash = utils.sha256_hexdigest()
 	Edited = utils.timestamp_edited()
 	Created = utils.timestamp_created()
 
@@ -94,6 +94,10 @@ def word(nullable=True, unique=False):
 	return Column(Unicode(MaxWordLength), nullable=nullable, unique=unique, server_default=None)
 
 
+def sha256_hexdigest():
+	return Column(Unicode(64), nullable=True)
+
+
 def boolean_default_false():
 	return Column(Boolean(), nullable=False, server_default='0')
 
@@ -110,6 +114,10 @@ def foreign_integer_primary_key(name, nullable=True):
 	return Column(Integer(), ForeignKey('{name}.{name}_id'.format(name=name)), nullable=nullable)
 
 
+def integer(nullable=True):
+	return Column(Integer(), nullable=nullable)
+
+
 def integer_default_zero():
 	return Column(Integer(), nullable=False, server_default='0')
 
@@ -0,0 +1,158 @@
+#!/usr/bin/python
+"""
+Dedup functionality
+
+Content-addressed storage of fallbeygingar, identical four föll paradigms are stored once and
+shared by reference, migration of existing databases to it and garbage collection of Fallbeyging
+rows no longer referenced.
+"""
+import sqlalchemy
+from sqlalchemy import text
+
+from lokaord import handlers
+from lokaord import logman
+from lokaord.database import db
+from lokaord.database.models import isl
+
+Hash_Chunksize = 5000  # Fallbeyging rows hashed per query in migration
+
+
+def get_fallbeyging_fk_columns() -> list[sqlalchemy.Column]:
+	"""
+	Usage:  fk_columns = get_fallbeyging_fk_columns()
+	Before: Nothing.
+	After:  @fk_columns is a list of every column in the models referencing Fallbeyging.
+	"""
+	fk_columns = []
+	for table in db.Base.metadata.sorted_tables:
+		for column in table.columns:
+			if any(
+				foreign_key.column is isl.Fallbeyging.__table__.c.Fallbeyging_id
+				for foreign_key in column.foreign_keys
+			):
+				fk_columns.append(column)
+	return fk_columns
+
+
+def get_db_size() -> int:
+	"""
+	size of database in bytes, according to SQLite page count
+	"""
+	page_count = db.Session.execute(text('PRAGMA page_count')).scalar()
+	page_size = db.Session.execute(text('PRAGMA page_size')).scalar()
+	return page_count * page_size
+
+
+def count_fallbeygingar() -> int:
+	return db.Session.execute(
+		sqlalchemy.select(sqlalchemy.func.count(isl.Fallbeyging.Fallbeyging_id))
+	).scalar()
+
+
+def dedup_fallbeygingar(vacuum: bool = True):
+	"""
+	Usage:  dedup_fallbeygingar(vacuum)
+	Before: Database connection has been initialized.
+	After:  Every Fallbeyging row has its Hash (see handlers.get_fallbeyging_hash), foreign keys to
+			rows with the same föll point to the one with the lowest id, the other rows have been
+			deleted (with any other unreferenced rows, see gc_fallbeygingar) and fallbeygingar are
+			written content-addressed from now on. If @vacuum is True the database file has been
+			vacuumed to give back the space freed.
+	"""
+	logman.info('Deduplicating fallbeygingar ..')
+	fallbeygingar_count = count_fallbeygingar()
+	db_size = get_db_size()
+	fallbeyging = isl.Fallbeyging.__table__
+	hashed_count = 0
+	while True:
+		rows = db.Session.execute(
+			sqlalchemy.select(
+				fallbeyging.c.Fallbeyging_id, fallbeyging.c.Nefnifall, fallbeyging.c.Tholfall,
+				fallbeyging.c.Thagufall, fallbeyging.c.Eignarfall
+			).where(fallbeyging.c.Hash.is_(None)).limit(Hash_Chunksize)
+		).mappings().all()
+		if len(rows) == 0:
+			break
+		db.Session.execute(
+			sqlalchemy.update(fallbeyging).where(
+				fallbeyging.c.Fallbeyging_id == sqlalchemy.bindparam('v_id')
+			).values(Hash=sqlalchemy.bindparam('v_hash'), Edited=fallbeyging.c.Edited),
+			[
+				{'v_id': row['Fallbeyging_id'], 'v_hash': handlers.get_fallbeyging_hash(row)}
+				for row in rows
+			]
+		)
+		hashed_count += len(rows)
+	logman.info('Hashed %s fallbeygingar.' % (hashed_count, ))
+	# map every row to the lowest id row with the same föll (grouped by föll too, not only by
+	# hash, so a hash collision can't merge different fallbeygingar)
+	db.Session.execute(text(
+		'CREATE TEMP TABLE IF NOT EXISTS "Fallbeyging_Remap" '
+		'("old_id" INTEGER PRIMARY KEY, "new_id" INTEGER NOT NULL)'
+	))
+	db.Session.execute(text('DELETE FROM "Fallbeyging_Remap"'))
+	db.Session.execute(text(
+		'INSERT INTO "Fallbeyging_Remap" ("old_id", "new_id") '
+		'SELECT "f"."Fallbeyging_id", "c"."new_id" FROM "Fallbeyging" AS "f" JOIN ('
+		'SELECT "Hash", "Nefnifall", "Tholfall", "Thagufall", "Eignarfall", '
+		'MIN("Fallbeyging_id") AS "new_id" FROM "Fallbeyging" '
+		'GROUP BY "Hash", "Nefnifall", "Tholfall", "Thagufall", "Eignarfall"'
+		') AS "c" ON "f"."Hash" = "c"."Hash" AND "f"."Nefnifall" IS "c"."Nefnifall" AND '
+		'"f"."Tholfall" IS "c"."Tholfall" AND "f"."Thagufall" IS "c"."Thagufall" AND '
+		'"f"."Eignarfall" IS "c"."Eignarfall" WHERE "f"."Fallbeyging_id" != "c"."new_id"'
+	))
+	remap = sqlalchemy.table(
+		'Fallbeyging_Remap', sqlalchemy.column('old_id'), sqlalchemy.column('new_id')
+	)
+	remapped_count = 0
+	for fk_column in get_fallbeyging_fk_columns():
+		values = {
+			fk_column.name: sqlalchemy.select(remap.c.new_id).where(
+				remap.c.old_id == fk_column
+			).scalar_subquery()
+		}
+		if 'Edited' in fk_column.table.c:  # pointing to an identical row is not an edit
+			values['Edited'] = fk_column.table.c.Edited
+		remapped_count += db.Session.execute(
+			sqlalchemy.update(fk_column.table).where(
+				fk_column.in_(sqlalchemy.select(remap.c.old_id))
+			).values(values)
+		).rowcount
+	db.Session.execute(text('DROP TABLE "Fallbeyging_Remap"'))
+	logman.info('Pointed %s foreign keys to shared fallbeygingar.' % (remapped_count, ))
+	handlers.set_fallbeyging_dedup(True)
+	gc_fallbeygingar()
+	if vacuum is True:
+		vacuum_db()
+	logman.info('Fallbeygingar: %s -> %s rows, database size: %s -> %s bytes.' % (
+		fallbeygingar_count, count_fallbeygingar(), db_size, get_db_size()
+	))
+
+
+def gc_fallbeygingar() -> int:
+	"""
+	Usage:  deleted_count = gc_fallbeygingar()
+	Before: Database connection has been initialized.
+	After:  Fallbeyging rows not referenced by any foreign key have been deleted and the session
+			committed, @deleted_count is the amount of rows deleted.
+	"""
+	referenced_ids = sqlalchemy.union(*(
+		sqlalchemy.select(fk_column).where(fk_column.is_not(None))
+		for fk_column in get_fallbeyging_fk_columns()
+	))
+	deleted_count = db.Session.execute(
+		sqlalchemy.delete(isl.Fallbeyging).where(
+			isl.Fallbeyging.Fallbeyging_id.not_in(referenced_ids)
+		).execution_options(synchronize_session=False)
+	).rowcount
+	db.Session.commit()
+	handlers.invalidate_fallbeygingar_by_hash()
+	logman.info('Garbage collected %s unreferenced fallbeygingar.' % (deleted_count, ))
+	return deleted_count
+
+
+def vacuum_db():
+	db.Session.commit()
+	with db.Engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+		connection.execute(text('VACUUM'))
+	logman.info('Vacuumed database.')
@@ -18,3 +18,15 @@ class VoidKennistrengurError(LokaordException):
 
 class OrdToDeleteHasDependentsError(LokaordException):
 	"""Raise when attempting to delete orð which has dependents"""
+
+
+class SamsettDependencyError(LokaordException):
+	"""Raise when samsett orð have missing or circular orðhluti references"""
+
+
+class CheckpointError(LokaordException):
+	"""Raise when an import can not be resumed from its checkpoint"""
+
+
+class DatabaseIntegrityError(LokaordException):
+	"""Raise when database fails its integrity check"""
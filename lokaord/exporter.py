@@ -4,53 +4,67 @@ Exporter functionality
 
 Exporting data from SQL database to files.
 """
-from collections import deque
+import concurrent.futures
 import datetime
+import multiprocessing
 
+import sqlalchemy
+
+from lokaord import graph
+from lokaord import importer
 from lokaord import logman
 from lokaord.database import db
 from lokaord.database.models import isl
+from lokaord.exc import SamsettDependencyError
 from lokaord import handlers
 
+Range_Size = 500  # orð per Ord_id range given to a worker process in write_datafiles_from_db
+
 
-def write_datafiles_from_db(ts: datetime.datetime = None):
+def write_datafiles_from_db(ts: datetime.datetime = None, jobs: int = 1, verify: bool = False):
 	"""
-	Usage:  write_datafiles_from_db(ts)
+	Usage:  write_datafiles_from_db(ts, jobs, verify)
 	Before: @ts is optional datetime timestamp to specify which orð to write from database to
-			datafiles.
+			datafiles, @jobs is amount of worker processes to write orð datafiles in, @verify is
+			True to compare full content of datafiles instead of trusting their hash, see
+			handlers.Ord.write_to_file.
 	After:  Orð from database have been written to datafiles. If @ts is provided we only export
 			orð that have been edited after the @ts timestamp time period, else we export all orð.
+			When @jobs is more than one then Ord_id ranges of orð are loaded and written by a pool
+			of @jobs worker processes, each with its own read-only database connection, progress is
+			logged here in Ord_id order.
 	"""
 	logman.info('Writing orð data from database to datafiles ..')
-	handlers_map = handlers.get_handlers_map()
-	query_isl_ord_records = db.Session.query(isl.Ord).order_by(isl.Ord.Ord_id)  # all orð
-	count = query_isl_ord_records.count()
-	counter = 1
+	count = db.Session.query(isl.Ord).count()  # all orð
+	query_ord_ids = db.Session.query(isl.Ord.Ord_id).order_by(isl.Ord.Ord_id)
 	if ts is not None:
-		query_isl_ord_records = (
-			db.Session.query(isl.Ord).filter(isl.Ord.Edited >= ts).order_by(isl.Ord.Ord_id)
-		)
+		query_ord_ids = query_ord_ids.filter(isl.Ord.Edited >= ts)
 		logman.info('Exporting orð edited after ts: %s.' % (ts.isoformat(), ))
-	for isl_ord_record in query_isl_ord_records:
-		logman.debug('Writing orð from db to file "%s" (%s)' % (
-			isl_ord_record.Ord, isl_ord_record.Kennistrengur
-		))
-		handler = handlers_map[isl_ord_record.Ordflokkur.name]
-		isl_ord = handler()
-		isl_ord.load_from_db(isl_ord_record)
-		isl_ord.write_to_file()
-		edited_str = ''
-		if ts is not None:
-			edited_str = ' (edited: %s)' % (isl_ord_record.Edited.isoformat(), )
-		if counter % 1000 == 0:
-			logman.info('(%s/%s) Wrote orð with id=%s to file "%s"%s.' % (
-				counter, count, isl_ord_record.Ord_id, isl_ord.make_filename(), edited_str
-			))
-		else:
-			logman.debug('(%s/%s) Wrote orð with id=%s to file "%s"%s.' % (
-				counter, count, isl_ord_record.Ord_id, isl_ord.make_filename(), edited_str
-			))
-		counter += 1
+	ord_ids = [ord_id for (ord_id, ) in query_ord_ids]
+	ord_id_ranges = [
+		(ord_ids[i], ord_ids[min(i + Range_Size, len(ord_ids)) - 1])
+		for i in range(0, len(ord_ids), Range_Size)
+	]
+	if jobs > 1:
+		logman.info('Writing orð datafiles using %s worker processes.' % (jobs, ))
+		with concurrent.futures.ProcessPoolExecutor(
+			max_workers=jobs,
+			mp_context=multiprocessing.get_context('spawn'),  # don't inherit db connection
+			initializer=init_worker,
+			initargs=(logman.Logger.level, db.Name)
+		) as executor:
+			range_results = executor.map(
+				write_ord_range_to_files, ord_id_ranges, [ts] * len(ord_id_ranges),
+				[verify] * len(ord_id_ranges)
+			)
+			log_ord_range_results(range_results, count)
+	else:
+		log_ord_range_results(
+			(
+				write_ord_range_to_files(ord_id_range, ts, verify) for ord_id_range in ord_id_ranges
+			),
+			count
+		)
 	logman.info('Writing skammstafanir data from database to datafiles ..')
 	query_skammstafanir_records = (
 		db.Session.query(isl.Skammstofun).order_by(isl.Skammstofun.Skammstofun_id)
@@ -62,7 +76,7 @@ def write_datafiles_from_db(ts: datetime.datetime = None):
 	for skammstofun_record in query_skammstafanir_records:
 		skammstofun = handlers.Skammstofun()
 		skammstofun.load_from_db(skammstofun_record)
-		skammstofun.write_to_file()
+		skammstofun.write_to_file(verify=verify)
 		edited_str = ''
 		if ts is not None:
 			edited_str = ' (edited: %s)' % (skammstofun_record.Edited.isoformat(), )
@@ -72,59 +86,120 @@ def write_datafiles_from_db(ts: datetime.datetime = None):
 	logman.info('Done writing data from database to datafiles.')
 
 
+def init_worker(loglevel: int, db_name: str):
+	"""
+	initializer for exporter worker processes, sets up logging to cli only and a read-only
+	connection to database @db_name
+	"""
+	importer.init_worker(loglevel)
+	db.init(db_name, read_only=True)
+
+
+def write_ord_range_to_files(
+	ord_id_range: tuple[int, int], ts: datetime.datetime = None, verify: bool = False
+) -> list[tuple[int, str, str]]:
+	"""
+	Usage:  written = write_ord_range_to_files(ord_id_range, ts, verify)
+	Before: @ord_id_range is a tuple of first and last Ord_id (inclusive), @ts is optional datetime
+			timestamp and @verify is boolean, see write_datafiles_from_db.
+	After:  Orð in @ord_id_range (edited after @ts if provided) have been written to datafiles,
+			@written is a list of (Ord_id, filename, edited) for them in Ord_id order, edited being
+			None when no @ts is provided. Rows for loading the orð are fetched for the whole range
+			up front, see handlers.prefetched_ord_range.
+	"""
+	handlers_map = handlers.get_handlers_map()
+	query_isl_ord_records = db.Session.query(isl.Ord).filter(
+		isl.Ord.Ord_id >= ord_id_range[0], isl.Ord.Ord_id <= ord_id_range[1]
+	).order_by(isl.Ord.Ord_id)
+	if ts is not None:
+		query_isl_ord_records = query_isl_ord_records.filter(isl.Ord.Edited >= ts)
+	written = []
+	with handlers.prefetched_ord_range(ord_id_range):
+		for isl_ord_record in query_isl_ord_records:
+			logman.debug('Writing orð from db to file "%s" (%s)' % (
+				isl_ord_record.Ord, isl_ord_record.Kennistrengur
+			))
+			handler = handlers_map[isl_ord_record.Ordflokkur.name]
+			isl_ord = handler()
+			isl_ord.load_from_db(isl_ord_record)
+			isl_ord.write_to_file(verify=verify)
+			edited = None
+			if ts is not None:
+				edited = isl_ord_record.Edited.isoformat()
+			written.append((isl_ord_record.Ord_id, isl_ord.make_filename(), edited))
+	return written
+
+
+def log_ord_range_results(range_results, count: int):
+	"""
+	log progress of orð written, from lists of write_ord_range_to_files @range_results in order
+	"""
+	counter = 1
+	for written in range_results:
+		for ord_id, filename, edited in written:
+			edited_str = ''
+			if edited is not None:
+				edited_str = ' (edited: %s)' % (edited, )
+			if counter % 1000 == 0:
+				logman.info('(%s/%s) Wrote orð with id=%s to file "%s"%s.' % (
+					counter, count, ord_id, filename, edited_str
+				))
+			else:
+				logman.debug('(%s/%s) Wrote orð with id=%s to file "%s"%s.' % (
+					counter, count, ord_id, filename, edited_str
+				))
+			counter += 1
+
+
 def check_samsett_circular_definitions():
 	"""
 	tékka hvort eitthvað samsett orð er skilgreint sem samsett úr orðum sem byggja á því, valdandi
 	hringtengingu í samsett venslum, slíkt viljum við ekki
+
+	Usage:  check_samsett_circular_definitions()
+	Before: Database connection has been initialized.
+	After:  The samsett graph (Ord_id -> Ord_ids of its orðhlutar) has been loaded in two queries
+			and its cycles found, see graph.find_cycles. Raises SamsettDependencyError listing a
+			full path cycle through every orð with a circular definition.
 	"""
 	logman.info('Checking for circular definitions in samsett orð ..')
-	query_records = db.Session.query(isl.Ord).filter_by(Samsett=True).order_by(isl.Ord.Ord_id)
-	count = query_records.count()
-	counter = 1
-	for isl_ord in query_records:
-		ord_kennistrengur = isl_ord.Kennistrengur
-		isl_samsett = db.Session.query(isl.SamsettOrd).filter_by(
-			fk_Ord_id=isl_ord.Ord_id
-		).first()
-		first_ohl = db.Session.query(isl.SamsettOrdhluti).filter_by(
-			SamsettOrdhluti_id=isl_samsett.fk_FyrstiOrdHluti_id
-		).first()
-		ohl_queue = deque()
-		ord_dependencies = set()
-		ohl_queue.append(first_ohl)
-		first_ohl_kennistrengur = db.Session.query(isl.Ord).filter_by(
-			Ord_id=first_ohl.fk_Ord_id
-		).first().Kennistrengur
-		if first_ohl_kennistrengur == ord_kennistrengur:
-			raise Exception(
-				'Circular definition found for orð "%s" (1).' % (ord_kennistrengur, )
-			)
-		ord_dependencies.add(first_ohl_kennistrengur)
-		while True:
-			ohl_queued = None
-			try:
-				ohl_queued = ohl_queue.popleft()
-			except IndexError:
-				break  # ohl_queue deque is empty
-			if ohl_queued.fk_NaestiOrdhluti_id is not None:
-				next_ohl = db.Session.query(isl.SamsettOrdhluti).filter_by(
-					SamsettOrdhluti_id=ohl_queued.fk_NaestiOrdhluti_id
-				).first()
-				while next_ohl is not None:
-					next_ohl_kennistrengur = db.Session.query(isl.Ord).filter_by(
-						Ord_id=next_ohl.fk_Ord_id
-					).first().Kennistrengur
-					if next_ohl_kennistrengur == ord_kennistrengur:
-						raise Exception(
-							'Circular definition found for orð "%s" (2).' % (ord_kennistrengur, )
-						)
-					if next_ohl_kennistrengur not in ord_dependencies:
-						ohl_queue.append(next_ohl)
-						ord_dependencies.add(next_ohl_kennistrengur)
-					next_ohl = db.Session.query(isl.SamsettOrdhluti).filter_by(
-						SamsettOrdhluti_id=next_ohl.fk_NaestiOrdhluti_id
-					).first()
-		if counter % 1000 == 0 or counter == count:
-			logman.info('(%s/%s) OK "%s" ..' % (counter, count, ord_kennistrengur))
-		counter += 1
-	logman.info('No circular definitions found for samsett orð.')
+	kennistrengir = dict(
+		db.Session.query(isl.Ord.Ord_id, isl.Ord.Kennistrengur).filter_by(Samsett=True)
+	)
+	ordhluti_graph = dict((ord_id, set()) for ord_id in kennistrengir)
+	for ord_id, ordhluti_ord_id in db.Session.execute(get_samsett_graph_query()):
+		ordhluti_graph.setdefault(ord_id, set()).add(ordhluti_ord_id)
+	ordhluti_graph = dict(
+		(ord_id, sorted(ordhluti_graph[ord_id])) for ord_id in sorted(ordhluti_graph)
+	)
+	logman.info('Loaded samsett graph of %s orð with %s orðhluti references.' % (
+		len(ordhluti_graph),
+		sum(len(ordhluti_ord_ids) for ordhluti_ord_ids in ordhluti_graph.values())
+	))
+	cycles = graph.find_cycles(ordhluti_graph)
+	if len(cycles) > 0:
+		raise SamsettDependencyError('\nCircular samsett definitions:\n%s' % (
+			'\n'.join('  %s' % (' -> '.join(
+				kennistrengir.get(ord_id, str(ord_id)) for ord_id in cycle
+			), ) for cycle in cycles),
+		))
+	logman.info('No circular definitions found for %s samsett orð.' % (len(kennistrengir), ))
+
+
+def get_samsett_graph_query() -> sqlalchemy.Select:
+	"""
+	query for (Ord_id, orðhluti Ord_id) of every samsett orð and each of its orðhlutar, following
+	every orðhluti chain at once with a recursive CTE (UNION, so a looping chain ends)
+	"""
+	chain = sqlalchemy.select(
+		isl.SamsettOrd.fk_Ord_id.label('ord_id'),
+		isl.SamsettOrd.fk_FyrstiOrdHluti_id.label('ordhluti_id')
+	).where(isl.SamsettOrd.fk_FyrstiOrdHluti_id.is_not(None)).cte('ordhluti_chains', recursive=True)
+	chain = chain.union(
+		sqlalchemy.select(chain.c.ord_id, isl.SamsettOrdhluti.fk_NaestiOrdhluti_id).join(
+			chain, isl.SamsettOrdhluti.SamsettOrdhluti_id == chain.c.ordhluti_id
+		).where(isl.SamsettOrdhluti.fk_NaestiOrdhluti_id.is_not(None))
+	)
+	return sqlalchemy.select(chain.c.ord_id, isl.SamsettOrdhluti.fk_Ord_id).join(
+		isl.SamsettOrdhluti, isl.SamsettOrdhluti.SamsettOrdhluti_id == chain.c.ordhluti_id
+	)
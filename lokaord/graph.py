@@ -0,0 +1,109 @@
+#!/usr/bin/python
+"""
+Graph functionality
+
+Finding strongly connected components and cycles in directed graphs, used to report circular
+samsett definitions, both among samsett orð datafiles (importer) and in database (exporter).
+"""
+from collections import deque
+
+
+def find_cycles(graph: dict[int, list[int]]) -> list[list[int]]:
+	"""
+	Usage:  cycles = find_cycles(graph)
+	Before: @graph maps every node to a list of nodes it has edges to, nodes only found in those
+			lists are treated as having no edges.
+	After:  @cycles is a list of cycles in @graph, each a list of nodes starting and ending on the
+			same node, together passing through every node that is on some cycle, see
+			find_component_cycles.
+	"""
+	cycles = []
+	for component in find_strongly_connected_components(graph):
+		if len(component) == 1 and component[0] not in graph.get(component[0], ()):
+			continue  # node not part of a cycle
+		cycles += find_component_cycles(graph, component)
+	return cycles
+
+
+def find_strongly_connected_components(graph: dict[int, list[int]]) -> list[list[int]]:
+	"""
+	Usage:  components = find_strongly_connected_components(graph)
+	Before: @graph maps every node to a list of nodes it has edges to, nodes only found in those
+			lists are treated as having no edges.
+	After:  @components is a list of strongly connected components of @graph, each a sorted list
+			of nodes, found with Tarjan's algorithm (iteratively, so deep graphs don't hit the
+			recursion limit).
+	"""
+	index_of = {}
+	lowlink = {}
+	stack = []
+	on_stack = set()
+	components = []
+	for root in graph:
+		if root in index_of:
+			continue
+		index_of[root] = lowlink[root] = len(index_of)
+		stack.append(root)
+		on_stack.add(root)
+		work = [(root, iter(graph.get(root, ())))]
+		while work:
+			node, successors = work[-1]
+			for successor in successors:
+				if successor not in index_of:
+					index_of[successor] = lowlink[successor] = len(index_of)
+					stack.append(successor)
+					on_stack.add(successor)
+					work.append((successor, iter(graph.get(successor, ()))))
+					break
+				if successor in on_stack:
+					lowlink[node] = min(lowlink[node], index_of[successor])
+			else:
+				work.pop()
+				if len(work) > 0:
+					parent = work[-1][0]
+					lowlink[parent] = min(lowlink[parent], lowlink[node])
+				if lowlink[node] == index_of[node]:
+					component = []
+					while True:
+						member = stack.pop()
+						on_stack.discard(member)
+						component.append(member)
+						if member == node:
+							break
+					components.append(sorted(component))
+	return components
+
+
+def find_component_cycles(graph: dict[int, list[int]], component: list[int]) -> list[list[int]]:
+	"""
+	Usage:  cycles = find_component_cycles(graph, component)
+	Before: @component is a strongly connected component of @graph with a cycle.
+	After:  @cycles is a list of cycles within @component, each a list of nodes starting and ending
+			on the same node, together passing through every node of @component. Each is a
+			shortest cycle through the lowest node not yet on a previous one (breadth first).
+	"""
+	members = set(component)
+	covered = set()
+	cycles = []
+	for start in component:
+		if start in covered:
+			continue
+		previous = {}
+		queue = deque([start])
+		while queue:
+			node = queue.popleft()
+			if start in graph[node]:
+				break
+			for successor in graph[node]:
+				if successor in members and successor not in previous and successor != start:
+					previous[successor] = node
+					queue.append(successor)
+		cycle = [start]
+		while node != start:
+			cycle.append(node)
+			node = previous[node]
+		cycle.append(start)
+		cycle.reverse()
+		cycles.append(cycle)
+		covered.update(cycle)
+	return cycles
@@ -4,23 +4,30 @@ Handler classes for import/export functionality.
 
 Importing data from files to SQL database, and exporting data from SQL database to files.
 """
-import copy
+import collections
+from contextlib import contextmanager
 import datetime
 from decimal import Decimal
 import hashlib
 import json
+from json.encoder import encode_basestring as encode_json_string
 import os
 import pathlib
 import random
 import re
 import string
+import threading
 import traceback
 import types
 import typing
 from typing import Optional
 
 import pydantic
+import sqlalchemy
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
+from lokaord import instrumentation
 from lokaord import logman
 from lokaord.database import db
 from lokaord.database.models import isl
@@ -28,6 +35,67 @@ from lokaord.exc import VoidKennistrengurError, OrdToDeleteHasDependentsError
 from lokaord import structs
 from lokaord.structs import NafnordaBeygingar, LysingarordaBeygingar, SagnordaBeygingar
 
+# run-scoped kennistrengur -> Ord_id resolver, active within kennistrengur_resolver context, when
+# None then lookups go straight to database
+Ord_id_Resolver = None
+Ord_id_Resolver_Hits = 0
+Ord_id_Resolver_Misses = 0
+
+# bounded LRU cache of derived orðhluti beygingar, see Ord.ordhluti_get_beygingar, entries are
+# dropped by invalidate_ordhluti_beygingar when the orð of the orðhluti, or any orð its beygingar
+# were derived from (for samsett orð, transitively), is written or deleted
+Ordhluti_Beygingar_Cache = collections.OrderedDict()  # cache key -> (kennistrengir, beygingar)
+Ordhluti_Beygingar_Cache_Keys = {}  # kennistrengur -> set of cache keys depending on it
+Ordhluti_Beygingar_Cache_Deriving = []  # kennistrengir of entries being derived, innermost last
+Ordhluti_Beygingar_Cache_Size = 2048
+Ordhluti_Beygingar_Cache_Hits = 0
+Ordhluti_Beygingar_Cache_Misses = 0
+
+# run-scoped datafile document cache, active within datafile_cache context, so that datafiles are
+# parsed once per import run, see Ord.load_json and Ord.load_json_fields
+Datafile_Fields = None  # path -> dict of the fields used to sort and arrange datafiles
+Datafile_Fields_Keys = ('flokkur', 'skammstöfun', 'kennistrengur', 'samsett')
+Datafile_Documents = None  # path -> parsed document, LRU bounded by Datafile_Documents_Size
+Datafile_Documents_Size = 0
+Datafile_Cache_Parsed = 0
+Datafile_Cache_Reused = 0
+Datafile_Cache_Lock = threading.Lock()  # import pipeline stages use the cache from their threads
+
+# rows for loading a range of orð from database, active within prefetched_ord_range context, see
+# Ord.get_ordflokkur_record, Ord.prefetch_beygingar and Ord.load_samsett_ordhlutar_from_db
+Prefetched_Records = None  # (model, Ord_id) -> orðflokkur record
+Prefetched_Beygingar = None  # (model, id) -> Fallbeyging or Sagnbeyging row
+Prefetched_Ordhlutar = None  # Ord_id -> list of (isl.SamsettOrdhluti, isl.Ord) of samsett orð
+Prefetched_Fleiryrt = None  # Ord_id -> rows of get_samtenging_fleiryrt_query of samtenging
+Ordflokkur_Models = (
+	isl.Nafnord, isl.Lysingarord, isl.Greinir, isl.Fornafn, isl.Fjoldatala, isl.Radtala,
+	isl.Sagnord, isl.Forsetning, isl.Atviksord, isl.Sernafn
+)
+Prefetch_Chunksize = 500  # max values in one SQL IN clause
+
+# handler class -> pydantic TypeAdapter for its data structs, see Ord.get_data_adapter
+Data_Adapters = {}
+
+# keys whose list values are written on one line in datafiles, see dumps_datafile_json
+Inline_List_Keys = frozenset([
+	'ág', 'mg', 'kk', 'kvk', 'hk', 'et', 'ft', 'stýrir', 'fylgiorð', 'beygingar'
+])
+
+# write_to_file reads kennistrengur and hash, the last two keys, from the tail of datafiles
+Datafile_Tail_Size = 1024
+Datafile_Tail_Pattern = re.compile(
+	r'\n\t"kennistrengur": ("(?:[^"\\]|\\.)*"),\n\t"hash": ("[0-9a-f]{64}")\n}$'
+)
+
+# content-addressed Fallbeyging storage, when True then Fallbeyging rows are keyed by Hash of their
+# four föll and shared by reference, None until detected from database, see is_fallbeyging_dedup
+Fallbeyging_Dedup = None
+Fallbeygingar_By_Hash = None  # Hash -> Fallbeyging row, see get_fallbeygingar_by_hash
+
+# model -> list of (attribute, model) foreign keys to Fallbeyging or Sagnbeyging, see
+# get_beygingar_fk_attributes
+Beygingar_Fk_Attributes = {}
+
 
 class Ord:
 	"""
@@ -40,6 +108,8 @@ class Ord:
 
 	group: structs.Ordflokkar = None
 	data: Optional[structs.OrdData] = None
+	data_structs_by_undirflokkur: dict = None  # for handlers with more than one data struct
+	db_model = isl.Ord
 
 	datafiles_dir = os.path.abspath(
 		os.path.join(os.path.dirname(os.path.realpath(__file__)), 'database', 'data')
@@ -49,10 +119,15 @@ class Ord:
 		'orð', 'flokkur', 'undirflokkur', 'merking', 'kyn', 'tölugildi', 'samsett', 'hash',
 		'kennistrengur', 'ósjálfstætt', 'óbeygjanlegt', 'erlent', 'fleiryrt', 'stýrir'
 	])
+	unprefixed_keys_via_samsett_ord = set(['frumlag'])
 
 	def __init__(self, loaded_from_file: bool = None, loaded_from_db: bool = None):
 		self.loaded_from_file = loaded_from_file
 		self.loaded_from_db = loaded_from_db
+		self.staged_fallbeygingar = []
+		self.staged_sagnbeygingar = []
+		# (model, id) -> row, see prefetch_beygingar, shared within prefetched_ord_range context
+		self.prefetched_beygingar = {} if Prefetched_Beygingar is None else Prefetched_Beygingar
 
 	def make_filename(self):
 		raise NotImplementedError('Implement me in derived class.')
@@ -66,14 +141,15 @@ class Ord:
 		returns tuple containing isl.Ord and boolean true if database changes were made, else false
 		"""
 		changes_made = False
-		isl_ord = db.Session.query(isl.Ord).filter_by(Kennistrengur=self.data.kennistrengur).first()
+		invalidate_ordhluti_beygingar(self.data.kennistrengur)
+		isl_ord = None
+		ord_id = get_ord_id(self.data.kennistrengur)
+		if ord_id is not None:
+			isl_ord = db.Session.get(isl.Ord, ord_id)
 		if isl_ord is None:
 			if self.data.samsett is not None:
 				for ohl in self.data.samsett:
-					isl_ord_oh = (
-						db.Session.query(isl.Ord).filter_by(Kennistrengur=ohl.kennistrengur).first()
-					)
-					if isl_ord_oh is None:
+					if get_ord_id(ohl.kennistrengur) is None:
 						raise VoidKennistrengurError(
 							f'Orðhluti with kennistrengur "{ohl.kennistrengur}" not found. (1)'
 						)
@@ -93,7 +169,8 @@ class Ord:
 		isl_ord.Merking = self.data.merking
 		isl_ord.Kennistrengur = self.data.kennistrengur
 		changes_made = changes_made or db.Session.is_modified(isl_ord)
-		db.Session.commit()
+		db.commit()
+		set_ord_id(isl_ord.Kennistrengur, isl_ord.Ord_id)
 		if isl_ord.Samsett is True:  # add samsett data to database
 			isl_samsett = db.Session.query(isl.SamsettOrd).filter_by(
 				fk_Ord_id=isl_ord.Ord_id
@@ -101,14 +178,12 @@ class Ord:
 			if isl_samsett is None:
 				isl_samsett = isl.SamsettOrd(fk_Ord_id=isl_ord.Ord_id)
 				db.Session.add(isl_samsett)
-				db.Session.commit()
+				db.commit()
 				changes_made = True
 			last_ordhluti_id = None
 			for ohl in reversed(self.data.samsett):
-				isl_ord_oh = (
-					db.Session.query(isl.Ord).filter_by(Kennistrengur=ohl.kennistrengur).first()
-				)
-				if isl_ord_oh is None:
+				ord_oh_id = get_ord_id(ohl.kennistrengur)
+				if ord_oh_id is None:
 					raise VoidKennistrengurError(
 						f'Orðhluti with kennistrengur "{ohl.kennistrengur}" not found. (2)'
 					)
@@ -264,7 +339,7 @@ class Ord:
 					)
 				# ---------------------------------------------------------------------------------
 				isl_ordhluti_data = {
-					'fk_Ord_id': isl_ord_oh.Ord_id,
+					'fk_Ord_id': ord_oh_id,
 					'Ordmynd': ohl.mynd,
 					'Gerd': samsetning,
 					'LysingarordMyndir': lo_myndir,
@@ -307,19 +382,44 @@ class Ord:
 				if isl_ordhluti is None:
 					isl_ordhluti = isl.SamsettOrdhluti(**isl_ordhluti_data)
 					db.Session.add(isl_ordhluti)
-					db.Session.commit()
+					db.commit()
 					changes_made = True
 				last_ordhluti_id = isl_ordhluti.SamsettOrdhluti_id
 			if isl_samsett.fk_FyrstiOrdHluti_id != last_ordhluti_id:
 				isl_samsett.fk_FyrstiOrdHluti_id = last_ordhluti_id
-				db.Session.commit()
+				db.commit()
 				changes_made = True
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
-	def load_from_db(self, isl_ord: isl.Ord) -> dict:
+	def load_filename_from_db(self, isl_ord: isl.Ord) -> str:
+		"""
+		Usage:  ord_file = self.load_filename_from_db(isl_ord)
+		Before: @isl_ord is an orð record in database.
+		After:  @ord_file is the datafile path of the orð, see make_filename, made from the fields
+				of @isl_ord and its orðflokkur record only, without loading its beygingar (or
+				deriving them for samsett orð). self.data contains only those fields.
+		"""
+		ord_data = self.load_ord_fields_from_db(isl_ord)
+		ord_data['flokkur'] = structs.Ordflokkar(ord_data['flokkur'])
+		ord_data.update(self.load_filename_fields_from_db(isl_ord))
+		struct = typing.get_args(self.__class__.__annotations__['data'])[0]
+		# not validated as the beygingar are missing, so enum fields are given as enums
+		self.data = struct.model_construct(**ord_data)
+		return self.make_filename()
+
+	def load_filename_fields_from_db(self, isl_ord: isl.Ord) -> dict:
+		"""
+		undirflokkur and kyn of @isl_ord, as enums, for handlers whose make_filename needs them
+		"""
+		return {}
+
+	def load_ord_fields_from_db(self, isl_ord: isl.Ord) -> dict:
+		"""
+		orð data from the fields of @isl_ord, with empty samsett
+		"""
 		toluord = (isl.Ordflokkar.Fjoldatala, isl.Ordflokkar.Radtala)
 		smaord = (
 			isl.Ordflokkar.Forsetning, isl.Ordflokkar.Atviksord, isl.Ordflokkar.Nafnhattarmerki,
@@ -348,22 +448,12 @@ class Ord:
 			'erlent': isl_ord.Erlent,
 			'kennistrengur': isl_ord.Kennistrengur,
 		}
+		return ord_data
+
+	def load_from_db(self, isl_ord: isl.Ord) -> dict:
+		ord_data = self.load_ord_fields_from_db(isl_ord)
 		if isl_ord.Samsett is True:
-			isl_samsett = db.Session.query(isl.SamsettOrd).filter_by(
-				fk_Ord_id=isl_ord.Ord_id
-			).first()
-			next_ordhluti_id = isl_samsett.fk_FyrstiOrdHluti_id
-			while next_ordhluti_id is not None:
-				isl_ord_oh = db.Session.query(isl.SamsettOrdhluti).filter_by(
-					SamsettOrdhluti_id=next_ordhluti_id
-				).first()
-				if isl_ord_oh is None:
-					raise ValueError(
-						f'Orð "{isl_ord.Kennistrengur}" with void orðhluti? ({next_ordhluti_id})'
-					)
-				isl_ord_oh_ord = db.Session.query(isl.Ord).filter_by(
-					Ord_id=isl_ord_oh.fk_Ord_id
-				).first()
+			for isl_ord_oh, isl_ord_oh_ord in self.load_samsett_ordhlutar_from_db(isl_ord):
 				oh_data = {}
 				if isl_ord_oh.Ordmynd is not None:
 					oh_data['mynd'] = isl_ord_oh.Ordmynd
@@ -597,27 +687,49 @@ class Ord:
 				# ---------------------------------------------------------------------------------
 				oh_data['kennistrengur'] = isl_ord_oh_ord.Kennistrengur
 				ord_data['samsett'].append(oh_data)
-				next_ordhluti_id = isl_ord_oh.fk_NaestiOrdhluti_id
 		else:
 			del ord_data['samsett']
 		return ord_data
 
+	def load_samsett_ordhlutar_from_db(self, isl_ord: isl.Ord) -> list[tuple]:
+		"""
+		Usage:  ordhlutar = self.load_samsett_ordhlutar_from_db(isl_ord)
+		Before: @isl_ord is a samsett orð record.
+		After:  @ordhlutar is a list of (isl.SamsettOrdhluti, isl.Ord) tuples, orðhlutar of
+				@isl_ord in order with the orð of each, fetched in one query by following the
+				orðhluti chain with a recursive CTE (see get_samsett_ordhlutar_query), or
+				prefetched, see prefetched_ord_range.
+		"""
+		if Prefetched_Ordhlutar is not None and isl_ord.Ord_id in Prefetched_Ordhlutar:
+			return Prefetched_Ordhlutar[isl_ord.Ord_id]
+		ordhlutar = []
+		for _, ordhluti_id, isl_ord_oh, isl_ord_oh_ord in db.Session.execute(
+			get_samsett_ordhlutar_query(isl.SamsettOrd.fk_Ord_id == isl_ord.Ord_id)
+		):
+			if isl_ord_oh is None:
+				raise ValueError(
+					f'Orð "{isl_ord.Kennistrengur}" with void orðhluti? ({ordhluti_id})'
+				)
+			ordhlutar.append((isl_ord_oh, isl_ord_oh_ord))
+		return ordhlutar
+
 	@classmethod
-	def get_files_list_sorted(cls, override_dir_rel: str = None) -> tuple[list[str], list[str]]:
+	def get_folders(cls) -> list[str]:
 		"""
-		Get lists of files for the orðflokkur.
+		list of directories, relative to "lokaord/database/data", containing datafiles for the
+		orðflokkur
+		"""
+		return [cls.group.get_folder()]
 
-		Usage:  kjo, sao = Ord.get_files_list_sorted(override_dir_rel)
-		Before: @override_dir_rel is optional, to override which relative directory within the
-				"lokaord/database/data" directory to list files in
-		After:  @kjo and @sao are lists of strings containing relative location of json files in
-				Orð group folder, @kjo containing json files without the key "samsett" and @sao
-				containing json files that have the key "samsett".
+	@classmethod
+	def get_files_list(cls, files_directory_rel: str) -> list[str]:
+		"""
+		Usage:  files = Ord.get_files_list(files_directory_rel)
+		Before: @files_directory_rel is relative directory within the "lokaord/database/data"
+				directory.
+		After:  @files is a sorted list of strings containing relative location of json files in
+				the directory, datafiles are not read.
 		"""
-		if override_dir_rel is not None:
-			files_directory_rel = override_dir_rel
-		else:
-			files_directory_rel = cls.group.get_folder()
 		files_directory = os.path.join(cls.datafiles_dir, files_directory_rel)
 		json_files_path = sorted(pathlib.Path(files_directory).iterdir())
 		json_files_rel = []
@@ -626,9 +738,35 @@ class Ord:
 				continue
 			if not json_file_path.name.endswith('.json'):
 				continue
-			json_file_rel = os.path.join(files_directory_rel, json_file_path.name)
-			json_files_rel.append(json_file_rel)
-		return cls.sort_files_to_kjarna_and_samsett_ord(json_files_rel)
+			json_files_rel.append(os.path.join(files_directory_rel, json_file_path.name))
+		return json_files_rel
+
+	@classmethod
+	def get_files_list_sorted(cls, override_dir_rel: str = None) -> tuple[list[str], list[str]]:
+		"""
+		Get lists of files for the orðflokkur.
+
+		Usage:  kjo, sao = Ord.get_files_list_sorted(override_dir_rel)
+		Before: @override_dir_rel is optional, to override which relative directory within the
+				"lokaord/database/data" directory to list files in, instead of the directories from
+				get_folders
+		After:  @kjo and @sao are lists of strings containing relative location of json files in
+				Orð group folders, @kjo containing json files without the key "samsett" and @sao
+				containing json files that have the key "samsett", sorted per folder.
+		"""
+		if override_dir_rel is not None:
+			files_directories_rel = [override_dir_rel]
+		else:
+			files_directories_rel = cls.get_folders()
+		kjarna_ord_files_list = []
+		samsett_ord_files_list = []
+		for files_directory_rel in files_directories_rel:
+			kja_list, sam_list = cls.sort_files_to_kjarna_and_samsett_ord(
+				cls.get_files_list(files_directory_rel)
+			)
+			kjarna_ord_files_list += kja_list
+			samsett_ord_files_list += sam_list
+		return (kjarna_ord_files_list, samsett_ord_files_list)
 
 	@classmethod
 	def sort_files_to_kjarna_and_samsett_ord(cls, files: list[str]) -> tuple[list[str], list[str]]:
@@ -653,8 +791,7 @@ class Ord:
 				continue
 			json_data = None
 			try:
-				with json_file_path.open(mode='r', encoding='utf-8') as fi:
-					json_data = json.loads(fi.read())
+				json_data = cls.load_json_fields(json_file_rel)
 			except json.decoder.JSONDecodeError:
 				raise ValueError(f'File "{json_file_path.name}" has invalid JSON format.')
 			if 'samsett' in json_data:
@@ -689,8 +826,7 @@ class Ord:
 				continue
 			json_data = None
 			try:
-				with json_file_path.open(mode='r', encoding='utf-8') as fi:
-					json_data = json.loads(fi.read())
+				json_data = cls.load_json_fields(json_file_rel)
 			except json.decoder.JSONDecodeError:
 				raise ValueError(f'File "{json_file_path.name}" has invalid JSON format.')
 			if 'skammstöfun' in json_data:
@@ -703,8 +839,83 @@ class Ord:
 
 	@classmethod
 	def load_json(cls, filename):
-		with open(os.path.join(cls.datafiles_dir, filename), mode='r', encoding='utf-8') as fi:
-			return json.loads(fi.read(), parse_float=Decimal)
+		"""
+		Usage:  data = Ord.load_json(filename)
+		Before: @filename is path to datafile, relative to "lokaord/database/data" or absolute.
+		After:  @data is the parsed datafile, with floats as Decimal. When datafile_cache is active
+				a document already parsed by load_json_fields is handed out (and dropped from the
+				cache) instead of parsing the datafile again.
+		"""
+		global Datafile_Documents, Datafile_Cache_Reused
+		filename_abs = os.path.join(cls.datafiles_dir, filename)
+		data = None
+		with Datafile_Cache_Lock:
+			if Datafile_Documents is not None:
+				data = Datafile_Documents.pop(filename_abs, None)
+				if data is not None:
+					Datafile_Cache_Reused += 1
+		if data is None:
+			data = cls._parse_json(filename_abs)
+		return data
+
+	@classmethod
+	def load_json_fields(cls, filename):
+		"""
+		Usage:  fields = Ord.load_json_fields(filename)
+		Before: @filename is path to datafile, relative to "lokaord/database/data" or absolute.
+		After:  @fields is a dict containing at least the keys in Datafile_Fields_Keys present in
+				the datafile, which is enough for sorting and arranging datafiles for import. When
+				datafile_cache is active the datafile is only parsed once, and the full document
+				kept (within bounds, see forget_datafile_document) for load_json. Should be treated
+				as read-only.
+		"""
+		global Datafile_Fields, Datafile_Documents, Datafile_Documents_Size, Datafile_Cache_Reused
+		filename_abs = os.path.join(cls.datafiles_dir, filename)
+		if Datafile_Fields is None:
+			return cls._parse_json(filename_abs)
+		with Datafile_Cache_Lock:
+			fields = Datafile_Fields.get(filename_abs)
+			if fields is not None:
+				Datafile_Cache_Reused += 1
+				return fields
+		data = cls._parse_json(filename_abs)
+		with Datafile_Cache_Lock:
+			if Datafile_Documents_Size > 0:
+				Datafile_Documents[filename_abs] = data
+				while len(Datafile_Documents) > Datafile_Documents_Size:
+					Datafile_Documents.popitem(last=False)
+			return Datafile_Fields[filename_abs]
+
+	@classmethod
+	def load_json_bytes(cls, filename) -> bytes | None:
+		"""
+		Usage:  content = Ord.load_json_bytes(filename)
+		Before: @filename is path to datafile, relative to "lokaord/database/data" or absolute.
+		After:  @content is the raw content of the datafile, for validating it straight from JSON,
+				or None when datafile_cache has the parsed document, or doesn't know the datafile
+				yet, in which case load_json should be used.
+		"""
+		filename_abs = os.path.join(cls.datafiles_dir, filename)
+		with Datafile_Cache_Lock:
+			if Datafile_Fields is not None and (
+				filename_abs in Datafile_Documents or filename_abs not in Datafile_Fields
+			):
+				return None
+		with instrumentation.phase('parse'), open(filename_abs, mode='rb') as fi:
+			return fi.read()
+
+	@classmethod
+	def _parse_json(cls, filename_abs):
+		global Datafile_Fields, Datafile_Cache_Parsed
+		with instrumentation.phase('parse'), open(filename_abs, mode='r', encoding='utf-8') as fi:
+			data = json.loads(fi.read(), parse_float=Decimal)
+		with Datafile_Cache_Lock:
+			if Datafile_Fields is not None:
+				Datafile_Cache_Parsed += 1
+				Datafile_Fields[filename_abs] = dict(
+					(key, data[key]) for key in Datafile_Fields_Keys if key in data
+				)
+		return data
 
 	def load_from_file(self, filename):
 		"""
@@ -718,33 +929,116 @@ class Ord:
 		self.filename = filename
 		self.loaded_from_file = True
 		filepath_abs = os.path.join(self.datafiles_dir, filename)
-		data = self.load_json(filepath_abs)
 		merking = self.detect_merking_in_filename(os.path.basename(filename))
+		if merking is None:
+			content = self.load_json_bytes(filepath_abs)
+			if content is not None:
+				self.load_from_json_bytes(content, filename)
+				return
+		data = self.load_json(filepath_abs)
 		if merking is not None and 'merking' not in data:
 			data['merking'] = merking
 		self.load_from_dict(data, filename)
 
-	def load_from_dict(self, data: dict, filename: str = None):
-		tracebacks = []
-		for struct in list(typing.get_args(self.__class__.__annotations__['data'])):
-			if struct is types.NoneType:
-				continue
-			try:
-				self.data = struct(**data)
-				break
-			except pydantic.ValidationError:
-				tracebacks.append(traceback.format_exc())
+	@classmethod
+	def get_data_adapter(cls) -> pydantic.TypeAdapter:
+		"""
+		Usage:  adapter = Ord.get_data_adapter()
+		Before: Nothing.
+		After:  @adapter is a pydantic TypeAdapter for the structs in the data annotation, created
+				once per handler class and kept in Data_Adapters. When the handler has more than one
+				data struct the struct is picked by undirflokkur, see get_data_struct.
+		"""
+		if cls not in Data_Adapters:
+			if cls.data_structs_by_undirflokkur is not None:
+				data_type = typing.Annotated[
+					typing.Union[tuple(
+						typing.Annotated[struct, pydantic.Tag(undirflokkur)]
+						for undirflokkur, struct in cls.data_structs_by_undirflokkur.items()
+					)],
+					pydantic.Discriminator(_get_undirflokkur)
+				]
+			else:
+				data_type = cls.get_data_struct({})
+			Data_Adapters[cls] = pydantic.TypeAdapter(data_type)
+		return Data_Adapters[cls]
+
+	@classmethod
+	def get_data_struct(cls, data: dict):
+		"""
+		Usage:  struct = Ord.get_data_struct(data)
+		Before: @data is a dict containing orð data.
+		After:  @struct is the struct in the data annotation that @data should fit, picked by
+				undirflokkur when the annotation has more than one struct, None if not known.
+		"""
+		if cls.data_structs_by_undirflokkur is not None:
+			return cls.data_structs_by_undirflokkur.get(data.get('undirflokkur'))
+		data_structs = typing.get_args(cls.__annotations__['data'])
+		if len(data_structs) == 2:  # Optional[struct], that is struct | None
+			return data_structs[0]
+		return None
+
+	def load_from_dict(self, data: dict, filename: str = None, derive_samsett: bool = True):
+		"""
+		validate @data into a struct, derive beygingar of samsett orð from their orðhlutar in
+		database (unless @derive_samsett is False) and update kennistrengur and datahash
+		"""
+		struct = self.get_data_struct(data)
+		attempts = 0
+		with instrumentation.phase('validate'):
+			if struct is not None:
+				attempts += 1
+				try:
+					self.data = struct(**data)
+				except pydantic.ValidationError:
+					pass  # try every struct below, for the error report
+			if self.data is None:
+				tracebacks = []
+				for struct in list(typing.get_args(self.__class__.__annotations__['data'])):
+					if struct is types.NoneType:
+						continue
+					attempts += 1
+					try:
+						self.data = struct(**data)
+						break
+					except pydantic.ValidationError:
+						tracebacks.append(traceback.format_exc())
+		instrumentation.count_retries(self, attempts - 1)
 		if self.data is None:
 			tracebacks_str = ''.join(tracebacks)
 			raise ValueError((
 				f'◈◈◈\n{tracebacks_str}Data didn\'t fit into any of the annotated structs.\n'
 				f'  (filename: {filename})'
 			))
-		if 'samsett' in self.data.dict() and self.data.samsett is not None:
-			data_derived_beygingar = self.derive_beygingar_from_samsett(self.data.dict())
-			self.data = struct(**data_derived_beygingar)
-		kennistr = self.make_kennistrengur()
-		datahash = self.get_data_hash()
+		self._load_finish(derive_samsett)
+
+	def load_from_json_bytes(self, content: bytes, filename: str = None, derive_samsett: bool = True):
+		"""
+		same as load_from_dict, but validating @content, raw JSON datafile content, straight into a
+		struct without building a dict first, pydantic parses floats for Decimal fields exactly
+		"""
+		try:
+			with instrumentation.phase('validate'):
+				self.data = self.get_data_adapter().validate_json(content)
+		except pydantic.ValidationError:
+			# load from dict instead, for the same error report
+			instrumentation.count_retries(self, 1)
+			with instrumentation.phase('parse'):
+				data = json.loads(content, parse_float=Decimal)
+			self.load_from_dict(data, filename, derive_samsett)
+			return
+		self._load_finish(derive_samsett)
+
+	def _load_finish(self, derive_samsett: bool):
+		with instrumentation.phase('derive'):
+			if (
+				derive_samsett is True and 'samsett' in self.data.dict() and
+				self.data.samsett is not None
+			):
+				data_derived_beygingar = self.derive_beygingar_from_samsett(self.data.dict())
+				self.data = type(self.data)(**data_derived_beygingar)
+			kennistr = self.make_kennistrengur()
+			datahash = self.get_data_hash()
 		if self.data.kennistrengur != kennistr:
 			logman.debug(f'kennistrengur update: {self.data.kennistrengur} -> {kennistr}')
 			self.data.kennistrengur = kennistr
@@ -752,14 +1046,24 @@ class Ord:
 			logman.debug(f'datahash update: {self.data.datahash} -> {datahash}')
 			self.data.datahash = datahash
 
-	def write_to_file(self, filename: str = None):
+	def write_to_file(self, filename: str = None, verify: bool = False):
 		"""
 		before writing to file we check if the file exists and if its contents are the same as what
-		we would be writing to it
+		we would be writing to it, unless @verify is True that is decided from the kennistrengur and
+		hash at the end of the file (see read_datafile_tail), when they match ours the file is left
+		as is without serializing
+
+		so without @verify a datafile edited by hand, and not imported, keeps its edit as long as
+		its kennistrengur and hash lines are unchanged, where it used to be overwritten with what is
+		in database, @verify (write-files --verify, as run in CI) compares the full content and
+		overwrites such edits
 		"""
 		if filename is None:
 			filename = self.make_filename()
 		filename_abs = os.path.join(self.datafiles_dir, filename)
+		if verify is False and self.data.datahash is not None and os.path.isfile(filename_abs):
+			if read_datafile_tail(filename_abs) == (self.data.kennistrengur, self.data.datahash):
+				return  # same data as in file, by hash
 		ord_data_json_str = self._ord_data_to_fancy_json_str(self.data.dict())
 		current_str = None
 		if os.path.isfile(filename_abs):
@@ -773,9 +1077,7 @@ class Ord:
 			fo.write(ord_data_json_str)
 
 	def _ord_data_to_fancy_json_str(self, data):
-		return json.dumps(
-			data, indent='\t', ensure_ascii=False, separators=(',', ': '), cls=MyIndentJSONEncoder
-		)
+		return dumps_datafile_json(data)
 
 	def get_data_hash(self):
 		"""
@@ -793,6 +1095,47 @@ class Ord:
 			).encode('utf-8')
 		).hexdigest()
 
+	def is_unchanged_in_db(self) -> bool:
+		"""
+		Usage:  unchanged = isl_ord.is_unchanged_in_db()
+		Before: @isl_ord has data loaded, including kennistrengur and datahash.
+		After:  @unchanged is True if database has a record with the same kennistrengur and
+				datahash, meaning that writing the data to database can be skipped.
+		"""
+		datahash = db.Session.query(self.db_model.Datahash).filter_by(
+			Kennistrengur=self.data.kennistrengur
+		).scalar()
+		return datahash is not None and datahash == self.data.datahash
+
+	def write_datahash_to_db(
+		self, isl_record: isl.Ord | isl.Skammstofun, changes_made: bool = True
+	) -> bool:
+		"""
+		store datahash on database record, should be called after the rest of the data has been
+		written so the stored datahash can be trusted by is_unchanged_in_db, returns True if the
+		stored datahash was changed
+
+		a missing datahash (for example on records of a database restored with use-backup, see
+		db.add_missing_columns) is only backfilled when @changes_made is False, then Edited is
+		kept as it was and False is returned, as the orð itself didn't change
+		"""
+		if isl_record.Datahash == self.data.datahash:
+			return False
+		if isl_record.Datahash is None and changes_made is False:
+			table = type(isl_record).__table__
+			primary_key = table.primary_key.columns.values()[0]
+			db.Session.execute(
+				sqlalchemy.update(table).where(
+					primary_key == getattr(isl_record, primary_key.name)
+				).values(Datahash=self.data.datahash, Edited=isl_record.Edited)
+			)
+			set_committed_value(isl_record, 'Datahash', self.data.datahash)
+			db.commit()
+			return False
+		isl_record.Datahash = self.data.datahash
+		db.commit()
+		return True
+
 	def detect_merking_in_filename(self, filename):
 		"""
 		look for "merking" in filename, for example "lofa" in filename "heita-_lofa_.json"
@@ -809,66 +1152,213 @@ class Ord:
 			'-_%s_' % (self.data.merking, ) if self.data.merking is not None else ''
 		)
 
-	def write_fallbeyging_to_db(self, fallbeyging_id, fallbeyging_list, changes_made=False):
-		isl_fallbeyging = None
-		if fallbeyging_id is None:
-			isl_fallbeyging = isl.Fallbeyging()
-			db.Session.add(isl_fallbeyging)
-			changes_made = True
-		else:
-			isl_fallbeyging = db.Session.query(isl.Fallbeyging).filter_by(
-				Fallbeyging_id=fallbeyging_id
-			).first()
-		if isl_fallbeyging is None:
-			raise ValueError('Should not happen.')
-		isl_fallbeyging.Nefnifall = fallbeyging_list[0]
-		isl_fallbeyging.Tholfall = fallbeyging_list[1]
-		isl_fallbeyging.Thagufall = fallbeyging_list[2]
-		isl_fallbeyging.Eignarfall = fallbeyging_list[3]
-		if db.Session.is_modified(isl_fallbeyging):
-			db.Session.commit()
-		changes_made = changes_made or db.Session.is_modified(isl_fallbeyging)
-		return (isl_fallbeyging.Fallbeyging_id, changes_made)
-
-	def write_sagnbeyging_to_db(self, sagnbeyging_id, sagnbeyging_obj, changes_made=False):
-		isl_sb = None
-		if sagnbeyging_id is None:
-			isl_sb = isl.Sagnbeyging()
-			db.Session.add(isl_sb)
-			changes_made = True
-		else:
-			isl_sb = db.Session.query(isl.Sagnbeyging).filter_by(
-				Sagnbeyging_id=sagnbeyging_id
-			).first()
-		if isl_sb is None:
-			raise ValueError('Should never happen.')
+	def stage_fallbeyging(self, isl_obj, fk_attr: str, fallbeyging_list: list):
+		"""
+		Usage:  self.stage_fallbeyging(isl_obj, fk_attr, fallbeyging_list)
+		Before: @isl_obj is a database record with Fallbeyging foreign key attribute @fk_attr,
+				@fallbeyging_list is a list of the four föll.
+		After:  fallbeyging has been staged for write_staged_beygingar_to_db, which writes it and
+				sets @fk_attr on @isl_obj.
+		"""
+		self.staged_fallbeygingar.append((isl_obj, fk_attr, {
+			'Nefnifall': fallbeyging_list[0],
+			'Tholfall': fallbeyging_list[1],
+			'Thagufall': fallbeyging_list[2],
+			'Eignarfall': fallbeyging_list[3],
+		}))
+
+	def stage_sagnbeyging(self, isl_obj, fk_attr: str, sagnbeyging_obj: dict):
+		"""
+		Like stage_fallbeyging, but for sagnbeyging, only tíðir and tölur present in
+		@sagnbeyging_obj are written.
+		"""
+		values = {}
 		if 'nútíð' in sagnbeyging_obj:
 			if 'et' in sagnbeyging_obj['nútíð']:
-				isl_sb.FyrstaPersona_eintala_nutid = sagnbeyging_obj['nútíð']['et'][0]
-				isl_sb.OnnurPersona_eintala_nutid = sagnbeyging_obj['nútíð']['et'][1]
-				isl_sb.ThridjaPersona_eintala_nutid = sagnbeyging_obj['nútíð']['et'][2]
+				values['FyrstaPersona_eintala_nutid'] = sagnbeyging_obj['nútíð']['et'][0]
+				values['OnnurPersona_eintala_nutid'] = sagnbeyging_obj['nútíð']['et'][1]
+				values['ThridjaPersona_eintala_nutid'] = sagnbeyging_obj['nútíð']['et'][2]
 			if 'ft' in sagnbeyging_obj['nútíð']:
-				isl_sb.FyrstaPersona_fleirtala_nutid = sagnbeyging_obj['nútíð']['ft'][0]
-				isl_sb.OnnurPersona_fleirtala_nutid = sagnbeyging_obj['nútíð']['ft'][1]
-				isl_sb.ThridjaPersona_fleirtala_nutid = sagnbeyging_obj['nútíð']['ft'][2]
+				values['FyrstaPersona_fleirtala_nutid'] = sagnbeyging_obj['nútíð']['ft'][0]
+				values['OnnurPersona_fleirtala_nutid'] = sagnbeyging_obj['nútíð']['ft'][1]
+				values['ThridjaPersona_fleirtala_nutid'] = sagnbeyging_obj['nútíð']['ft'][2]
 		if 'þátíð' in sagnbeyging_obj:
 			if 'et' in sagnbeyging_obj['þátíð']:
-				isl_sb.FyrstaPersona_eintala_thatid = sagnbeyging_obj['þátíð']['et'][0]
-				isl_sb.OnnurPersona_eintala_thatid = sagnbeyging_obj['þátíð']['et'][1]
-				isl_sb.ThridjaPersona_eintala_thatid = sagnbeyging_obj['þátíð']['et'][2]
+				values['FyrstaPersona_eintala_thatid'] = sagnbeyging_obj['þátíð']['et'][0]
+				values['OnnurPersona_eintala_thatid'] = sagnbeyging_obj['þátíð']['et'][1]
+				values['ThridjaPersona_eintala_thatid'] = sagnbeyging_obj['þátíð']['et'][2]
 			if 'ft' in sagnbeyging_obj['þátíð']:
-				isl_sb.FyrstaPersona_fleirtala_thatid = sagnbeyging_obj['þátíð']['ft'][0]
-				isl_sb.OnnurPersona_fleirtala_thatid = sagnbeyging_obj['þátíð']['ft'][1]
-				isl_sb.ThridjaPersona_fleirtala_thatid = sagnbeyging_obj['þátíð']['ft'][2]
-		if db.Session.is_modified(isl_sb):
-			db.Session.commit()
-		changes_made = changes_made or db.Session.is_modified(isl_sb)
-		return (isl_sb.Sagnbeyging_id, changes_made)
+				values['FyrstaPersona_fleirtala_thatid'] = sagnbeyging_obj['þátíð']['ft'][0]
+				values['OnnurPersona_fleirtala_thatid'] = sagnbeyging_obj['þátíð']['ft'][1]
+				values['ThridjaPersona_fleirtala_thatid'] = sagnbeyging_obj['þátíð']['ft'][2]
+		self.staged_sagnbeygingar.append((isl_obj, fk_attr, values))
+
+	def write_staged_beygingar_to_db(self, changes_made: bool = False) -> bool:
+		"""
+		Usage:  changes_made = self.write_staged_beygingar_to_db(changes_made)
+		Before: fallbeygingar and sagnbeygingar have been staged with stage_fallbeyging and
+				stage_sagnbeyging.
+		After:  staged beygingar have been written to database, existing rows loaded with one
+				IN query per table, changed rows updated and new rows inserted with executemany,
+				and foreign keys set on the staging records. When fallbeygingar are deduplicated
+				(see is_fallbeyging_dedup) fallbeygingar are instead shared by hash and never
+				updated. @changes_made is True if it was True before or if any rows were inserted
+				or changed.
+		"""
+		if is_fallbeyging_dedup():
+			changes_made = self._write_staged_fallbeygingar_dedup_to_db(
+				self.staged_fallbeygingar, changes_made
+			)
+		else:
+			changes_made = self._write_staged_rows_to_db(
+				isl.Fallbeyging, self.staged_fallbeygingar, changes_made
+			)
+		changes_made = self._write_staged_rows_to_db(
+			isl.Sagnbeyging, self.staged_sagnbeygingar, changes_made
+		)
+		self.staged_fallbeygingar = []
+		self.staged_sagnbeygingar = []
+		return changes_made
+
+	def _write_staged_rows_to_db(self, model, staged: list[tuple], changes_made: bool) -> bool:
+		if len(staged) == 0:
+			return changes_made
+		table = model.__table__
+		pk_column = table.primary_key.columns[0]
+		value_columns = [
+			column.name for column in table.columns
+			if column is not pk_column and column.name not in ('Edited', 'Created')
+		]
+		existing_ids = [getattr(isl_obj, fk_attr) for isl_obj, fk_attr, _ in staged]
+		existing_rows = {}
+		if any(row_id is not None for row_id in existing_ids):
+			for row in db.Session.execute(sqlalchemy.select(table).where(
+				pk_column.in_([row_id for row_id in existing_ids if row_id is not None])
+			)).mappings():
+				existing_rows[row[pk_column.name]] = row
+		inserts = []
+		insert_targets = []
+		updates = []
+		for (isl_obj, fk_attr, values), row_id in zip(staged, existing_ids):
+			if row_id is None:
+				inserts.append(dict((column, values.get(column)) for column in value_columns))
+				insert_targets.append((isl_obj, fk_attr))
+				continue
+			if row_id not in existing_rows:
+				raise ValueError('Should not happen.')
+			row = existing_rows[row_id]
+			if all(row[column] == value for column, value in values.items()):
+				continue
+			update = dict(('v_%s' % (column, ), row[column]) for column in value_columns)
+			for column, value in values.items():
+				update['v_%s' % (column, )] = value
+			update['v_id'] = row_id
+			updates.append(update)
+		if len(updates) > 0:
+			db.Session.execute(
+				sqlalchemy.update(table).where(
+					pk_column == sqlalchemy.bindparam('v_id')
+				).values(dict(
+					(column, sqlalchemy.bindparam('v_%s' % (column, ))) for column in value_columns
+				)),
+				updates
+			)
+			for update in updates:  # keep instances in session from going stale
+				isl_instance = db.Session.identity_map.get(
+					identity_key(model, update['v_id'])
+				)
+				if isl_instance is not None:
+					db.Session.expire(isl_instance)
+		if len(inserts) > 0:
+			inserted_ids = db.Session.execute(
+				sqlalchemy.insert(table).returning(pk_column, sort_by_parameter_order=True),
+				inserts
+			).scalars().all()
+			for (isl_obj, fk_attr), row_id in zip(insert_targets, inserted_ids):
+				setattr(isl_obj, fk_attr, row_id)
+		if len(updates) > 0 or len(inserts) > 0:
+			db.commit()
+			changes_made = True
+		return changes_made
+
+	def _write_staged_fallbeygingar_dedup_to_db(self, staged: list[tuple], changes_made: bool):
+		"""
+		content-addressed counterpart of _write_staged_rows_to_db for fallbeygingar, rows are
+		found by hash and shared, never updated, a changed fallbeyging gets the foreign key of
+		another (possibly new) row and the old row is left for dedup.gc_fallbeygingar
+		"""
+		if len(staged) == 0:
+			return changes_made
+		fallbeygingar_by_hash = get_fallbeygingar_by_hash()
+		hashes = []
+		inserts = {}
+		for _, _, values in staged:
+			fallbeyging_hash = get_fallbeyging_hash(values)
+			hashes.append(fallbeyging_hash)
+			if fallbeyging_hash in fallbeygingar_by_hash:
+				check_fallbeyging_hash(fallbeygingar_by_hash[fallbeyging_hash], values)
+			elif fallbeyging_hash not in inserts:
+				inserts[fallbeyging_hash] = dict(values, Hash=fallbeyging_hash)
+		if len(inserts) > 0:
+			inserted_ids = db.Session.execute(
+				sqlalchemy.insert(isl.Fallbeyging.__table__).returning(
+					isl.Fallbeyging.Fallbeyging_id, sort_by_parameter_order=True
+				),
+				list(inserts.values())
+			).scalars().all()
+			for (fallbeyging_hash, values), row_id in zip(inserts.items(), inserted_ids):
+				fallbeygingar_by_hash[fallbeyging_hash] = dict(values, Fallbeyging_id=row_id)
+		fks_changed = False
+		for (isl_obj, fk_attr, _), fallbeyging_hash in zip(staged, hashes):
+			row_id = fallbeygingar_by_hash[fallbeyging_hash]['Fallbeyging_id']
+			if getattr(isl_obj, fk_attr) != row_id:
+				setattr(isl_obj, fk_attr, row_id)
+				fks_changed = True
+		if fks_changed is True or len(inserts) > 0:
+			db.commit()
+			changes_made = True
+		return changes_made
+
+	def prefetch_beygingar(self, *isl_records):
+		"""
+		Usage:  self.prefetch_beygingar(*isl_records)
+		Before: @isl_records are records (None ignored) with foreign keys to Fallbeyging and/or
+				Sagnbeyging rows.
+		After:  Rows referenced by @isl_records have been fetched with one IN query per table and
+				are used by load_fallbeyging_from_db and load_sagnbeyging_from_db.
+		"""
+		ids = collections.defaultdict(set)
+		for isl_record in isl_records:
+			if isl_record is None:
+				continue
+			for fk_attr, model in get_beygingar_fk_attributes(type(isl_record)):
+				row_id = getattr(isl_record, fk_attr)
+				if row_id is not None and (model, row_id) not in self.prefetched_beygingar:
+					ids[model].add(row_id)
+		for model, model_ids in ids.items():
+			pk_column = model.__mapper__.primary_key[0]
+			model_ids = sorted(model_ids)
+			for index in range(0, len(model_ids), Prefetch_Chunksize):
+				for isl_row in db.Session.query(model).filter(
+					pk_column.in_(model_ids[index:index + Prefetch_Chunksize])
+				):
+					self.prefetched_beygingar[(model, getattr(isl_row, pk_column.key))] = isl_row
+
+	def get_ordflokkur_record(self, model, isl_ord: isl.Ord):
+		"""
+		record of @model (one of Ordflokkur_Models) for @isl_ord, prefetched when within
+		prefetched_ord_range context, else queried
+		"""
+		if Prefetched_Records is not None and (model, isl_ord.Ord_id) in Prefetched_Records:
+			return Prefetched_Records[(model, isl_ord.Ord_id)]
+		return db.Session.query(model).filter_by(fk_Ord_id=isl_ord.Ord_id).first()
 
 	def load_fallbeyging_from_db(self, fallbeyging_id: int) -> list:
-		isl_fallbeyging = db.Session.query(isl.Fallbeyging).filter_by(
-			Fallbeyging_id=fallbeyging_id
-		).first()
+		isl_fallbeyging = self.prefetched_beygingar.get((isl.Fallbeyging, fallbeyging_id))
+		if isl_fallbeyging is None:
+			isl_fallbeyging = db.Session.query(isl.Fallbeyging).filter_by(
+				Fallbeyging_id=fallbeyging_id
+			).first()
 		if isl_fallbeyging is None:
 			raise ValueError(f'Fałlbeyging ({fallbeyging_id}) not found.')
 		return [
@@ -877,9 +1367,11 @@ class Ord:
 		]
 
 	def load_sagnbeyging_from_db(self, sagnbeyging_id: int) -> list:
-		isl_sb = db.Session.query(isl.Sagnbeyging).filter_by(
-			Sagnbeyging_id=sagnbeyging_id
-		).first()
+		isl_sb = self.prefetched_beygingar.get((isl.Sagnbeyging, sagnbeyging_id))
+		if isl_sb is None:
+			isl_sb = db.Session.query(isl.Sagnbeyging).filter_by(
+				Sagnbeyging_id=sagnbeyging_id
+			).first()
 		if isl_sb is None:
 			raise ValueError(f'Sagnbeyging with id={sagnbeyging_id} not found.')
 		data = {}
@@ -1261,63 +1753,86 @@ class Ord:
 					del isl_ord_dict['lýsingarháttur']
 		return isl_ord_dict
 
-	def prepend_str_to_dict(self, ord_str: str, ord_dict: dict) -> dict:
+	def prepend_to_beygingar(self, prefixes: list[tuple], ord_value, key_path: str = ''):
 		"""
-		prepend str to all appropriate values in beygingar dict
+		Usage:  beygingar = self.prepend_to_beygingar(prefixes, ord_value)
+		Before: @ord_value is beygingar (dict, or a value within it) of the last orðhluti of a
+				samsett orð, @prefixes is a list of (mynd, pre_value) tuples for the orðhlutar
+				before it, nearest orðhluti first, either with mynd str to prepend to every value
+				or mynd None and pre_value beygingar parallel to @ord_value. Neither is changed,
+				beygingar may be shared with the orðhluti beygingar cache.
+		After:  @beygingar is a new value shaped like @ord_value, built in one pass, where every
+				str has the parallel prefixes prepended, raises ValueError if beygingar in
+				@prefixes don't match @ord_value. Lists and dicts in @beygingar are never shared
+				with @ord_value or @prefixes, see test_samsett_derivation.
 		"""
-		dont_change_keys = set(['frumlag'])
-		for key in ord_dict:
-			if key in dont_change_keys:
-				continue
-			if isinstance(ord_dict[key], str):
-				ord_dict[key] = '%s%s' % (ord_str, ord_dict[key])
-			elif isinstance(ord_dict[key], list):
-				for i in range(0, len(ord_dict[key])):
-					if ord_dict[key][i] is None:
-						continue
-					elif isinstance(ord_dict[key][i], str):
-						ord_dict[key][i] = '%s%s' % (ord_str, ord_dict[key][i])
-					elif isinstance(ord_dict[key][i], dict):
-						ord_dict[key][i] = self.prepend_str_to_dict(ord_str, ord_dict[key][i])
-			elif isinstance(ord_dict[key], dict):
-				ord_dict[key] = self.prepend_str_to_dict(ord_str, ord_dict[key])
-		return ord_dict
+		if isinstance(ord_value, str):
+			for mynd, pre_value in prefixes:
+				if mynd is None and not isinstance(pre_value, str):
+					raise ValueError('Key pre_dict%s should be str.' % (key_path, ))
+			return ''.join(
+				pre_value if mynd is None else mynd for mynd, pre_value in reversed(prefixes)
+			) + ord_value
+		if isinstance(ord_value, list):
+			for mynd, pre_value in prefixes:
+				if mynd is None and not isinstance(pre_value, list):
+					raise ValueError('Key pre_dict%s should be list.' % (key_path, ))
+			beygingar = []
+			for i, ord_item in enumerate(ord_value):
+				if isinstance(ord_item, (str, dict)):
+					ord_item = self.prepend_to_beygingar(
+						[
+							(mynd, pre_value[i] if mynd is None else None)
+							for mynd, pre_value in prefixes
+						],
+						ord_item, '%s[%s]' % (key_path, i)
+					)
+				beygingar.append(ord_item)
+			return beygingar
+		if isinstance(ord_value, dict):
+			for mynd, pre_value in prefixes:
+				if mynd is None and not isinstance(pre_value, dict):
+					raise ValueError('Key pre_dict%s should be dict.' % (key_path, ))
+			beygingar = {}
+			for key, ord_item in ord_value.items():
+				if key in self.unprefixed_keys_via_samsett_ord:
+					beygingar[key] = ord_item
+					continue
+				item_prefixes = []
+				for mynd, pre_value in prefixes:
+					if mynd is not None:
+						item_prefixes.append((mynd, None))
+					elif key not in pre_value:
+						raise ValueError('Key "%s" missing from pre_dict.' % (key, ))
+					else:
+						item_prefixes.append((None, pre_value[key]))
+				beygingar[key] = self.prepend_to_beygingar(
+					item_prefixes, ord_item, '["%s"]' % (key, )
+				)
+			return beygingar
+		return ord_value
 
-	def merge_dict_to_dict(self, pre_dict: dict, ord_dict: dict) -> dict:
+	def prepend_str_to_beygingar(self, ord_str: str, ord_value):
 		"""
-		prepend pre beygingar dict to parallel values in beygingar dict
+		same as prepend_to_beygingar when every prefix is a mynd, @ord_str being the myndir joined,
+		which is the usual case
 		"""
-		dont_change_keys = set(['frumlag'])
-		for key in ord_dict:
-			if key in dont_change_keys:
-				continue
-			if key not in pre_dict:
-				raise ValueError('Key "%s" missing from pre_dict.' % (key, ))
-			if isinstance(ord_dict[key], str):
-				if not isinstance(pre_dict[key], str):
-					raise ValueError('Key pre_dict["%s"] should be str.' % (key, ))
-				ord_dict[key] = '%s%s' % (pre_dict[key], ord_dict[key])
-			elif isinstance(ord_dict[key], list):
-				if not isinstance(pre_dict[key], list):
-					raise ValueError('Key pre_dict["%s"] should be list.' % (key, ))
-				for i in range(0, len(ord_dict[key])):
-					if ord_dict[key][i] is None:
-						continue
-					elif isinstance(ord_dict[key][i], str):
-						if not isinstance(pre_dict[key][i], str):
-							raise ValueError('Key pre_dict["%s"][%s] should be str.' % (key, i))
-						ord_dict[key][i] = '%s%s' % (pre_dict[key][i], ord_dict[key][i])
-					elif isinstance(ord_dict[key][i], dict):
-						if not isinstance(pre_dict[key][i], dict):
-							raise ValueError('Key pre_dict["%s"][%s] should be dict.' % (key, i))
-						ord_dict[key][i] = (
-							self.merge_dict_to_dict(pre_dict[key][i], ord_dict[key][i])
-						)
-			elif isinstance(ord_dict[key], dict):
-				if not isinstance(pre_dict[key], dict):
-					raise ValueError('Key pre_dict["%s"] should be dict.' % (key, ))
-				ord_dict[key] = self.merge_dict_to_dict(pre_dict[key], ord_dict[key])
-		return ord_dict
+		if isinstance(ord_value, str):
+			return ord_str + ord_value
+		if isinstance(ord_value, list):
+			return [
+				ord_str + ord_item if isinstance(ord_item, str) else (
+					self.prepend_str_to_beygingar(ord_str, ord_item)
+					if isinstance(ord_item, dict) else ord_item
+				) for ord_item in ord_value
+			]
+		if isinstance(ord_value, dict):
+			return {
+				key: ord_item if key in self.unprefixed_keys_via_samsett_ord else (
+					self.prepend_str_to_beygingar(ord_str, ord_item)
+				) for key, ord_item in ord_value.items()
+			}
+		return ord_value
 
 	def ordhluti_get_beygingar(self, ordhluti: dict) -> dict:
 		"""
@@ -1325,7 +1840,19 @@ class Ord:
 		Before: @ordhluti is a dict containing mynd and samsetning type, or myndir type, and
 				kennistrengur for orð.
 		After:  @beygingar is a dict containing beygingar info for orð of the @orðhluti.
+				Results are kept in a bounded LRU cache and shared with it, so @beygingar should be
+				treated as read-only.
 		"""
+		global Ordhluti_Beygingar_Cache_Hits, Ordhluti_Beygingar_Cache_Misses
+		cache_key = json.dumps(ordhluti, ensure_ascii=False, sort_keys=True, default=str)
+		if cache_key in Ordhluti_Beygingar_Cache:
+			Ordhluti_Beygingar_Cache_Hits += 1
+			Ordhluti_Beygingar_Cache.move_to_end(cache_key)
+			kennistrengir, isl_ord_dict = Ordhluti_Beygingar_Cache[cache_key]
+			if len(Ordhluti_Beygingar_Cache_Deriving) > 0:
+				Ordhluti_Beygingar_Cache_Deriving[-1].update(kennistrengir)
+			return isl_ord_dict
+		Ordhluti_Beygingar_Cache_Misses += 1
 		isl_ord = None
 		handlers_map = {}
 		for handler in list_handlers():
@@ -1337,65 +1864,80 @@ class Ord:
 				'Missing handler for kennistrengur "%s".' % (ordhluti['kennistrengur'], )
 			)
 		handler = handlers_map[ordhluti_flokkur_abbr]
-		isl_ord = db.Session.query(isl.Ord).filter_by(
-			Kennistrengur=ordhluti['kennistrengur']
-		).first()
+		ord_id = get_ord_id(ordhluti['kennistrengur'])
+		if ord_id is not None:
+			isl_ord = db.Session.get(isl.Ord, ord_id)
 		if isl_ord is None:
 			raise VoidKennistrengurError(
 				'Orð with kennistrengur "%s" not found. (3)' % (ordhluti['kennistrengur'], )
 			)
 		loaded_ord = handler()
-		loaded_ord.load_from_db(isl_ord)
+		# record kennistrengir of the orð that beygingar of a samsett orð are derived from, on
+		# load_from_db, so the entry is invalidated along with them
+		kennistrengir = set([ordhluti['kennistrengur']])
+		Ordhluti_Beygingar_Cache_Deriving.append(kennistrengir)
+		try:
+			loaded_ord.load_from_db(isl_ord)
+		finally:
+			Ordhluti_Beygingar_Cache_Deriving.pop()
+		if len(Ordhluti_Beygingar_Cache_Deriving) > 0:
+			Ordhluti_Beygingar_Cache_Deriving[-1].update(kennistrengir)
 		isl_ord_dict = loaded_ord.data.dict()
 		for key in self.non_inherited_keys_via_samsett_ord:
 			if key in isl_ord_dict:
 				del isl_ord_dict[key]
 		isl_ord_dict = self.apply_beygingar_filters(isl_ord_dict, ordhluti)
 		isl_ord_dict = self.apply_ordhluti_ch_to_dict(isl_ord_dict, ordhluti)
+		Ordhluti_Beygingar_Cache[cache_key] = (frozenset(kennistrengir), isl_ord_dict)
+		for kennistrengur in kennistrengir:
+			Ordhluti_Beygingar_Cache_Keys.setdefault(kennistrengur, set()).add(cache_key)
+		while len(Ordhluti_Beygingar_Cache) > Ordhluti_Beygingar_Cache_Size:
+			_drop_ordhluti_beygingar(next(iter(Ordhluti_Beygingar_Cache)))
 		return isl_ord_dict
 
 	def get_lo_myndir_beygingar(self, ordhluti: dict) -> dict:
 		"""
-		map lýsingarorð beygingar to nafnorð-like beygingar (also sérnafn-like)
+		map lýsingarorð beygingar to nafnorð-like beygingar (also sérnafn-like), shares values
+		with the orðhluti beygingar cache so should be treated as read-only
 		"""
 		beygingar = self.ordhluti_get_beygingar(ordhluti)
 		match ordhluti['myndir']:
 			case structs.LysingarordMyndir.Frumstig_vb_kk.value:
-				fallbeyging_et = beygingar['frumstig']['vb']['et']['kk'].copy()
-				fallbeyging_ft = beygingar['frumstig']['vb']['ft']['kk'].copy()
+				fallbeyging_et = beygingar['frumstig']['vb']['et']['kk']
+				fallbeyging_ft = beygingar['frumstig']['vb']['ft']['kk']
 			case structs.LysingarordMyndir.Frumstig_vb_kvk.value:
-				fallbeyging_et = beygingar['frumstig']['vb']['et']['kvk'].copy()
-				fallbeyging_ft = beygingar['frumstig']['vb']['ft']['kvk'].copy()
+				fallbeyging_et = beygingar['frumstig']['vb']['et']['kvk']
+				fallbeyging_ft = beygingar['frumstig']['vb']['ft']['kvk']
 			case structs.LysingarordMyndir.Frumstig_vb_hk:
-				fallbeyging_et = beygingar['frumstig']['vb']['et']['hk'].copy()
-				fallbeyging_ft = beygingar['frumstig']['vb']['ft']['hk'].copy()
+				fallbeyging_et = beygingar['frumstig']['vb']['et']['hk']
+				fallbeyging_ft = beygingar['frumstig']['vb']['ft']['hk']
 			case structs.LysingarordMyndir.Midstig_vb_kk.value:
-				fallbeyging_et = beygingar['miðstig']['vb']['et']['kk'].copy()
-				fallbeyging_ft = beygingar['miðstig']['vb']['ft']['kk'].copy()
+				fallbeyging_et = beygingar['miðstig']['vb']['et']['kk']
+				fallbeyging_ft = beygingar['miðstig']['vb']['ft']['kk']
 			case structs.LysingarordMyndir.Midstig_vb_kvk.value:
-				fallbeyging_et = beygingar['miðstig']['vb']['et']['kvk'].copy()
-				fallbeyging_ft = beygingar['miðstig']['vb']['ft']['kvk'].copy()
+				fallbeyging_et = beygingar['miðstig']['vb']['et']['kvk']
+				fallbeyging_ft = beygingar['miðstig']['vb']['ft']['kvk']
 			case structs.LysingarordMyndir.Midstig_vb_hk.value:
-				fallbeyging_et = beygingar['miðstig']['vb']['et']['hk'].copy()
-				fallbeyging_ft = beygingar['miðstig']['vb']['ft']['hk'].copy()
+				fallbeyging_et = beygingar['miðstig']['vb']['et']['hk']
+				fallbeyging_ft = beygingar['miðstig']['vb']['ft']['hk']
 			case structs.LysingarordMyndir.Efstastig_vb_kk.value:
-				fallbeyging_et = beygingar['efstastig']['vb']['et']['kk'].copy()
-				fallbeyging_ft = beygingar['efstastig']['vb']['ft']['kk'].copy()
+				fallbeyging_et = beygingar['efstastig']['vb']['et']['kk']
+				fallbeyging_ft = beygingar['efstastig']['vb']['ft']['kk']
 			case structs.LysingarordMyndir.Efstastig_vb_kvk.value:
-				fallbeyging_et = beygingar['efstastig']['vb']['et']['kvk'].copy()
-				fallbeyging_ft = beygingar['efstastig']['vb']['ft']['kvk'].copy()
+				fallbeyging_et = beygingar['efstastig']['vb']['et']['kvk']
+				fallbeyging_ft = beygingar['efstastig']['vb']['ft']['kvk']
 			case structs.LysingarordMyndir.Efstastig_vb_hk.value:
-				fallbeyging_et = beygingar['efstastig']['vb']['et']['hk'].copy()
-				fallbeyging_ft = beygingar['efstastig']['vb']['ft']['hk'].copy()
+				fallbeyging_et = beygingar['efstastig']['vb']['et']['hk']
+				fallbeyging_ft = beygingar['efstastig']['vb']['ft']['hk']
 			case structs.LysingarordMyndir.Stiglaus_vb_kk.value:
-				fallbeyging_et = beygingar['vb']['et']['kk'].copy()
-				fallbeyging_ft = beygingar['vb']['ft']['kk'].copy()
+				fallbeyging_et = beygingar['vb']['et']['kk']
+				fallbeyging_ft = beygingar['vb']['ft']['kk']
 			case structs.LysingarordMyndir.Stiglaus_vb_kvk.value:
-				fallbeyging_et = beygingar['vb']['et']['kvk'].copy()
-				fallbeyging_ft = beygingar['vb']['ft']['kvk'].copy()
+				fallbeyging_et = beygingar['vb']['et']['kvk']
+				fallbeyging_ft = beygingar['vb']['ft']['kvk']
 			case structs.LysingarordMyndir.Stiglaus_vb_hk.value:
-				fallbeyging_et = beygingar['vb']['et']['hk'].copy()
-				fallbeyging_ft = beygingar['vb']['ft']['hk'].copy()
+				fallbeyging_et = beygingar['vb']['et']['hk']
+				fallbeyging_ft = beygingar['vb']['ft']['hk']
 			case _:
 				raise ValueError('Unexpected ordhluti.myndir.')
 		lo_myndir_beygingar = {
@@ -1408,7 +1950,8 @@ class Ord:
 		"""
 		Usage:  beygingar = self.merge_ordhlutar(samsett)
 		Before: @samsett is a list of dicts containging info on combination of a orð.
-		After:  @beygingar is a dict containing derived beygingar for the orð.
+		After:  @beygingar is a new dict containing derived beygingar for the orð, see
+				prepend_to_beygingar, beygingar of orðhlutar are not copied on the way.
 		"""
 		if 'mynd' in samsett[-1]:
 			return {}
@@ -1417,16 +1960,19 @@ class Ord:
 			beygingar = self.apply_beygingar_filters(beygingar, samsett[-1])
 		else:
 			beygingar = self.ordhluti_get_beygingar(samsett[-1])
+		if all('mynd' in ordhluti for ordhluti in samsett[:-1]):
+			return self.prepend_str_to_beygingar(
+				''.join(ordhluti['mynd'] for ordhluti in samsett[:-1]), beygingar
+			)
+		prefixes = []
 		for ordhluti in reversed(samsett[:-1]):
 			if 'mynd' in ordhluti:
-				beygingar = self.prepend_str_to_dict(ordhluti['mynd'], beygingar)
+				prefixes.append((ordhluti['mynd'], None))
 			elif 'myndir' in ordhluti:
-				lo_myndir_beygingar = self.get_lo_myndir_beygingar(ordhluti)
-				beygingar = self.merge_dict_to_dict(lo_myndir_beygingar, beygingar)
+				prefixes.append((None, self.get_lo_myndir_beygingar(ordhluti)))
 			else:
-				oh_beygingar = self.ordhluti_get_beygingar(ordhluti)
-				beygingar = self.merge_dict_to_dict(oh_beygingar, beygingar)
-		return beygingar
+				prefixes.append((None, self.ordhluti_get_beygingar(ordhluti)))
+		return self.prepend_to_beygingar(prefixes, beygingar)
 
 	def derive_beygingar_from_samsett(self, data: dict) -> dict:
 		"""
@@ -1434,14 +1980,13 @@ class Ord:
 		Before: @data is a dict containing orð data which is combined, that is, it has a samsett
 				list of one or more orð).
 		After:  @derived is a dict containing orð data, but has overwritten beygingar for the orð
-				based on samsett data.
+				based on samsett data. Values not derived are shared with @data, not copied.
 		"""
 		preserve_keys = ['fleiryrt', 'stýrir']
-		derived = copy.deepcopy(data)
-		# delete current beygingar from orð data
-		for key in data:
-			if key not in self.non_inherited_keys_via_samsett_ord:
-				del derived[key]
+		# orð data without current beygingar
+		derived = dict(
+			(key, data[key]) for key in data if key in self.non_inherited_keys_via_samsett_ord
+		)
 		derived_beygingar = self.merge_ordhlutar(derived['samsett'])
 		# add derived beygingar to orð data
 		for key in derived_beygingar:
@@ -1482,44 +2027,42 @@ class Nafnord(Ord):
 		if isl_no is None:
 			isl_no = isl.Nafnord(fk_Ord_id=isl_ord.Ord_id)
 			db.Session.add(isl_no)
-			db.Session.commit()
+			db.commit()
 			changes_made = True
 		isl_no.Kyn = isl.Kyn[self.data.kyn.name]
 		if self.data.samsett is not None:
 			changes_made = changes_made or db.Session.is_modified(isl_no)
 			if changes_made is True:
 				isl_ord.Edited = datetime.datetime.utcnow()
-				db.Session.commit()
+				db.commit()
 			return (isl_ord, changes_made)
 		if self.data.et is not None:
 			if self.data.et.ág is not None:
-				isl_no.fk_et_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_no.fk_et_Fallbeyging_id, self.data.et.ág, changes_made
-				)
+				self.stage_fallbeyging(isl_no, 'fk_et_Fallbeyging_id', self.data.et.ág)
 			if self.data.et.mg is not None:
-				isl_no.fk_et_mgr_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_no.fk_et_mgr_Fallbeyging_id, self.data.et.mg, changes_made
-				)
+				self.stage_fallbeyging(isl_no, 'fk_et_mgr_Fallbeyging_id', self.data.et.mg)
 		if self.data.ft is not None:
 			if self.data.ft.ág is not None:
-				isl_no.fk_ft_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_no.fk_ft_Fallbeyging_id, self.data.ft.ág, changes_made
-				)
+				self.stage_fallbeyging(isl_no, 'fk_ft_Fallbeyging_id', self.data.ft.ág)
 			if self.data.ft.mg is not None:
-				isl_no.fk_ft_mgr_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_no.fk_ft_mgr_Fallbeyging_id, self.data.ft.mg, changes_made
-				)
+				self.stage_fallbeyging(isl_no, 'fk_ft_mgr_Fallbeyging_id', self.data.ft.mg)
+		changes_made = self.write_staged_beygingar_to_db(changes_made)
 		changes_made = changes_made or db.Session.is_modified(isl_no)
 		if db.Session.is_modified(isl_no):
-			db.Session.commit()
+			db.commit()
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
+	def load_filename_fields_from_db(self, isl_ord: isl.Ord) -> dict:
+		isl_nafnord = self.get_ordflokkur_record(isl.Nafnord, isl_ord)
+		return {'kyn': structs.Kyn[isl_nafnord.Kyn.name]}
+
 	def load_from_db(self, isl_ord: isl.Ord):
 		ord_data = super().load_from_db(isl_ord)
-		isl_nafnord = db.Session.query(isl.Nafnord).filter_by(fk_Ord_id=isl_ord.Ord_id).first()
+		isl_nafnord = self.get_ordflokkur_record(isl.Nafnord, isl_ord)
+		self.prefetch_beygingar(isl_nafnord)
 		ord_data['kyn'] = structs.Kyn[isl_nafnord.Kyn.name].value
 		if isl_ord.Samsett is True:
 			ord_data = self.derive_beygingar_from_samsett(ord_data)
@@ -1588,272 +2131,213 @@ class Lysingarord(Ord):
 		if isl_lo is None:
 			isl_lo = isl.Lysingarord(fk_Ord_id=isl_ord.Ord_id)
 			db.Session.add(isl_lo)
-			db.Session.commit()
+			db.commit()
 			changes_made = True
 		if self.data.frumstig is not None:
 			if self.data.frumstig.sb is not None:
 				if self.data.frumstig.sb.et is not None:
 					if self.data.frumstig.sb.et.kk is not None:
-						isl_lo.fk_Frumstig_sb_et_kk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_sb_et_kk_Fallbeyging_id,
-								self.data.frumstig.sb.et.kk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_sb_et_kk_Fallbeyging_id',
+							self.data.frumstig.sb.et.kk
 						)
 					if self.data.frumstig.sb.et.kvk is not None:
-						isl_lo.fk_Frumstig_sb_et_kvk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_sb_et_kvk_Fallbeyging_id,
-								self.data.frumstig.sb.et.kvk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_sb_et_kvk_Fallbeyging_id',
+							self.data.frumstig.sb.et.kvk
 						)
 					if self.data.frumstig.sb.et.hk is not None:
-						isl_lo.fk_Frumstig_sb_et_hk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_sb_et_hk_Fallbeyging_id,
-								self.data.frumstig.sb.et.hk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_sb_et_hk_Fallbeyging_id',
+							self.data.frumstig.sb.et.hk
 						)
 				if self.data.frumstig.sb.ft is not None:
 					if self.data.frumstig.sb.ft.kk is not None:
-						isl_lo.fk_Frumstig_sb_ft_kk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_sb_ft_kk_Fallbeyging_id,
-								self.data.frumstig.sb.ft.kk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_sb_ft_kk_Fallbeyging_id',
+							self.data.frumstig.sb.ft.kk
 						)
 					if self.data.frumstig.sb.ft.kvk is not None:
-						isl_lo.fk_Frumstig_sb_ft_kvk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_sb_ft_kvk_Fallbeyging_id,
-								self.data.frumstig.sb.ft.kvk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_sb_ft_kvk_Fallbeyging_id',
+							self.data.frumstig.sb.ft.kvk
 						)
 					if self.data.frumstig.sb.ft.hk is not None:
-						isl_lo.fk_Frumstig_sb_ft_hk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_sb_ft_hk_Fallbeyging_id,
-								self.data.frumstig.sb.ft.hk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_sb_ft_hk_Fallbeyging_id',
+							self.data.frumstig.sb.ft.hk
 						)
 			if self.data.frumstig.vb is not None:
 				if self.data.frumstig.vb.et is not None:
 					if self.data.frumstig.vb.et.kk is not None:
-						isl_lo.fk_Frumstig_vb_et_kk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_vb_et_kk_Fallbeyging_id,
-								self.data.frumstig.vb.et.kk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_vb_et_kk_Fallbeyging_id',
+							self.data.frumstig.vb.et.kk
 						)
 					if self.data.frumstig.vb.et.kvk is not None:
-						isl_lo.fk_Frumstig_vb_et_kvk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_vb_et_kvk_Fallbeyging_id,
-								self.data.frumstig.vb.et.kvk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_vb_et_kvk_Fallbeyging_id',
+							self.data.frumstig.vb.et.kvk
 						)
 					if self.data.frumstig.vb.et.hk is not None:
-						isl_lo.fk_Frumstig_vb_et_hk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_vb_et_hk_Fallbeyging_id,
-								self.data.frumstig.vb.et.hk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_vb_et_hk_Fallbeyging_id',
+							self.data.frumstig.vb.et.hk
 						)
 				if self.data.frumstig.vb.ft is not None:
 					if self.data.frumstig.vb.ft.kk is not None:
-						isl_lo.fk_Frumstig_vb_ft_kk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_vb_ft_kk_Fallbeyging_id,
-								self.data.frumstig.vb.ft.kk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_vb_ft_kk_Fallbeyging_id',
+							self.data.frumstig.vb.ft.kk
 						)
 					if self.data.frumstig.vb.ft.kvk is not None:
-						isl_lo.fk_Frumstig_vb_ft_kvk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_vb_ft_kvk_Fallbeyging_id,
-								self.data.frumstig.vb.ft.kvk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_vb_ft_kvk_Fallbeyging_id',
+							self.data.frumstig.vb.ft.kvk
 						)
 					if self.data.frumstig.vb.ft.hk is not None:
-						isl_lo.fk_Frumstig_vb_ft_hk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Frumstig_vb_ft_hk_Fallbeyging_id,
-								self.data.frumstig.vb.ft.hk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Frumstig_vb_ft_hk_Fallbeyging_id',
+							self.data.frumstig.vb.ft.hk
 						)
 		if self.data.miðstig is not None:
 			if self.data.miðstig.vb is not None:
 				if self.data.miðstig.vb.et is not None:
 					if self.data.miðstig.vb.et.kk is not None:
-						isl_lo.fk_Midstig_vb_et_kk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Midstig_vb_et_kk_Fallbeyging_id,
-								self.data.miðstig.vb.et.kk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Midstig_vb_et_kk_Fallbeyging_id',
+							self.data.miðstig.vb.et.kk
 						)
 					if self.data.miðstig.vb.et.kvk is not None:
-						isl_lo.fk_Midstig_vb_et_kvk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Midstig_vb_et_kvk_Fallbeyging_id,
-								self.data.miðstig.vb.et.kvk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Midstig_vb_et_kvk_Fallbeyging_id',
+							self.data.miðstig.vb.et.kvk
 						)
 					if self.data.miðstig.vb.et.hk is not None:
-						isl_lo.fk_Midstig_vb_et_hk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Midstig_vb_et_hk_Fallbeyging_id,
-								self.data.miðstig.vb.et.hk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Midstig_vb_et_hk_Fallbeyging_id',
+							self.data.miðstig.vb.et.hk
 						)
 				if self.data.miðstig.vb.ft is not None:
 					if self.data.miðstig.vb.ft.kk is not None:
-						isl_lo.fk_Midstig_vb_ft_kk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Midstig_vb_ft_kk_Fallbeyging_id,
-								self.data.miðstig.vb.ft.kk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Midstig_vb_ft_kk_Fallbeyging_id',
+							self.data.miðstig.vb.ft.kk
 						)
 					if self.data.miðstig.vb.ft.kvk is not None:
-						isl_lo.fk_Midstig_vb_ft_kvk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Midstig_vb_ft_kvk_Fallbeyging_id,
-								self.data.miðstig.vb.ft.kvk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Midstig_vb_ft_kvk_Fallbeyging_id',
+							self.data.miðstig.vb.ft.kvk
 						)
 					if self.data.miðstig.vb.ft.hk is not None:
-						isl_lo.fk_Midstig_vb_ft_hk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Midstig_vb_ft_hk_Fallbeyging_id,
-								self.data.miðstig.vb.ft.hk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Midstig_vb_ft_hk_Fallbeyging_id',
+							self.data.miðstig.vb.ft.hk
 						)
 		if self.data.efstastig is not None:
 			if self.data.efstastig.sb is not None:
 				if self.data.efstastig.sb.et is not None:
 					if self.data.efstastig.sb.et.kk is not None:
-						isl_lo.fk_Efstastig_sb_et_kk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_sb_et_kk_Fallbeyging_id,
-								self.data.efstastig.sb.et.kk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_sb_et_kk_Fallbeyging_id',
+							self.data.efstastig.sb.et.kk
 						)
 					if self.data.efstastig.sb.et.kvk is not None:
-						isl_lo.fk_Efstastig_sb_et_kvk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_sb_et_kvk_Fallbeyging_id,
-								self.data.efstastig.sb.et.kvk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_sb_et_kvk_Fallbeyging_id',
+							self.data.efstastig.sb.et.kvk
 						)
 					if self.data.efstastig.sb.et.hk is not None:
-						isl_lo.fk_Efstastig_sb_et_hk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_sb_et_hk_Fallbeyging_id,
-								self.data.efstastig.sb.et.hk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_sb_et_hk_Fallbeyging_id',
+							self.data.efstastig.sb.et.hk
 						)
 				if self.data.efstastig.sb.ft is not None:
 					if self.data.efstastig.sb.ft.kk is not None:
-						isl_lo.fk_Efstastig_sb_ft_kk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_sb_ft_kk_Fallbeyging_id,
-								self.data.efstastig.sb.ft.kk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_sb_ft_kk_Fallbeyging_id',
+							self.data.efstastig.sb.ft.kk
 						)
 					if self.data.efstastig.sb.ft.kvk is not None:
-						isl_lo.fk_Efstastig_sb_ft_kvk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_sb_ft_kvk_Fallbeyging_id,
-								self.data.efstastig.sb.ft.kvk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_sb_ft_kvk_Fallbeyging_id',
+							self.data.efstastig.sb.ft.kvk
 						)
 					if self.data.efstastig.sb.ft.hk is not None:
-						isl_lo.fk_Efstastig_sb_ft_hk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_sb_ft_hk_Fallbeyging_id,
-								self.data.efstastig.sb.ft.hk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_sb_ft_hk_Fallbeyging_id',
+							self.data.efstastig.sb.ft.hk
 						)
 			if self.data.efstastig.vb is not None:
 				if self.data.efstastig.vb.et is not None:
 					if self.data.efstastig.vb.et.kk is not None:
-						isl_lo.fk_Efstastig_vb_et_kk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_vb_et_kk_Fallbeyging_id,
-								self.data.efstastig.vb.et.kk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_vb_et_kk_Fallbeyging_id',
+							self.data.efstastig.vb.et.kk
 						)
 					if self.data.efstastig.vb.et.kvk is not None:
-						isl_lo.fk_Efstastig_vb_et_kvk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_vb_et_kvk_Fallbeyging_id,
-								self.data.efstastig.vb.et.kvk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_vb_et_kvk_Fallbeyging_id',
+							self.data.efstastig.vb.et.kvk
 						)
 					if self.data.efstastig.vb.et.hk is not None:
-						isl_lo.fk_Efstastig_vb_et_hk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_vb_et_hk_Fallbeyging_id,
-								self.data.efstastig.vb.et.hk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_vb_et_hk_Fallbeyging_id',
+							self.data.efstastig.vb.et.hk
 						)
 				if self.data.efstastig.vb.ft is not None:
 					if self.data.efstastig.vb.ft.kk is not None:
-						isl_lo.fk_Efstastig_vb_ft_kk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_vb_ft_kk_Fallbeyging_id,
-								self.data.efstastig.vb.ft.kk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_vb_ft_kk_Fallbeyging_id',
+							self.data.efstastig.vb.ft.kk
 						)
 					if self.data.efstastig.vb.ft.kvk is not None:
-						isl_lo.fk_Efstastig_vb_ft_kvk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_vb_ft_kvk_Fallbeyging_id,
-								self.data.efstastig.vb.ft.kvk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_vb_ft_kvk_Fallbeyging_id',
+							self.data.efstastig.vb.ft.kvk
 						)
 					if self.data.efstastig.vb.ft.hk is not None:
-						isl_lo.fk_Efstastig_vb_ft_hk_Fallbeyging_id, changes_made = (
-							self.write_fallbeyging_to_db(
-								isl_lo.fk_Efstastig_vb_ft_hk_Fallbeyging_id,
-								self.data.efstastig.vb.ft.hk,
-								changes_made
-							)
+						self.stage_fallbeyging(
+							isl_lo,
+							'fk_Efstastig_vb_ft_hk_Fallbeyging_id',
+							self.data.efstastig.vb.ft.hk
 						)
+		changes_made = self.write_staged_beygingar_to_db(changes_made)
 		changes_made = changes_made or db.Session.is_modified(isl_lo)
 		if db.Session.is_modified(isl_lo):
-			db.Session.commit()
+			db.commit()
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
 	def load_from_db(self, isl_ord: isl.Ord):
@@ -1870,7 +2354,8 @@ class Lysingarord(Ord):
 				)
 			self.data.datahash = self.get_data_hash()
 			return
-		isl_lo = db.Session.query(isl.Lysingarord).filter_by(fk_Ord_id=isl_ord.Ord_id).first()
+		isl_lo = self.get_ordflokkur_record(isl.Lysingarord, isl_ord)
+		self.prefetch_beygingar(isl_lo)
 		# fetch lýsingarorð beygingar
 		if (
 			isl_lo.fk_Frumstig_sb_et_kk_Fallbeyging_id is not None or
@@ -2170,7 +2655,7 @@ class Sagnord(Ord):
 		if isl_so is None:
 			isl_so = isl.Sagnord(fk_Ord_id=isl_ord.Ord_id)
 			db.Session.add(isl_so)
-			db.Session.commit()
+			db.commit()
 			changes_made = True
 		if self.data.germynd is not None:
 			isl_so.Germynd_Nafnhattur = self.data.germynd.nafnháttur
@@ -2181,20 +2666,16 @@ class Sagnord(Ord):
 				isl_so.Germynd_Bodhattur_ft = self.data.germynd.boðháttur.ft
 			if self.data.germynd.persónuleg is not None:
 				if self.data.germynd.persónuleg.framsöguháttur is not None:
-					isl_so.fk_Germynd_personuleg_framsoguhattur, changes_made = (
-						self.write_sagnbeyging_to_db(
-							isl_so.fk_Germynd_personuleg_framsoguhattur,
-							self.data.germynd.persónuleg.framsöguháttur.dict(),
-							changes_made
-						)
+					self.stage_sagnbeyging(
+						isl_so,
+						'fk_Germynd_personuleg_framsoguhattur',
+						self.data.germynd.persónuleg.framsöguháttur.dict()
 					)
 				if self.data.germynd.persónuleg.viðtengingarháttur is not None:
-					isl_so.fk_Germynd_personuleg_vidtengingarhattur, changes_made = (
-						self.write_sagnbeyging_to_db(
-							isl_so.fk_Germynd_personuleg_vidtengingarhattur,
-							self.data.germynd.persónuleg.viðtengingarháttur.dict(),
-							changes_made
-						)
+					self.stage_sagnbeyging(
+						isl_so,
+						'fk_Germynd_personuleg_vidtengingarhattur',
+						self.data.germynd.persónuleg.viðtengingarháttur.dict()
 					)
 			if self.data.germynd.ópersónuleg is not None:
 				if self.data.germynd.ópersónuleg.frumlag is not None:
@@ -2202,20 +2683,16 @@ class Sagnord(Ord):
 						isl.Fall[self.data.germynd.ópersónuleg.frumlag.name]
 					)
 				if self.data.germynd.ópersónuleg.framsöguháttur is not None:
-					isl_so.fk_Germynd_opersonuleg_framsoguhattur, changes_made = (
-						self.write_sagnbeyging_to_db(
-							isl_so.fk_Germynd_opersonuleg_framsoguhattur,
-							self.data.germynd.ópersónuleg.framsöguháttur.dict(),
-							changes_made
-						)
+					self.stage_sagnbeyging(
+						isl_so,
+						'fk_Germynd_opersonuleg_framsoguhattur',
+						self.data.germynd.ópersónuleg.framsöguháttur.dict()
 					)
 				if self.data.germynd.ópersónuleg.viðtengingarháttur is not None:
-					isl_so.fk_Germynd_opersonuleg_vidtengingarhattur, changes_made = (
-						self.write_sagnbeyging_to_db(
-							isl_so.fk_Germynd_opersonuleg_vidtengingarhattur,
-							self.data.germynd.ópersónuleg.viðtengingarháttur.dict(),
-							changes_made
-						)
+					self.stage_sagnbeyging(
+						isl_so,
+						'fk_Germynd_opersonuleg_vidtengingarhattur',
+						self.data.germynd.ópersónuleg.viðtengingarháttur.dict()
 					)
 			if self.data.germynd.spurnarmyndir is not None:
 				if self.data.germynd.spurnarmyndir.framsöguháttur is not None:
@@ -2264,20 +2741,16 @@ class Sagnord(Ord):
 				isl_so.Midmynd_Bodhattur_ft = self.data.miðmynd.boðháttur.ft
 			if self.data.miðmynd.persónuleg is not None:
 				if self.data.miðmynd.persónuleg.framsöguháttur is not None:
-					isl_so.fk_Midmynd_personuleg_framsoguhattur, changes_made = (
-						self.write_sagnbeyging_to_db(
-							isl_so.fk_Midmynd_personuleg_framsoguhattur,
-							self.data.miðmynd.persónuleg.framsöguháttur.dict(),
-							changes_made
-						)
+					self.stage_sagnbeyging(
+						isl_so,
+						'fk_Midmynd_personuleg_framsoguhattur',
+						self.data.miðmynd.persónuleg.framsöguháttur.dict()
 					)
 				if self.data.miðmynd.persónuleg.viðtengingarháttur is not None:
-					isl_so.fk_Midmynd_personuleg_vidtengingarhattur, changes_made = (
-						self.write_sagnbeyging_to_db(
-							isl_so.fk_Midmynd_personuleg_vidtengingarhattur,
-							self.data.miðmynd.persónuleg.viðtengingarháttur.dict(),
-							changes_made
-						)
+					self.stage_sagnbeyging(
+						isl_so,
+						'fk_Midmynd_personuleg_vidtengingarhattur',
+						self.data.miðmynd.persónuleg.viðtengingarháttur.dict()
 					)
 			if self.data.miðmynd.ópersónuleg is not None:
 				if self.data.miðmynd.ópersónuleg.frumlag is not None:
@@ -2285,20 +2758,16 @@ class Sagnord(Ord):
 						isl.Fall[self.data.miðmynd.ópersónuleg.frumlag.name]
 					)
 				if self.data.miðmynd.ópersónuleg.framsöguháttur is not None:
-					isl_so.fk_Midmynd_opersonuleg_framsoguhattur, changes_made = (
-						self.write_sagnbeyging_to_db(
-							isl_so.fk_Midmynd_opersonuleg_framsoguhattur,
-							self.data.miðmynd.ópersónuleg.framsöguháttur.dict(),
-							changes_made
-						)
+					self.stage_sagnbeyging(
+						isl_so,
+						'fk_Midmynd_opersonuleg_framsoguhattur',
+						self.data.miðmynd.ópersónuleg.framsöguháttur.dict()
 					)
 				if self.data.miðmynd.ópersónuleg.viðtengingarháttur is not None:
-					isl_so.fk_Midmynd_opersonuleg_vidtengingarhattur, changes_made = (
-						self.write_sagnbeyging_to_db(
-							isl_so.fk_Midmynd_opersonuleg_vidtengingarhattur,
-							self.data.miðmynd.ópersónuleg.viðtengingarháttur.dict(),
-							changes_made
-						)
+					self.stage_sagnbeyging(
+						isl_so,
+						'fk_Midmynd_opersonuleg_vidtengingarhattur',
+						self.data.miðmynd.ópersónuleg.viðtengingarháttur.dict()
 					)
 			if self.data.miðmynd.spurnarmyndir is not None:
 				if self.data.miðmynd.spurnarmyndir.framsöguháttur is not None:
@@ -2346,115 +2815,92 @@ class Sagnord(Ord):
 				if self.data.lýsingarháttur.þátíðar.sb is not None:
 					if self.data.lýsingarháttur.þátíðar.sb.et is not None:
 						if self.data.lýsingarháttur.þátíðar.sb.et.kk is not None:
-							isl_so.fk_LysingarhatturThatidar_sb_et_kk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_sb_et_kk_id,
-									self.data.lýsingarháttur.þátíðar.sb.et.kk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_sb_et_kk_id',
+								self.data.lýsingarháttur.þátíðar.sb.et.kk
 							)
 						if self.data.lýsingarháttur.þátíðar.sb.et.kvk is not None:
-							isl_so.fk_LysingarhatturThatidar_sb_et_kvk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_sb_et_kvk_id,
-									self.data.lýsingarháttur.þátíðar.sb.et.kvk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_sb_et_kvk_id',
+								self.data.lýsingarháttur.þátíðar.sb.et.kvk
 							)
 						if self.data.lýsingarháttur.þátíðar.sb.et.hk is not None:
-							isl_so.fk_LysingarhatturThatidar_sb_et_hk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_sb_et_hk_id,
-									self.data.lýsingarháttur.þátíðar.sb.et.hk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_sb_et_hk_id',
+								self.data.lýsingarháttur.þátíðar.sb.et.hk
 							)
 					if self.data.lýsingarháttur.þátíðar.sb.ft is not None:
 						if self.data.lýsingarháttur.þátíðar.sb.ft.kk is not None:
-							isl_so.fk_LysingarhatturThatidar_sb_ft_kk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_sb_ft_kk_id,
-									self.data.lýsingarháttur.þátíðar.sb.ft.kk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_sb_ft_kk_id',
+								self.data.lýsingarháttur.þátíðar.sb.ft.kk
 							)
 						if self.data.lýsingarháttur.þátíðar.sb.ft.kvk is not None:
-							isl_so.fk_LysingarhatturThatidar_sb_ft_kvk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_sb_ft_kvk_id,
-									self.data.lýsingarháttur.þátíðar.sb.ft.kvk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_sb_ft_kvk_id',
+								self.data.lýsingarháttur.þátíðar.sb.ft.kvk
 							)
 						if self.data.lýsingarháttur.þátíðar.sb.ft.hk is not None:
-							isl_so.fk_LysingarhatturThatidar_sb_ft_hk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_sb_ft_hk_id,
-									self.data.lýsingarháttur.þátíðar.sb.ft.hk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_sb_ft_hk_id',
+								self.data.lýsingarháttur.þátíðar.sb.ft.hk
 							)
 				if self.data.lýsingarháttur.þátíðar.vb is not None:
 					if self.data.lýsingarháttur.þátíðar.vb.et is not None:
 						if self.data.lýsingarháttur.þátíðar.vb.et.kk is not None:
-							isl_so.fk_LysingarhatturThatidar_vb_et_kk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_vb_et_kk_id,
-									self.data.lýsingarháttur.þátíðar.vb.et.kk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_vb_et_kk_id',
+								self.data.lýsingarháttur.þátíðar.vb.et.kk
 							)
 						if self.data.lýsingarháttur.þátíðar.vb.et.kvk is not None:
-							isl_so.fk_LysingarhatturThatidar_vb_et_kvk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_vb_et_kvk_id,
-									self.data.lýsingarháttur.þátíðar.vb.et.kvk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_vb_et_kvk_id',
+								self.data.lýsingarháttur.þátíðar.vb.et.kvk
 							)
 						if self.data.lýsingarháttur.þátíðar.vb.et.hk is not None:
-							isl_so.fk_LysingarhatturThatidar_vb_et_hk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_vb_et_hk_id,
-									self.data.lýsingarháttur.þátíðar.vb.et.hk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_vb_et_hk_id',
+								self.data.lýsingarháttur.þátíðar.vb.et.hk
 							)
 					if self.data.lýsingarháttur.þátíðar.vb.ft is not None:
 						if self.data.lýsingarháttur.þátíðar.vb.ft.kk is not None:
-							isl_so.fk_LysingarhatturThatidar_vb_ft_kk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_vb_ft_kk_id,
-									self.data.lýsingarháttur.þátíðar.vb.ft.kk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_vb_ft_kk_id',
+								self.data.lýsingarháttur.þátíðar.vb.ft.kk
 							)
 						if self.data.lýsingarháttur.þátíðar.vb.ft.kvk is not None:
-							isl_so.fk_LysingarhatturThatidar_vb_ft_kvk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_vb_ft_kvk_id,
-									self.data.lýsingarháttur.þátíðar.vb.ft.kvk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_vb_ft_kvk_id',
+								self.data.lýsingarháttur.þátíðar.vb.ft.kvk
 							)
 						if self.data.lýsingarháttur.þátíðar.vb.ft.hk is not None:
-							isl_so.fk_LysingarhatturThatidar_vb_ft_hk_id, changes_made = (
-								self.write_fallbeyging_to_db(
-									isl_so.fk_LysingarhatturThatidar_vb_ft_hk_id,
-									self.data.lýsingarháttur.þátíðar.vb.ft.hk,
-									changes_made
-								)
+							self.stage_fallbeyging(
+								isl_so,
+								'fk_LysingarhatturThatidar_vb_ft_hk_id',
+								self.data.lýsingarháttur.þátíðar.vb.ft.hk
 							)
 		if self.data.óskháttur_1p_ft is not None:
 			isl_so.Oskhattur_1p_ft = self.data.óskháttur_1p_ft
 		if self.data.óskháttur_3p is not None:
 			isl_so.Oskhattur_3p = self.data.óskháttur_3p
+		changes_made = self.write_staged_beygingar_to_db(changes_made)
 		changes_made = changes_made or db.Session.is_modified(isl_so)
 		if db.Session.is_modified(isl_so):
-			db.Session.commit()
+			db.commit()
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
 	def load_from_db(self, isl_ord: isl.Ord):
@@ -2469,7 +2915,8 @@ class Sagnord(Ord):
 				))
 			self.data.datahash = self.get_data_hash()
 			return
-		isl_so = db.Session.query(isl.Sagnord).filter_by(fk_Ord_id=isl_ord.Ord_id).first()
+		isl_so = self.get_ordflokkur_record(isl.Sagnord, isl_ord)
+		self.prefetch_beygingar(isl_so)
 		if (
 			isl_so.Germynd_Nafnhattur is not None or
 			isl_so.Germynd_Sagnbot is not None or
@@ -2947,44 +3394,21 @@ class Greinir(Ord):
 		if isl_gr is None:
 			isl_gr = isl.Greinir(fk_Ord_id=isl_ord.Ord_id)
 			db.Session.add(isl_gr)
-			db.Session.commit()
+			db.commit()
 			changes_made = True
-		isl_gr.fk_et_kk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-			isl_gr.fk_et_kk_Fallbeyging_id,
-			self.data.et.kk,
-			changes_made
-		)
-		isl_gr.fk_et_kvk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-			isl_gr.fk_et_kvk_Fallbeyging_id,
-			self.data.et.kvk,
-			changes_made
-		)
-		isl_gr.fk_et_hk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-			isl_gr.fk_et_hk_Fallbeyging_id,
-			self.data.et.hk,
-			changes_made
-		)
-		isl_gr.fk_ft_kk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-			isl_gr.fk_ft_kk_Fallbeyging_id,
-			self.data.ft.kk,
-			changes_made
-		)
-		isl_gr.fk_ft_kvk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-			isl_gr.fk_ft_kvk_Fallbeyging_id,
-			self.data.ft.kvk,
-			changes_made
-		)
-		isl_gr.fk_ft_hk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-			isl_gr.fk_ft_hk_Fallbeyging_id,
-			self.data.ft.hk,
-			changes_made
-		)
+		self.stage_fallbeyging(isl_gr, 'fk_et_kk_Fallbeyging_id', self.data.et.kk)
+		self.stage_fallbeyging(isl_gr, 'fk_et_kvk_Fallbeyging_id', self.data.et.kvk)
+		self.stage_fallbeyging(isl_gr, 'fk_et_hk_Fallbeyging_id', self.data.et.hk)
+		self.stage_fallbeyging(isl_gr, 'fk_ft_kk_Fallbeyging_id', self.data.ft.kk)
+		self.stage_fallbeyging(isl_gr, 'fk_ft_kvk_Fallbeyging_id', self.data.ft.kvk)
+		self.stage_fallbeyging(isl_gr, 'fk_ft_hk_Fallbeyging_id', self.data.ft.hk)
+		changes_made = self.write_staged_beygingar_to_db(changes_made)
 		changes_made = changes_made or db.Session.is_modified(isl_gr)
 		if db.Session.is_modified(isl_gr):
-			db.Session.commit()
+			db.commit()
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
 	def load_from_db(self, isl_ord: isl.Ord):
@@ -2992,7 +3416,8 @@ class Greinir(Ord):
 		if isl_ord.Samsett is True:
 			ord_data = self.derive_beygingar_from_samsett(ord_data)
 		else:
-			isl_gr = db.Session.query(isl.Greinir).filter_by(fk_Ord_id=isl_ord.Ord_id).first()
+			isl_gr = self.get_ordflokkur_record(isl.Greinir, isl_ord)
+			self.prefetch_beygingar(isl_gr)
 			# et
 			if (
 				isl_gr.fk_et_kk_Fallbeyging_id is not None or
@@ -3069,7 +3494,7 @@ class Fornafn(Ord):
 				Undirflokkur=isl.Fornafnaflokkar[self.data.undirflokkur.name]
 			)
 			db.Session.add(isl_fn)
-			db.Session.commit()
+			db.commit()
 			changes_made = True
 		if self.data.persóna is not None:
 			isl_fn.Persona = isl.Persona[self.data.persóna.name]
@@ -3079,79 +3504,47 @@ class Fornafn(Ord):
 			changes_made = changes_made or db.Session.is_modified(isl_fn)
 			if changes_made is True:
 				isl_ord.Edited = datetime.datetime.utcnow()
-				db.Session.commit()
+				db.commit()
 			return (isl_ord, changes_made)
 		if isinstance(self.data.et, list):
-			isl_fn.fk_et_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-				isl_fn.fk_et_Fallbeyging_id,
-				self.data.et,
-				changes_made
-			)
+			self.stage_fallbeyging(isl_fn, 'fk_et_Fallbeyging_id', self.data.et)
 		if isinstance(self.data.ft, list):
-			isl_fn.fk_ft_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-				isl_fn.fk_ft_Fallbeyging_id,
-				self.data.ft,
-				changes_made
-			)
+			self.stage_fallbeyging(isl_fn, 'fk_ft_Fallbeyging_id', self.data.ft)
 		if self.data.et is not None and not isinstance(self.data.et, list):
 			if self.data.et.kk is not None:
-				isl_fn.fk_et_kk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_fn.fk_et_kk_Fallbeyging_id,
-					self.data.et.kk,
-					changes_made
-				)
+				self.stage_fallbeyging(isl_fn, 'fk_et_kk_Fallbeyging_id', self.data.et.kk)
 			if self.data.et.kvk is not None:
-				isl_fn.fk_et_kvk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_fn.fk_et_kvk_Fallbeyging_id,
-					self.data.et.kvk,
-					changes_made
-				)
+				self.stage_fallbeyging(isl_fn, 'fk_et_kvk_Fallbeyging_id', self.data.et.kvk)
 			if self.data.et.hk is not None:
-				isl_fn.fk_et_hk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_fn.fk_et_hk_Fallbeyging_id,
-					self.data.et.hk,
-					changes_made
-				)
+				self.stage_fallbeyging(isl_fn, 'fk_et_hk_Fallbeyging_id', self.data.et.hk)
 		if self.data.ft is not None and not isinstance(self.data.ft, list):
 			if self.data.ft.kk is not None:
-				isl_fn.fk_ft_kk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_fn.fk_ft_kk_Fallbeyging_id,
-					self.data.ft.kk,
-					changes_made
-				)
+				self.stage_fallbeyging(isl_fn, 'fk_ft_kk_Fallbeyging_id', self.data.ft.kk)
 			if self.data.ft.kvk is not None:
-				isl_fn.fk_ft_kvk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_fn.fk_ft_kvk_Fallbeyging_id,
-					self.data.ft.kvk,
-					changes_made
-				)
+				self.stage_fallbeyging(isl_fn, 'fk_ft_kvk_Fallbeyging_id', self.data.ft.kvk)
 			if self.data.ft.hk is not None:
-				isl_fn.fk_ft_hk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_fn.fk_ft_hk_Fallbeyging_id,
-					self.data.ft.hk,
-					changes_made
-				)
+				self.stage_fallbeyging(isl_fn, 'fk_ft_hk_Fallbeyging_id', self.data.ft.hk)
+		changes_made = self.write_staged_beygingar_to_db(changes_made)
 		changes_made = changes_made or db.Session.is_modified(isl_fn)
 		if db.Session.is_modified(isl_fn):
-			db.Session.commit()
+			db.commit()
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
 	@classmethod
-	def get_files_list_sorted(cls):
-		kjarna_ord_files_list = []
-		samsett_ord_files_list = []
-		for ufl in structs.Fornafnaflokkar:
-			kja_list, sam_list = super().get_files_list_sorted(override_dir_rel=ufl.get_folder())
-			kjarna_ord_files_list += kja_list
-			samsett_ord_files_list += sam_list
-		return (kjarna_ord_files_list, samsett_ord_files_list)
+	def get_folders(cls):
+		return [ufl.get_folder() for ufl in structs.Fornafnaflokkar]
+
+	def load_filename_fields_from_db(self, isl_ord: isl.Ord) -> dict:
+		isl_fn = self.get_ordflokkur_record(isl.Fornafn, isl_ord)
+		return {'undirflokkur': structs.Fornafnaflokkar[isl_fn.Undirflokkur.name]}
 
 	def load_from_db(self, isl_ord: isl.Ord):
 		ord_data = super().load_from_db(isl_ord)
-		isl_fn = db.Session.query(isl.Fornafn).filter_by(fk_Ord_id=isl_ord.Ord_id).first()
+		isl_fn = self.get_ordflokkur_record(isl.Fornafn, isl_ord)
+		self.prefetch_beygingar(isl_fn)
 		ord_data['undirflokkur'] = structs.Fornafnaflokkar[isl_fn.Undirflokkur.name].value
 		if isl_fn.Persona is not None:
 			ord_data['persóna'] = structs.Persona[isl_fn.Persona.name].value
@@ -3236,6 +3629,13 @@ class Toluord(Ord):
 
 	group = structs.Ordflokkar.Toluord
 	data: Optional[structs.FjoldatalaData | structs.RadtalaData] = None
+	data_structs_by_undirflokkur = {
+		structs.Toluordaflokkar.Fjoldatala.value: structs.FjoldatalaData,
+		structs.Toluordaflokkar.Radtala.value: structs.RadtalaData,
+	}
+
+	def load_filename_fields_from_db(self, isl_ord: isl.Ord) -> dict:
+		return {'undirflokkur': structs.Toluordaflokkar[isl_ord.Ordflokkur.name]}
 
 	def make_filename(self):
 		return os.path.join(
@@ -3261,47 +3661,36 @@ class Toluord(Ord):
 		if isl_ft is None:
 			isl_ft = isl.Fjoldatala(fk_Ord_id=isl_ord.Ord_id)
 			db.Session.add(isl_ft)
-			db.Session.commit()
+			db.commit()
 			changes_made = True
 		isl_ft.Gildi = self.data.tölugildi
 		if self.data.samsett is not None:
 			changes_made = changes_made or db.Session.is_modified(isl_ft)
 			if changes_made is True:
 				isl_ord.Edited = datetime.datetime.utcnow()
-				db.Session.commit()
+				db.commit()
 			return (isl_ord, changes_made)
 		if self.data.et is not None:
 			if self.data.et.kk is not None:
-				isl_ft.fk_et_kk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_ft.fk_et_kk_Fallbeyging_id, self.data.et.kk, changes_made
-				)
+				self.stage_fallbeyging(isl_ft, 'fk_et_kk_Fallbeyging_id', self.data.et.kk)
 			if self.data.et.kvk is not None:
-				isl_ft.fk_et_kvk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_ft.fk_et_kvk_Fallbeyging_id, self.data.et.kvk, changes_made
-				)
+				self.stage_fallbeyging(isl_ft, 'fk_et_kvk_Fallbeyging_id', self.data.et.kvk)
 			if self.data.et.hk is not None:
-				isl_ft.fk_et_hk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_ft.fk_et_hk_Fallbeyging_id, self.data.et.hk, changes_made
-				)
+				self.stage_fallbeyging(isl_ft, 'fk_et_hk_Fallbeyging_id', self.data.et.hk)
 		if self.data.ft is not None:
 			if self.data.ft.kk is not None:
-				isl_ft.fk_ft_kk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_ft.fk_ft_kk_Fallbeyging_id, self.data.ft.kk, changes_made
-				)
+				self.stage_fallbeyging(isl_ft, 'fk_ft_kk_Fallbeyging_id', self.data.ft.kk)
 			if self.data.ft.kvk is not None:
-				isl_ft.fk_ft_kvk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_ft.fk_ft_kvk_Fallbeyging_id, self.data.ft.kvk, changes_made
-				)
+				self.stage_fallbeyging(isl_ft, 'fk_ft_kvk_Fallbeyging_id', self.data.ft.kvk)
 			if self.data.ft.hk is not None:
-				isl_ft.fk_ft_hk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_ft.fk_ft_hk_Fallbeyging_id, self.data.ft.hk, changes_made
-				)
+				self.stage_fallbeyging(isl_ft, 'fk_ft_hk_Fallbeyging_id', self.data.ft.hk)
+		changes_made = self.write_staged_beygingar_to_db(changes_made)
 		changes_made = changes_made or db.Session.is_modified(isl_ft)
 		if db.Session.is_modified(isl_ft):
-			db.Session.commit()
+			db.commit()
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
 	def write_radtala_to_db(self) -> tuple[isl.Ord, bool]:
@@ -3310,86 +3699,81 @@ class Toluord(Ord):
 		if isl_rt is None:
 			isl_rt = isl.Radtala(fk_Ord_id=isl_ord.Ord_id)
 			db.Session.add(isl_rt)
-			db.Session.commit()
+			db.commit()
 			changes_made = True
 		isl_rt.Gildi = self.data.tölugildi
 		if self.data.samsett is not None:
 			changes_made = changes_made or db.Session.is_modified(isl_rt)
 			if changes_made is True:
 				isl_ord.Edited = datetime.datetime.utcnow()
-				db.Session.commit()
+				db.commit()
 			return (isl_ord, changes_made)
 		if self.data.sb is not None:
 			if self.data.sb.et is not None:
 				if self.data.sb.et.kk is not None:
-					isl_rt.fk_sb_et_kk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_sb_et_kk_Fallbeyging_id, self.data.sb.et.kk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_sb_et_kk_Fallbeyging_id', self.data.sb.et.kk
 					)
 				if self.data.sb.et.kvk is not None:
-					isl_rt.fk_sb_et_kvk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_sb_et_kvk_Fallbeyging_id, self.data.sb.et.kvk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_sb_et_kvk_Fallbeyging_id', self.data.sb.et.kvk
 					)
 				if self.data.sb.et.hk is not None:
-					isl_rt.fk_sb_et_hk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_sb_et_hk_Fallbeyging_id, self.data.sb.et.hk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_sb_et_hk_Fallbeyging_id', self.data.sb.et.hk
 					)
 			if self.data.sb.ft is not None:
 				if self.data.sb.ft.kk is not None:
-					isl_rt.fk_sb_ft_kk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_sb_ft_kk_Fallbeyging_id, self.data.sb.ft.kk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_sb_ft_kk_Fallbeyging_id', self.data.sb.ft.kk
 					)
 				if self.data.sb.ft.kvk is not None:
-					isl_rt.fk_sb_ft_kvk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_sb_ft_kvk_Fallbeyging_id, self.data.sb.ft.kvk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_sb_ft_kvk_Fallbeyging_id', self.data.sb.ft.kvk
 					)
 				if self.data.sb.ft.hk is not None:
-					isl_rt.fk_sb_ft_hk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_sb_ft_hk_Fallbeyging_id, self.data.sb.ft.hk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_sb_ft_hk_Fallbeyging_id', self.data.sb.ft.hk
 					)
 		if self.data.vb is not None:
 			if self.data.vb.et is not None:
 				if self.data.vb.et.kk is not None:
-					isl_rt.fk_vb_et_kk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_vb_et_kk_Fallbeyging_id, self.data.vb.et.kk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_vb_et_kk_Fallbeyging_id', self.data.vb.et.kk
 					)
 				if self.data.vb.et.kvk is not None:
-					isl_rt.fk_vb_et_kvk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_vb_et_kvk_Fallbeyging_id, self.data.vb.et.kvk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_vb_et_kvk_Fallbeyging_id', self.data.vb.et.kvk
 					)
 				if self.data.vb.et.hk is not None:
-					isl_rt.fk_vb_et_hk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_vb_et_hk_Fallbeyging_id, self.data.vb.et.hk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_vb_et_hk_Fallbeyging_id', self.data.vb.et.hk
 					)
 			if self.data.vb.ft is not None:
 				if self.data.vb.ft.kk is not None:
-					isl_rt.fk_vb_ft_kk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_vb_ft_kk_Fallbeyging_id, self.data.vb.ft.kk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_vb_ft_kk_Fallbeyging_id', self.data.vb.ft.kk
 					)
 				if self.data.vb.ft.kvk is not None:
-					isl_rt.fk_vb_ft_kvk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_vb_ft_kvk_Fallbeyging_id, self.data.vb.ft.kvk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_vb_ft_kvk_Fallbeyging_id', self.data.vb.ft.kvk
 					)
 				if self.data.vb.ft.hk is not None:
-					isl_rt.fk_vb_ft_hk_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-						isl_rt.fk_vb_ft_hk_Fallbeyging_id, self.data.vb.ft.hk, changes_made
+					self.stage_fallbeyging(
+						isl_rt, 'fk_vb_ft_hk_Fallbeyging_id', self.data.vb.ft.hk
 					)
+		changes_made = self.write_staged_beygingar_to_db(changes_made)
 		changes_made = changes_made or db.Session.is_modified(isl_rt)
 		if db.Session.is_modified(isl_rt):
-			db.Session.commit()
+			db.commit()
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
 	@classmethod
-	def get_files_list_sorted(cls):
-		kjarna_ord_files_list = []
-		samsett_ord_files_list = []
-		for ufl in structs.Toluordaflokkar:
-			kja_list, sam_list = super().get_files_list_sorted(override_dir_rel=ufl.get_folder())
-			kjarna_ord_files_list += kja_list
-			samsett_ord_files_list += sam_list
-		return (kjarna_ord_files_list, samsett_ord_files_list)
+	def get_folders(cls):
+		return [ufl.get_folder() for ufl in structs.Toluordaflokkar]
 
 	def load_from_db(self, isl_ord: isl.Ord):
 		match isl_ord.Ordflokkur:
@@ -3410,7 +3794,8 @@ class Toluord(Ord):
 
 	def load_fjoldatala_from_db(self, isl_ord: isl.Ord):
 		ord_data = super().load_from_db(isl_ord)
-		isl_ft = db.Session.query(isl.Fjoldatala).filter_by(fk_Ord_id=isl_ord.Ord_id).first()
+		isl_ft = self.get_ordflokkur_record(isl.Fjoldatala, isl_ord)
+		self.prefetch_beygingar(isl_ft)
 		if isl_ft.Gildi is not None:
 			ord_data['tölugildi'] = isl_ft.Gildi
 		if isl_ord.Samsett is True:
@@ -3453,7 +3838,8 @@ class Toluord(Ord):
 
 	def load_radtala_from_db(self, isl_ord: isl.Ord):
 		ord_data = super().load_from_db(isl_ord)
-		isl_rt = db.Session.query(isl.Radtala).filter_by(fk_Ord_id=isl_ord.Ord_id).first()
+		isl_rt = self.get_ordflokkur_record(isl.Radtala, isl_ord)
+		self.prefetch_beygingar(isl_rt)
 		if isl_rt.Gildi is not None:
 			ord_data['tölugildi'] = isl_rt.Gildi
 		if isl_ord.Samsett is True:
@@ -3566,6 +3952,16 @@ class Smaord(Ord):
 		structs.ForsetningData | structs.AtviksordData | structs.NafnhattarmerkiData |
 		structs.SamtengingData | structs.UpphropunData
 	] = None
+	data_structs_by_undirflokkur = {
+		structs.Smaordaflokkar.Forsetning.value: structs.ForsetningData,
+		structs.Smaordaflokkar.Atviksord.value: structs.AtviksordData,
+		structs.Smaordaflokkar.Nafnhattarmerki.value: structs.NafnhattarmerkiData,
+		structs.Smaordaflokkar.Samtenging.value: structs.SamtengingData,
+		structs.Smaordaflokkar.Upphropun.value: structs.UpphropunData,
+	}
+
+	def load_filename_fields_from_db(self, isl_ord: isl.Ord) -> dict:
+		return {'undirflokkur': structs.Smaordaflokkar[isl_ord.Ordflokkur.name]}
 
 	def make_filename(self):
 		return os.path.join(
@@ -3597,7 +3993,7 @@ class Smaord(Ord):
 		if isl_fs is None:
 			isl_fs = isl.Forsetning(fk_Ord_id=isl_ord.Ord_id)
 			db.Session.add(isl_fs)
-			db.Session.commit()
+			db.commit()
 			changes_made = True
 		if self.data.stýrir is not None:
 			isl_fs.StyrirTholfalli = structs.Fall2.Tholfall in self.data.stýrir
@@ -3609,10 +4005,10 @@ class Smaord(Ord):
 			isl_fs.StyrirEignarfalli = False
 		changes_made = changes_made or db.Session.is_modified(isl_fs)
 		if db.Session.is_modified(isl_fs):
-			db.Session.commit()
+			db.commit()
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
 	def write_atviksord_to_db(self) -> tuple[isl.Ord, bool]:
@@ -3623,16 +4019,16 @@ class Smaord(Ord):
 		if isl_ao is None:
 			isl_ao = isl.Atviksord(fk_Ord_id=isl_ord.Ord_id)
 			db.Session.add(isl_ao)
-			db.Session.commit()
+			db.commit()
 			changes_made = True
 		isl_ao.Midstig = self.data.miðstig
 		isl_ao.Efstastig = self.data.efstastig
 		changes_made = changes_made or db.Session.is_modified(isl_ao)
 		if db.Session.is_modified(isl_ao):
-			db.Session.commit()
+			db.commit()
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
 	def write_nafnhattarmerki_to_db(self) -> tuple[isl.Ord, bool]:
@@ -3664,27 +4060,21 @@ class Smaord(Ord):
 							Typa=fleiryrt_typa
 						)
 						db.Session.add(isl_st_fy)
-						db.Session.commit()
+						db.commit()
 						changes_made = True
 					first_word = False
 					last_samtenging_fleiryrt_id = isl_st_fy.SamtengingFleiryrt_id
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
 	def write_upphropun_to_db(self) -> tuple[isl.Ord, bool]:
 		return super().write_to_db()
 
 	@classmethod
-	def get_files_list_sorted(cls):
-		kjarna_ord_files_list = []
-		samsett_ord_files_list = []
-		for ufl in structs.Smaordaflokkar:
-			kja_list, sam_list = super().get_files_list_sorted(override_dir_rel=ufl.get_folder())
-			kjarna_ord_files_list += kja_list
-			samsett_ord_files_list += sam_list
-		return (kjarna_ord_files_list, samsett_ord_files_list)
+	def get_folders(cls):
+		return [ufl.get_folder() for ufl in structs.Smaordaflokkar]
 
 	def load_from_db(self, isl_ord: isl.Ord):
 		match isl_ord.Ordflokkur:
@@ -3711,7 +4101,7 @@ class Smaord(Ord):
 
 	def load_forsetning_from_db(self, isl_ord: isl.Ord):
 		ord_data = super().load_from_db(isl_ord)
-		isl_fs = db.Session.query(isl.Forsetning).filter_by(fk_Ord_id=isl_ord.Ord_id).first()
+		isl_fs = self.get_ordflokkur_record(isl.Forsetning, isl_ord)
 		if (
 			isl_fs.StyrirTholfalli is True or
 			isl_fs.StyrirThagufalli is True or
@@ -3731,7 +4121,7 @@ class Smaord(Ord):
 		if isl_ord.Samsett is True:
 			ord_data = self.derive_beygingar_from_samsett(ord_data)
 		else:
-			isl_ao = db.Session.query(isl.Atviksord).filter_by(fk_Ord_id=isl_ord.Ord_id).first()
+			isl_ao = self.get_ordflokkur_record(isl.Atviksord, isl_ord)
 			if isl_ao.Midstig is not None:
 				ord_data['miðstig'] = isl_ao.Midstig
 			if isl_ao.Efstastig is not None:
@@ -3744,34 +4134,25 @@ class Smaord(Ord):
 
 	def load_samtenging_from_db(self, isl_ord: isl.Ord):
 		ord_data = super().load_from_db(isl_ord)
-		isl_samtenging_fleiryrt_query = db.Session.query(isl.SamtengingFleiryrt).filter_by(
-			fk_Ord_id=isl_ord.Ord_id
-		).order_by(isl.SamtengingFleiryrt.Ord, isl.SamtengingFleiryrt.SamtengingFleiryrt_id)
-		isl_samtenging_fleiryrt_list = isl_samtenging_fleiryrt_query.all()
-		if len(isl_samtenging_fleiryrt_list) > 0:
+		if Prefetched_Fleiryrt is not None and isl_ord.Ord_id in Prefetched_Fleiryrt:
+			fleiryrt_rows = Prefetched_Fleiryrt[isl_ord.Ord_id]
+		else:
+			fleiryrt_rows = db.Session.execute(get_samtenging_fleiryrt_query(
+				isl.SamtengingFleiryrt.fk_Ord_id == isl_ord.Ord_id
+			)).all()
+		if len(fleiryrt_rows) > 0:
 			ord_data['fleiryrt'] = []
-			for isl_samtenging_fleiryrt in isl_samtenging_fleiryrt_list:
-				fleiryrt_option = {
-					'týpa': structs.FleiryrtTypa[isl_samtenging_fleiryrt.Typa.name],
-					'fylgiorð': [isl_samtenging_fleiryrt.Ord],
-				}
-				possible_more_words = True
-				current_isl_samtenging_fleiryrt_id = isl_samtenging_fleiryrt.SamtengingFleiryrt_id
-				while possible_more_words is True:
-					isl_next_samtenging_fleiryrt_query = db.Session.query(
-						isl.SamtengingFleiryrt
-					).filter_by(fk_SamtengingFleiryrt_id=current_isl_samtenging_fleiryrt_id)
-					if len(isl_next_samtenging_fleiryrt_query.all()) not in (0, 1):
-						raise ValueError('Should be just one or zero.')
-					isl_next_samtenging_fleiryrt = isl_next_samtenging_fleiryrt_query.first()
-					if isl_next_samtenging_fleiryrt is not None:
-						fleiryrt_option['fylgiorð'].append(isl_next_samtenging_fleiryrt.Ord)
-						current_isl_samtenging_fleiryrt_id = (
-							isl_next_samtenging_fleiryrt.SamtengingFleiryrt_id
-						)
-					else:
-						possible_more_words = False
-				ord_data['fleiryrt'].append(fleiryrt_option)
+			last_first_id, last_depth = None, None
+			for _, first_id, depth, typa, fylgiord in fleiryrt_rows:
+				if first_id != last_first_id:
+					ord_data['fleiryrt'].append({
+						'týpa': structs.FleiryrtTypa[typa.name],
+						'fylgiorð': [],
+					})
+				elif depth == last_depth:
+					raise ValueError('Should be just one or zero.')
+				ord_data['fleiryrt'][-1]['fylgiorð'].append(fylgiord)
+				last_first_id, last_depth = first_id, depth
 		self.data = structs.SamtengingData(**ord_data)
 
 	def load_upphropun_from_db(self, isl_ord: isl.Ord):
@@ -3844,7 +4225,7 @@ class Sernafn(Ord):
 		if isl_sn is None:
 			isl_sn = isl.Sernafn(fk_Ord_id=isl_ord.Ord_id)
 			db.Session.add(isl_sn)
-			db.Session.commit()
+			db.commit()
 			changes_made = True
 		isl_sn.Undirflokkur = isl.Sernafnaflokkar[self.data.undirflokkur.name]
 		if self.data.kyn is not None:
@@ -3853,39 +4234,30 @@ class Sernafn(Ord):
 			changes_made = changes_made or db.Session.is_modified(isl_sn)
 			if changes_made is True:
 				isl_ord.Edited = datetime.datetime.utcnow()
-				db.Session.commit()
+				db.commit()
 			return (isl_ord, changes_made)
 		if self.data.et is not None:
 			if self.data.et.ág is not None:
-				isl_sn.fk_et_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_sn.fk_et_Fallbeyging_id, self.data.et.ág, changes_made
-				)
+				self.stage_fallbeyging(isl_sn, 'fk_et_Fallbeyging_id', self.data.et.ág)
 			if self.data.et.mg is not None:
-				isl_sn.fk_et_mgr_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_sn.fk_et_mgr_Fallbeyging_id, self.data.et.mg, changes_made
-				)
+				self.stage_fallbeyging(isl_sn, 'fk_et_mgr_Fallbeyging_id', self.data.et.mg)
 		if self.data.ft is not None:
 			if self.data.ft.ág is not None:
-				isl_sn.fk_ft_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_sn.fk_ft_Fallbeyging_id, self.data.ft.ág, changes_made
-				)
+				self.stage_fallbeyging(isl_sn, 'fk_ft_Fallbeyging_id', self.data.ft.ág)
 			if self.data.ft.mg is not None:
-				isl_sn.fk_ft_mgr_Fallbeyging_id, changes_made = self.write_fallbeyging_to_db(
-					isl_sn.fk_ft_mgr_Fallbeyging_id, self.data.ft.mg, changes_made
-				)
+				self.stage_fallbeyging(isl_sn, 'fk_ft_mgr_Fallbeyging_id', self.data.ft.mg)
+		changes_made = self.write_staged_beygingar_to_db(changes_made)
 		changes_made = changes_made or db.Session.is_modified(isl_sn)
 		if db.Session.is_modified(isl_sn):
-			db.Session.commit()
+			db.commit()
 		if changes_made is True:
 			isl_ord.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_ord, changes_made)
 
 	@classmethod
-	def get_files_list_sorted(cls):
-		kjarna_ord_files_list = []
-		samsett_ord_files_list = []
-		ufl_folders = [  # list folders instead of structs.Sernafnaflokkar get_folder shenanigans
+	def get_folders(cls):
+		return [  # list folders instead of structs.Sernafnaflokkar get_folder shenanigans
 			os.path.join('sernofn', 'mannanofn', 'islensk-karlmannsnofn', 'eigin'),
 			os.path.join('sernofn', 'mannanofn', 'islensk-karlmannsnofn', 'kenni'),
 			os.path.join('sernofn', 'mannanofn', 'islensk-kvenmannsnofn', 'eigin'),
@@ -3898,15 +4270,18 @@ class Sernafn(Ord):
 			os.path.join('sernofn', 'gaelunofn', 'hk'),
 			os.path.join('sernofn', 'ornefni'),
 		]
-		for ufl_folder in ufl_folders:
-			kja_list, sam_list = super().get_files_list_sorted(override_dir_rel=ufl_folder)
-			kjarna_ord_files_list += kja_list
-			samsett_ord_files_list += sam_list
-		return (kjarna_ord_files_list, samsett_ord_files_list)
+
+	def load_filename_fields_from_db(self, isl_ord: isl.Ord) -> dict:
+		isl_sn = self.get_ordflokkur_record(isl.Sernafn, isl_ord)
+		fields = {'undirflokkur': structs.Sernafnaflokkar[isl_sn.Undirflokkur.name]}
+		if isl_sn.Kyn is not None:
+			fields['kyn'] = structs.Kyn[isl_sn.Kyn.name]
+		return fields
 
 	def load_from_db(self, isl_ord: isl.Ord):
 		ord_data = super().load_from_db(isl_ord)
-		isl_sn = db.Session.query(isl.Sernafn).filter_by(fk_Ord_id=isl_ord.Ord_id).first()
+		isl_sn = self.get_ordflokkur_record(isl.Sernafn, isl_ord)
+		self.prefetch_beygingar(isl_sn)
 		ord_data['undirflokkur'] = structs.Sernafnaflokkar[isl_sn.Undirflokkur.name].value
 		if isl_sn.Kyn is not None:  # miłlinöfn are genderless
 			ord_data['kyn'] = structs.Kyn[isl_sn.Kyn.name].value
@@ -3949,6 +4324,7 @@ class Skammstofun(Ord):
 	Skammstöfun handler
 	"""
 	data: Optional[structs.SkammstofunData] = None
+	db_model = isl.Skammstofun
 
 	def make_filename(self):
 		return os.path.join(
@@ -3971,12 +4347,11 @@ class Skammstofun(Ord):
 				continue
 			if not json_file.name.endswith('.json'):
 				continue
+			json_file_rel = os.path.join(files_directory_rel, json_file.name)
 			try:
-				with json_file.open(mode='r', encoding='utf-8') as fi:
-					json.loads(fi.read())
+				cls.load_json_fields(json_file_rel)
 			except json.decoder.JSONDecodeError:
 				raise ValueError(f'File "{json_file.name}" has invalid JSON format.')
-			json_file_rel = os.path.join(files_directory_rel, json_file.name)
 			files_list.append(json_file_rel)
 		files_list.sort()
 		return files_list
@@ -3993,11 +4368,11 @@ class Skammstofun(Ord):
 				Kennistrengur=self.data.kennistrengur
 			)
 			db.Session.add(isl_sk)
-			db.Session.commit()
+			db.commit()
 			changes_made = True
 		if isl_sk.Kennistrengur != self.data.kennistrengur:
 			isl_sk.Kennistrengur = self.data.kennistrengur
-			db.Session.commit()
+			db.commit()
 			changes_made = True
 		isl_sk_frasar = db.Session.query(isl.SkammstofunFrasi).filter_by(
 			fk_Skammstofun_id=isl_sk.Skammstofun_id
@@ -4009,25 +4384,25 @@ class Skammstofun(Ord):
 				kennistrengur = self.data.frasi[i]
 				if kennistrengur is None:
 					raise ValueError('missing kennistrengur')
-				isl_ord = db.Session.query(isl.Ord).filter_by(Kennistrengur=kennistrengur).first()
-				if isl_ord is None:
+				ord_id = get_ord_id(kennistrengur)
+				if ord_id is None:
 					raise ValueError(f'no orð with kennistrengur "{kennistrengur}"?')
 				if i < db_frasi_count:
-					if isl_sk_frasar[i].fk_Ord_id != isl_ord.Ord_id:
-						isl_sk_frasar[i].fk_Ord_id = isl_ord.Ord_id
-						db.Session.commit()
+					if isl_sk_frasar[i].fk_Ord_id != ord_id:
+						isl_sk_frasar[i].fk_Ord_id = ord_id
+						db.commit()
 						changes_made = True
 				else:
 					isl_sk_frasi = isl.SkammstofunFrasi(
 						fk_Skammstofun_id=isl_sk.Skammstofun_id,
-						fk_Ord_id=isl_ord.Ord_id
+						fk_Ord_id=ord_id
 					)
 					db.Session.add(isl_sk_frasi)
-					db.Session.commit()
+					db.commit()
 					changes_made = True
 			else:
 				db.Session.delete(isl_sk_frasar[i])
-				db.Session.commit()
+				db.commit()
 				changes_made = True
 		isl_sk_myndir = db.Session.query(isl.SkammstofunMynd).filter_by(
 			fk_Skammstofun_id=isl_sk.Skammstofun_id
@@ -4039,7 +4414,7 @@ class Skammstofun(Ord):
 				if j < db_myndir_count:
 					if isl_sk_myndir[j].Mynd != self.data.myndir[j]:
 						isl_sk_myndir[j].Mynd = self.data.myndir[j]
-						db.Session.commit()
+						db.commit()
 						changes_made = True
 				else:
 					isl_sk_mynd = isl.SkammstofunMynd(
@@ -4047,15 +4422,15 @@ class Skammstofun(Ord):
 						Mynd=self.data.myndir[j]
 					)
 					db.Session.add(isl_sk_mynd)
-					db.Session.commit()
+					db.commit()
 					changes_made = True
 			else:
 				db.Session.delete(isl_sk_myndir[j])
-				db.Session.commit()
+				db.commit()
 				changes_made = True
 		if changes_made is True:
 			isl_sk.Edited = datetime.datetime.utcnow()
-			db.Session.commit()
+			db.commit()
 		return (isl_sk, changes_made)
 
 	def load_from_db(self, isl_sk: isl.Skammstofun):
@@ -4093,6 +4468,260 @@ class Skammstofun(Ord):
 		self.data.datahash = self.get_data_hash()
 
 
+@contextmanager
+def kennistrengur_resolver():
+	"""
+	Usage:  with kennistrengur_resolver():
+				...
+	Before: Database connection has been initialized.
+	After:  Inside the context get_ord_id resolves kennistrengur to Ord_id from an in-memory map,
+			preloaded with one query and kept updated as orð are written or deleted. Hit and miss
+			counts are logged when leaving the context. Nested use shares the outermost resolver.
+	"""
+	global Ord_id_Resolver, Ord_id_Resolver_Hits, Ord_id_Resolver_Misses
+	if Ord_id_Resolver is not None:
+		yield
+		return
+	Ord_id_Resolver = dict(db.Session.query(isl.Ord.Kennistrengur, isl.Ord.Ord_id))
+	Ord_id_Resolver_Hits = 0
+	Ord_id_Resolver_Misses = 0
+	logman.debug('Kennistrengur resolver preloaded with %s orð.' % (len(Ord_id_Resolver), ))
+	try:
+		yield
+	finally:
+		logman.info('Kennistrengur resolver: %s hits, %s misses.' % (
+			Ord_id_Resolver_Hits, Ord_id_Resolver_Misses
+		))
+		Ord_id_Resolver = None
+
+
+def _get_undirflokkur(data: dict | structs.OrdData) -> str | None:
+	"""
+	pydantic discriminator for Ord.get_data_adapter, @data is parsed JSON or a struct
+	"""
+	if isinstance(data, dict):
+		return data.get('undirflokkur')
+	if data.undirflokkur is None:
+		return None
+	return data.undirflokkur.value
+
+
+@contextmanager
+def datafile_cache(documents_size: int = 32768):
+	"""
+	Usage:  with datafile_cache(documents_size):
+				...
+	Before: @documents_size is the maximum amount of parsed datafiles kept in memory, 0 to only
+			keep the fields in Datafile_Fields_Keys.
+	After:  Inside the context datafiles are parsed once and shared between import phases, see
+			Ord.load_json and Ord.load_json_fields, also by import pipeline stages in their own
+			threads, see Datafile_Cache_Lock. Parse counts are logged when leaving the context.
+			Nested use shares the outermost cache.
+	"""
+	global Datafile_Fields, Datafile_Documents, Datafile_Documents_Size
+	global Datafile_Cache_Parsed, Datafile_Cache_Reused
+	if documents_size < 0:
+		raise ValueError('Datafile cache size should be zero or positive.')
+	if Datafile_Fields is not None:
+		yield
+		return
+	Datafile_Fields = {}
+	Datafile_Documents = collections.OrderedDict()
+	Datafile_Documents_Size = documents_size
+	Datafile_Cache_Parsed = 0
+	Datafile_Cache_Reused = 0
+	try:
+		yield
+	finally:
+		logman.info('Datafile cache: %s datafiles parsed, %s reused.' % (
+			Datafile_Cache_Parsed, Datafile_Cache_Reused
+		))
+		Datafile_Fields = None
+		Datafile_Documents = None
+		Datafile_Documents_Size = 0
+
+
+@contextmanager
+def prefetched_ord_range(ord_id_range: tuple[int, int]):
+	"""
+	Usage:  with prefetched_ord_range(ord_id_range):
+				...
+	Before: @ord_id_range is a tuple of first and last Ord_id (inclusive).
+	After:  Inside the context orð in @ord_id_range are loaded from database without queries of
+			their own, their orðflokkur records, Fallbeyging and Sagnbeyging rows and orðhlutar
+			having been fetched up front, with one query per table (per Prefetch_Chunksize rows)
+			and one for the orðhlutar of all samsett orð in the range.
+	"""
+	global Prefetched_Records, Prefetched_Beygingar, Prefetched_Ordhlutar, Prefetched_Fleiryrt
+	Prefetched_Records = {}
+	Prefetched_Beygingar = {}
+	Prefetched_Ordhlutar = {}
+	Prefetched_Fleiryrt = {}
+	try:
+		isl_records = []
+		for model in Ordflokkur_Models:
+			for isl_record in db.Session.query(model).filter(
+				model.fk_Ord_id >= ord_id_range[0], model.fk_Ord_id <= ord_id_range[1]
+			):
+				Prefetched_Records[(model, isl_record.fk_Ord_id)] = isl_record
+				isl_records.append(isl_record)
+		Ord().prefetch_beygingar(*isl_records)
+		void_ord_ids = set()
+		for ord_id, _, isl_ord_oh, isl_ord_oh_ord in db.Session.execute(
+			get_samsett_ordhlutar_query(
+				isl.SamsettOrd.fk_Ord_id >= ord_id_range[0],
+				isl.SamsettOrd.fk_Ord_id <= ord_id_range[1]
+			)
+		):
+			if isl_ord_oh is None:
+				void_ord_ids.add(ord_id)  # left for load_samsett_ordhlutar_from_db to report
+			Prefetched_Ordhlutar.setdefault(ord_id, []).append((isl_ord_oh, isl_ord_oh_ord))
+		for ord_id in void_ord_ids:
+			del Prefetched_Ordhlutar[ord_id]
+		for fleiryrt_row in db.Session.execute(get_samtenging_fleiryrt_query(
+			isl.SamtengingFleiryrt.fk_Ord_id >= ord_id_range[0],
+			isl.SamtengingFleiryrt.fk_Ord_id <= ord_id_range[1]
+		)):
+			Prefetched_Fleiryrt.setdefault(fleiryrt_row[0], []).append(fleiryrt_row)
+		yield
+	finally:
+		Prefetched_Records = None
+		Prefetched_Beygingar = None
+		Prefetched_Ordhlutar = None
+		Prefetched_Fleiryrt = None
+
+
+def get_samsett_ordhlutar_query(*criteria) -> sqlalchemy.Select:
+	"""
+	query for (Ord_id, orðhluti id, isl.SamsettOrdhluti, isl.Ord) of the orðhlutar of samsett orð
+	whose isl.SamsettOrd matches @criteria, in order for each orð, with the orð of each orðhluti,
+	following the orðhluti chains with a recursive CTE, isl.SamsettOrdhluti is None for a void
+	orðhluti id
+	"""
+	chain = sqlalchemy.select(
+		isl.SamsettOrd.fk_Ord_id.label('ord_id'),
+		isl.SamsettOrd.fk_FyrstiOrdHluti_id.label('ordhluti_id'),
+		sqlalchemy.literal(0).label('depth')
+	).where(
+		isl.SamsettOrd.fk_FyrstiOrdHluti_id.is_not(None), *criteria
+	).cte('ordhluti_chain', recursive=True)
+	chain = chain.union_all(
+		sqlalchemy.select(
+			chain.c.ord_id, isl.SamsettOrdhluti.fk_NaestiOrdhluti_id, chain.c.depth + 1
+		).join(
+			chain, isl.SamsettOrdhluti.SamsettOrdhluti_id == chain.c.ordhluti_id
+		).where(isl.SamsettOrdhluti.fk_NaestiOrdhluti_id.is_not(None))
+	)
+	return sqlalchemy.select(
+		chain.c.ord_id, chain.c.ordhluti_id, isl.SamsettOrdhluti, isl.Ord
+	).select_from(chain).outerjoin(
+		isl.SamsettOrdhluti, isl.SamsettOrdhluti.SamsettOrdhluti_id == chain.c.ordhluti_id
+	).outerjoin(
+		isl.Ord, isl.Ord.Ord_id == isl.SamsettOrdhluti.fk_Ord_id
+	).order_by(chain.c.ord_id, chain.c.depth)
+
+
+def get_samtenging_fleiryrt_query(*criteria) -> sqlalchemy.Select:
+	"""
+	query for (Ord_id, first id, depth, Typa, Ord) of every word of the fleiryrt options of
+	samtengingar, starting from the isl.SamtengingFleiryrt rows matching @criteria (having Ord_id
+	and Typa) and following the rows pointing back to them with a recursive CTE, ordered by the
+	first word of each option and then by depth, each word pointing back to the one before it
+	"""
+	chain = sqlalchemy.select(
+		isl.SamtengingFleiryrt.fk_Ord_id.label('ord_id'),
+		isl.SamtengingFleiryrt.SamtengingFleiryrt_id.label('first_id'),
+		isl.SamtengingFleiryrt.SamtengingFleiryrt_id.label('fleiryrt_id'),
+		isl.SamtengingFleiryrt.Ord.label('first_ord'),
+		isl.SamtengingFleiryrt.Typa.label('typa'),
+		isl.SamtengingFleiryrt.Ord.label('ord'),
+		sqlalchemy.literal(0).label('depth')
+	).where(*criteria).cte('fleiryrt_chain', recursive=True)
+	chain = chain.union_all(
+		sqlalchemy.select(
+			chain.c.ord_id, chain.c.first_id, isl.SamtengingFleiryrt.SamtengingFleiryrt_id,
+			chain.c.first_ord, chain.c.typa, isl.SamtengingFleiryrt.Ord, chain.c.depth + 1
+		).join(
+			chain, isl.SamtengingFleiryrt.fk_SamtengingFleiryrt_id == chain.c.fleiryrt_id
+		)
+	)
+	return sqlalchemy.select(
+		chain.c.ord_id, chain.c.first_id, chain.c.depth, chain.c.typa, chain.c.ord
+	).order_by(chain.c.ord_id, chain.c.first_ord, chain.c.first_id, chain.c.depth)
+
+
+def forget_datafile_document(filename: str):
+	"""
+	drop parsed document of datafile, path relative to "lokaord/database/data" or absolute, from
+	datafile_cache while keeping its fields, for datafiles loaded elsewhere (in worker processes)
+	"""
+	global Datafile_Documents
+	with Datafile_Cache_Lock:
+		if Datafile_Documents is not None:
+			Datafile_Documents.pop(os.path.join(Ord.datafiles_dir, filename), None)
+
+
+def get_ord_id(kennistrengur: str) -> int | None:
+	"""
+	Usage:  ord_id = get_ord_id(kennistrengur)
+	Before: @kennistrengur is a kennistrengur string.
+	After:  @ord_id is Ord_id of orð with @kennistrengur, or None if there is no such orð in
+			database. Resolved from memory without querying when kennistrengur_resolver is active.
+	"""
+	global Ord_id_Resolver, Ord_id_Resolver_Hits, Ord_id_Resolver_Misses
+	if Ord_id_Resolver is None:
+		return db.Session.query(isl.Ord.Ord_id).filter_by(Kennistrengur=kennistrengur).scalar()
+	# resolver holds every orð in database, so a miss means there is no such orð
+	if kennistrengur in Ord_id_Resolver:
+		Ord_id_Resolver_Hits += 1
+		return Ord_id_Resolver[kennistrengur]
+	Ord_id_Resolver_Misses += 1
+	return None
+
+
+def set_ord_id(kennistrengur: str, ord_id: int):
+	global Ord_id_Resolver
+	if Ord_id_Resolver is not None:
+		Ord_id_Resolver[kennistrengur] = ord_id
+
+
+def forget_ord_id(kennistrengur: str):
+	global Ord_id_Resolver
+	if Ord_id_Resolver is not None:
+		Ord_id_Resolver.pop(kennistrengur, None)
+
+
+def invalidate_ordhluti_beygingar(kennistrengur: str):
+	"""
+	drop cached orðhluti beygingar derived from orð with given kennistrengur, directly or through
+	samsett orð combined from it
+	"""
+	global Ordhluti_Beygingar_Cache_Keys
+	for cache_key in list(Ordhluti_Beygingar_Cache_Keys.get(kennistrengur, ())):
+		_drop_ordhluti_beygingar(cache_key)
+
+
+def _drop_ordhluti_beygingar(cache_key: str):
+	global Ordhluti_Beygingar_Cache, Ordhluti_Beygingar_Cache_Keys
+	kennistrengir, _ = Ordhluti_Beygingar_Cache.pop(cache_key)
+	for kennistrengur in kennistrengir:
+		cache_keys = Ordhluti_Beygingar_Cache_Keys[kennistrengur]
+		cache_keys.discard(cache_key)
+		if len(cache_keys) == 0:
+			del Ordhluti_Beygingar_Cache_Keys[kennistrengur]
+
+
+def get_ordhluti_beygingar_cache_stats() -> dict:
+	global Ordhluti_Beygingar_Cache, Ordhluti_Beygingar_Cache_Hits, Ordhluti_Beygingar_Cache_Misses
+	lookups = Ordhluti_Beygingar_Cache_Hits + Ordhluti_Beygingar_Cache_Misses
+	return {
+		'hits': Ordhluti_Beygingar_Cache_Hits,
+		'misses': Ordhluti_Beygingar_Cache_Misses,
+		'hit_rate': (Ordhluti_Beygingar_Cache_Hits / lookups) if lookups > 0 else 0.0,
+		'size': len(Ordhluti_Beygingar_Cache),
+	}
+
+
 def get_ord_by_kennistrengur(kennistrengur: str) -> isl.Ord:
 	return db.Session.query(isl.Ord).filter_by(Kennistrengur=kennistrengur).first()
 
@@ -4151,6 +4780,52 @@ def get_dependents_of_ord(isl_ord: isl.Ord) -> list[str]:
 	return dependents
 
 
+def get_samsett_dependents(kennistrengir: set[str]) -> set[str]:
+	"""
+	Usage:  dependents = get_samsett_dependents(kennistrengir)
+	Before: @kennistrengir is a set of kennistrengir.
+	After:  @dependents is a set of kennistrengir of samsett orð in database that have an orð in
+			@kennistrengir as orðhluti, directly or through other samsett orð, not including
+			@kennistrengir themselves.
+	"""
+	# reverse dependency index, orðhluti Ord_id -> Ord_ids of samsett orð it is used in, built
+	# in memory by walking the SamsettOrdhluti chains instead of querying them link by link
+	ohl_links = dict(
+		(ohl_id, (ord_id, next_ohl_id)) for ohl_id, ord_id, next_ohl_id in db.Session.query(
+			isl.SamsettOrdhluti.SamsettOrdhluti_id,
+			isl.SamsettOrdhluti.fk_Ord_id,
+			isl.SamsettOrdhluti.fk_NaestiOrdhluti_id
+		)
+	)
+	dependents_index = collections.defaultdict(set)
+	for s_ord_id, first_ohl_id in db.Session.query(
+		isl.SamsettOrd.fk_Ord_id, isl.SamsettOrd.fk_FyrstiOrdHluti_id
+	):
+		if s_ord_id is None:
+			continue
+		ohl_id = first_ohl_id
+		seen_ohl_ids = set()
+		while ohl_id is not None and ohl_id in ohl_links and ohl_id not in seen_ohl_ids:
+			seen_ohl_ids.add(ohl_id)
+			oh_ord_id, ohl_id = ohl_links[ohl_id]
+			dependents_index[oh_ord_id].add(s_ord_id)
+	ord_id_to_kennistrengur = dict(db.Session.query(isl.Ord.Ord_id, isl.Ord.Kennistrengur))
+	seed_ord_ids = set(
+		ord_id for ord_id, kennistrengur in ord_id_to_kennistrengur.items()
+		if kennistrengur in kennistrengir
+	)
+	# transitive closure, breadth first
+	dependent_ord_ids = set()
+	queue = collections.deque(seed_ord_ids)
+	while len(queue) > 0:
+		for d_ord_id in dependents_index.get(queue.popleft(), ()):
+			if d_ord_id in dependent_ord_ids or d_ord_id in seed_ord_ids:
+				continue
+			dependent_ord_ids.add(d_ord_id)
+			queue.append(d_ord_id)
+	return set(ord_id_to_kennistrengur[ord_id] for ord_id in dependent_ord_ids)
+
+
 def get_skammstafanir_with_ord(isl_ord: isl.Ord) -> list[str]:
 	sk_fr_query = db.Session.query(isl.SkammstofunFrasi).filter_by(fk_Ord_id=isl_ord.Ord_id)
 	skammstafanir = []
@@ -4164,6 +4839,122 @@ def get_skammstafanir_with_ord(isl_ord: isl.Ord) -> list[str]:
 	return skammstafanir
 
 
+def get_fallbeyging_hash(values: dict) -> int:
+	"""
+	Usage:  fallbeyging_hash = get_fallbeyging_hash(values)
+	Before: @values is a dict (or mapping) with the Fallbeyging columns Nefnifall, Tholfall,
+			Thagufall and Eignarfall.
+	After:  @fallbeyging_hash is a positive 63 bit integer from sha256 of the four föll, the
+			content address of the fallbeyging when fallbeygingar are deduplicated. Integer
+			instead of hexdigest so the column stays small, it is stored on every row.
+	"""
+	return int.from_bytes(hashlib.sha256(json.dumps(
+		[values['Nefnifall'], values['Tholfall'], values['Thagufall'], values['Eignarfall']],
+		separators=(',', ':'), ensure_ascii=False
+	).encode('utf-8')).digest()[:8], 'big') >> 1
+
+
+def is_fallbeyging_dedup() -> bool:
+	"""
+	Usage:  dedup = is_fallbeyging_dedup()
+	Before: Database connection has been initialized.
+	After:  @dedup is True if fallbeygingar in database are content-addressed, shared between orð
+			and never updated in place. Detected from database (any Fallbeyging row with Hash) on
+			first call, unless set with set_fallbeyging_dedup.
+	"""
+	global Fallbeyging_Dedup
+	if Fallbeyging_Dedup is None:
+		Fallbeyging_Dedup = db.Session.execute(
+			sqlalchemy.select(isl.Fallbeyging.Fallbeyging_id).where(
+				isl.Fallbeyging.Hash.is_not(None)
+			).limit(1)
+		).first() is not None
+	return Fallbeyging_Dedup
+
+
+def set_fallbeyging_dedup(dedup: bool):
+	global Fallbeyging_Dedup, Fallbeygingar_By_Hash
+	Fallbeyging_Dedup = dedup
+	Fallbeygingar_By_Hash = None
+
+
+def get_fallbeygingar_by_hash() -> dict[int, dict]:
+	"""
+	Usage:  fallbeygingar_by_hash = get_fallbeygingar_by_hash()
+	Before: Database connection has been initialized, fallbeygingar are deduplicated.
+	After:  @fallbeygingar_by_hash maps Hash to a dict with Fallbeyging_id and the four föll of
+			every Fallbeyging row (the lowest id one if more than one has the same föll). Read from
+			database on first call and kept in Fallbeygingar_By_Hash, used instead of an index on
+			Hash, until invalidated by set_fallbeyging_dedup or invalidate_fallbeygingar_by_hash.
+	"""
+	global Fallbeygingar_By_Hash
+	if Fallbeygingar_By_Hash is None:
+		fallbeygingar_by_hash = {}
+		for row in db.Session.execute(
+			sqlalchemy.select(
+				isl.Fallbeyging.Fallbeyging_id, isl.Fallbeyging.Nefnifall, isl.Fallbeyging.Tholfall,
+				isl.Fallbeyging.Thagufall, isl.Fallbeyging.Eignarfall, isl.Fallbeyging.Hash
+			).where(isl.Fallbeyging.Hash.is_not(None)).order_by(isl.Fallbeyging.Fallbeyging_id)
+		).mappings():
+			if row['Hash'] in fallbeygingar_by_hash:
+				check_fallbeyging_hash(fallbeygingar_by_hash[row['Hash']], row)
+				continue
+			fallbeygingar_by_hash[row['Hash']] = dict(row)
+		Fallbeygingar_By_Hash = fallbeygingar_by_hash
+	return Fallbeygingar_By_Hash
+
+
+def invalidate_fallbeygingar_by_hash():
+	global Fallbeygingar_By_Hash
+	Fallbeygingar_By_Hash = None
+
+
+def read_datafile_tail(filename_abs: str) -> tuple[str, str] | None:
+	"""
+	Usage:  kennistrengur_and_hash = read_datafile_tail(filename_abs)
+	Before: @filename_abs is absolute path to an existing datafile.
+	After:  @kennistrengur_and_hash is a tuple of kennistrengur and hash read from the last
+			Datafile_Tail_Size bytes of the datafile, where write_to_file puts them, or None if they
+			aren't found there (for example in a datafile formatted by hand).
+	"""
+	with open(filename_abs, mode='rb') as fi:
+		size = fi.seek(0, os.SEEK_END)
+		fi.seek(max(size - Datafile_Tail_Size, 0))
+		tail = fi.read().decode('utf-8', errors='replace')  # may start mid character
+	match = Datafile_Tail_Pattern.search(tail)
+	if match is None:
+		return None
+	return (json.loads(match.group(1)), json.loads(match.group(2)))
+
+
+def get_beygingar_fk_attributes(model) -> list[tuple[str, type]]:
+	"""
+	Usage:  fk_attributes = get_beygingar_fk_attributes(model)
+	Before: @model is a model class in isl.
+	After:  @fk_attributes is a list of (attribute, model) for the foreign keys of @model to
+			Fallbeyging or Sagnbeyging rows, kept in Beygingar_Fk_Attributes.
+	"""
+	if model not in Beygingar_Fk_Attributes:
+		fk_attributes = []
+		for column_attr in model.__mapper__.column_attrs:
+			for foreign_key in column_attr.columns[0].foreign_keys:
+				for beyging_model in (isl.Fallbeyging, isl.Sagnbeyging):
+					if foreign_key.column.table is beyging_model.__table__:
+						fk_attributes.append((column_attr.key, beyging_model))
+		Beygingar_Fk_Attributes[model] = fk_attributes
+	return Beygingar_Fk_Attributes[model]
+
+
+def check_fallbeyging_hash(fallbeyging: dict, values: dict):
+	"""
+	raises ValueError if @fallbeyging and @values, both with the same Hash, differ in föll, the
+	hash being 63 bits this should not happen
+	"""
+	for column in ('Nefnifall', 'Tholfall', 'Thagufall', 'Eignarfall'):
+		if fallbeyging[column] != values[column]:
+			raise ValueError('Fallbeyging (%s) hash collision.' % (fallbeyging['Fallbeyging_id'], ))
+
+
 def delete_ord_from_db(isl_ord: isl.Ord):
 	logman.debug('Deleting orð "%s" ..' % (isl_ord.Kennistrengur, ))
 	kennistrengur = isl_ord.Kennistrengur
@@ -4269,7 +5060,9 @@ def delete_ord_from_db(isl_ord: isl.Ord):
 			db.Session.delete(isl_ord_sn)
 	# delete orð itself
 	db.Session.delete(isl_ord)
-	db.Session.commit()
+	db.commit()
+	forget_ord_id(kennistrengur)
+	invalidate_ordhluti_beygingar(kennistrengur)
 	logman.info('Deleted orð "%s".' % (kennistrengur, ))
 
 
@@ -4285,62 +5078,95 @@ def delete_skammstofun_from_db(isl_skammst: isl.Skammstofun):
 	for mynd_entry in mynd_entries:
 		db.Session.delete(mynd_entry)
 	db.Session.delete(isl_skammst)
-	db.Session.commit()
+	db.commit()
 	logman.info('Deleted skammstöfun "%s".' % (kennistrengur, ))
 
 
-class MyIndentJSONEncoder(json.JSONEncoder):
-	'''
-	json encoder for doing a little bit of custom json string indentation
-
-	this encoder class is a complete hack, but the damn thing works and I'm running with it
-	'''
-	r_strengur = ''.join(
-		random.choices(string.ascii_uppercase + string.ascii_lowercase + string.digits, k=20)
-	)
+def dumps_datafile_json(data) -> str:
+	"""
+	Usage:  json_str = dumps_datafile_json(data)
+	Before: @data is JSON serializable data, Decimal values allowed.
+	After:  @json_str is @data as JSON in the datafile format, indented with tabs, with lists that
+			are values of Inline_List_Keys written on one line and Decimal values written as
+			unquoted numbers.
+
+	Lists and dicts within inline lists are written on the line too, as [1, 2] and {"a": 1}. The
+	removed MyIndentJSONEncoder lost track of them, it wrote the first as [1, 2] or {"a":1}
+	followed by a newline and indent and the rest over indented lines. No datafile has lists or
+	dicts within inline lists.
+	"""
+	chunks = []
+	_write_datafile_json(data, '\n', chunks)
+	return ''.join(chunks)
 
-	def default(self, obj):
-		if isinstance(obj, Decimal):
-			return (
-				f'<-FJARLAEGJA_GAESALAPPIR_{self.r_strengur}'
-				f'{obj.normalize():f}'
-				f'FJARLAEGJA_GAESALAPPIR_{self.r_strengur}->'
-			)
-		return super(MyIndentJSONEncoder, self).default(obj)
 
-	def iterencode(self, o, _one_shot=False):
-		list_lvl = 0
-		keys_to_differently_encode = [
-			'ág', 'mg', 'kk', 'kvk', 'hk', 'et', 'ft', 'stýrir', 'fylgiorð', 'beygingar'
-		]
-		state = 0
-		for s in super(MyIndentJSONEncoder, self).iterencode(o, _one_shot=False):
-			if state == 0:
-				if s.startswith('"') and s.endswith('"') and s[1:-1] in keys_to_differently_encode:
-					state += 1
-			elif state == 1:
-				if s == ': ':
-					state += 1
-				else:
-					state = 0
-			elif state == 2:
-				if s.startswith('['):
-					list_lvl += 1
-					s = ''.join([x.strip() for x in s.split('\n')])
-				elif 0 < list_lvl:
-					s = ''.join([x.strip() for x in s.split('\n')])
-					if s and s.startswith(','):
-						s = ', ' + s[1:]
-				if s.endswith(']'):
-					list_lvl -= 1
-					state = 0
-				if s.endswith('}'):
-					state = 0
-			if f'"<-FJARLAEGJA_GAESALAPPIR_{self.r_strengur}' in s:
-				s = s.replace(f'"<-FJARLAEGJA_GAESALAPPIR_{self.r_strengur}', '')
-			if f'FJARLAEGJA_GAESALAPPIR_{self.r_strengur}->"' in s:
-				s = s.replace(f'FJARLAEGJA_GAESALAPPIR_{self.r_strengur}->"', '')
-			yield s
+def _write_datafile_json(value, newline_indent: str, chunks: list[str]):
+	if isinstance(value, dict):
+		if len(value) == 0:
+			chunks.append('{}')
+			return
+		item_newline_indent = newline_indent + '\t'
+		separator = '{' + item_newline_indent
+		for key, item in value.items():
+			chunks.append(separator)
+			chunks.append(_dumps_json_key(key))
+			chunks.append(': ')
+			if key in Inline_List_Keys and isinstance(item, list):
+				chunks.append(_dumps_inline_json(item))
+			else:
+				_write_datafile_json(item, item_newline_indent, chunks)
+			separator = ',' + item_newline_indent
+		chunks.append(newline_indent)
+		chunks.append('}')
+	elif isinstance(value, list):
+		if len(value) == 0:
+			chunks.append('[]')
+			return
+		item_newline_indent = newline_indent + '\t'
+		separator = '[' + item_newline_indent
+		for item in value:
+			chunks.append(separator)
+			_write_datafile_json(item, item_newline_indent, chunks)
+			separator = ',' + item_newline_indent
+		chunks.append(newline_indent)
+		chunks.append(']')
+	else:
+		chunks.append(_dumps_json_scalar(value))
+
+
+def _dumps_inline_json(value) -> str:
+	if isinstance(value, list):
+		return '[' + ', '.join([_dumps_inline_json(item) for item in value]) + ']'
+	if isinstance(value, dict):
+		return '{' + ', '.join([
+			'%s: %s' % (_dumps_json_key(key), _dumps_inline_json(item))
+			for key, item in value.items()
+		]) + '}'
+	return _dumps_json_scalar(value)
+
+
+def _dumps_json_key(key) -> str:
+	if not isinstance(key, str):
+		raise TypeError(f'keys must be str, not {type(key).__name__}')
+	return encode_json_string(key)
+
+
+def _dumps_json_scalar(value) -> str:
+	if isinstance(value, str):
+		return encode_json_string(value)
+	if value is None:
+		return 'null'
+	if value is True:
+		return 'true'
+	if value is False:
+		return 'false'
+	if isinstance(value, int):
+		return int.__repr__(value)
+	if isinstance(value, float):
+		return float.__repr__(value)
+	if isinstance(value, Decimal):
+		return f'{value.normalize():f}'
+	raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
 
 
 class DecimalJSONEncoder(json.JSONEncoder):
@@ -4,122 +4,197 @@ Importer functionality
 
 Importing data from files to SQL database.
 """
-from collections import deque
+import collections
+import concurrent.futures
+import heapq
+import itertools
 import json
+import multiprocessing
 import os
 import re
+import time
 
 import git
 
+from lokaord import checkpoint
+from lokaord import graph
+from lokaord import instrumentation
 from lokaord import logman
-from lokaord.exc import VoidKennistrengurError
+from lokaord.database import db
+from lokaord.database.models import isl
+from lokaord.exc import CheckpointError, SamsettDependencyError
 from lokaord import handlers
+from lokaord import pipeline
 
+Worker_Chunksize = 64
+Query_Chunksize = 500  # max values in one SQL IN clause
+Pipeline_Queue_Size = 256  # max datafiles waiting between import pipeline stages
+Pipeline_Stats_Interval = 10000  # log import pipeline stats every n orð
 
-def import_datafiles_to_db():
+
+def import_datafiles_to_db(jobs: int = 1, resume_from: dict = None):
 	"""
 	Go through every file within "lokaord/database/data" directory and import to database.
+
+	Kjarna orð are imported through a pipeline of stages connected by bounded queues, datafiles
+	are discovered, then parsed and classified, then validated and hashed, then written to
+	database in this thread, in order, so writing starts while datafiles are still being
+	discovered. Samsett orð found on the way don't go through the pipeline, they are imported
+	after all kjarna orð, arranged by orðhluti dependencies, one at a time as deriving their
+	beygingar reads the orðhlutar written before them from database.
+
+	When @jobs is more than one then kjarna orð datafiles are read, parsed and validated again in
+	a pool of @jobs worker processes (the parse stage then only classifies them), while writing to
+	database is still done in this process, in order.
+
+	Progress is recorded with checkpoint.set_progress, when @resume_from is a checkpoint (see
+	checkpoint.load_checkpoint) then datafiles committed before it are skipped.
 	"""
 	logman.info('Running import for all datafiles to database ..')
-	tasks = []
-	task_retries = []
-	for handler in handlers.list_handlers():
-		kjarna_ord, samsett_ord = handler.get_files_list_sorted()
-		tasks.append({
-			'handler': handler,
-			'kjarna-orð': kjarna_ord,
-			'samsett-orð': samsett_ord
-		})
+	samsett_tasks = []
 	# kjarna-orð
 	logman.info('Importing kjarna orð.')
-	for task in tasks:
-		handler = task['handler']
-		logman.info('Doing kjarna-orð files for %s ..' % (handler.group.value, ))
-		wordCount = len(task['kjarna-orð'])
-		for index, ord_file in enumerate(task['kjarna-orð']):
-			if index % 100 == 0:
-				logman.info('Orð %s of %s, file "%s"' % (index + 1, wordCount, ord_file, ))
-			else:
-				logman.debug('Orð %s of %s, file "%s"' % (index + 1, wordCount, ord_file, ))
-			isl_ord = handler()
-			isl_ord.load_from_file(ord_file)
-			_, changes_made = isl_ord.write_to_db()
-			if changes_made is True:
-				logman.debug('Orð %s in file "%s" was changed.' % (
-					isl_ord.data.kennistrengur, ord_file
-				))
-	# samsett-orð
-	logman.info('Importing samsett orð.')
-	for task in tasks:
-		handler = task['handler']
-		logman.info('Doing samsett-orð files for %s ..' % (handler.group.value, ))
-		wordCount = len(task['samsett-orð'])
-		for index, ord_file in enumerate(task['samsett-orð']):
-			try:
-				if index % 100 == 0:
-					logman.info('Orð %s of %s, file "%s"' % (index + 1, wordCount, ord_file, ))
+	kjarna_skip = checkpoint.get_resume_index(resume_from, 'kjarna')
+	if kjarna_skip != 0:
+		logman.info('Resuming, skipping %s kjarna orð.' % (
+			'all' if kjarna_skip is None else kjarna_skip,
+		))
+	executor = None
+	if jobs > 1 and kjarna_skip is not None:
+		logman.info('Loading kjarna orð datafiles using %s worker processes.' % (jobs, ))
+		executor = concurrent.futures.ProcessPoolExecutor(
+			max_workers=jobs,
+			mp_context=multiprocessing.get_context('spawn'),  # don't inherit db connection
+			initializer=init_worker,
+			initargs=(logman.Logger.level, instrumentation.Import_Stats is not None)
+		)
+	folders = [
+		(handler, folder)
+		for handler in handlers.list_handlers() for folder in handler.get_folders()
+	]
+	import_pipeline = pipeline.Pipeline(folders, queue_size=Pipeline_Queue_Size)
+	import_pipeline.add_stage('discover', discover_datafiles)
+	import_pipeline.add_stage('parse', lambda datafiles: parse_kjarna_ord_datafiles(
+		datafiles, samsett_tasks, executor is None, kjarna_skip, resume_from
+	))
+	import_pipeline.add_stage('validate', lambda datafiles: validate_kjarna_ord_datafiles(
+		datafiles, executor, jobs
+	))
+	written = kjarna_skip or 0
+	started = time.perf_counter()
+	try:
+		with import_pipeline:
+			for isl_ord in import_pipeline:
+				ord_file = isl_ord.filename
+				if written % 100 == 0:
+					logman.info('Orð %s, file "%s"' % (written + 1, ord_file, ))
 				else:
-					logman.debug('Orð %s of %s, file "%s"' % (index + 1, wordCount, ord_file, ))
-				isl_ord = handler()
-				isl_ord.load_from_file(ord_file)
-				_, changes_made = isl_ord.write_to_db()
+					logman.debug('Orð %s, file "%s"' % (written + 1, ord_file, ))
+				changes_made = write_to_db(isl_ord)
 				if changes_made is True:
 					logman.debug('Orð %s in file "%s" was changed.' % (
 						isl_ord.data.kennistrengur, ord_file
 					))
-			except VoidKennistrengurError:
-				logman.debug('Encountered void kennistrengur for orð %s in file "%s", skipping.' % (
-					isl_ord.data.kennistrengur, ord_file
-				))
-				task_retries.append({
-					'handler': handler,
-					'file': ord_file,
-				})
-	# samsett-orð with void kennistrengur
-	# these are usually words samsett/combined from other samsett-orð
-	logman.info('Retrying importing samsett orð made of orð with void kennistrengur.')
-	logman.info('Arranging list of samsett orð made of orð with void kennistrengur ..')
-	task_retries_arranged = arrange_task_retries(task_retries)  # order matters here
-	task_retries_arranged_count = len(task_retries_arranged)
-	logman.info('Amount of words to retry: %s' % (task_retries_arranged_count, ))
-	index = 0
-	for task in task_retries_arranged:
+				written += 1
+				checkpoint.set_progress(
+					'kjarna', written, ord_file, isl_ord.data.kennistrengur, isl_ord.data.datahash
+				)
+				if written % Pipeline_Stats_Interval == 0:
+					log_pipeline_stats(import_pipeline, written, time.perf_counter() - started)
+			log_pipeline_stats(import_pipeline, written, time.perf_counter() - started)
+	finally:
+		if executor is not None:
+			executor.shutdown(cancel_futures=True)
+	db.commit_batch(force=True)
+	checkpoint.set_progress('samsett', 0, committed=True)
+	# samsett-orð
+	# arranged by orðhluti dependencies so that every orð is imported after its orðhlutar
+	logman.info('Importing samsett orð.')
+	logman.info('Arranging samsett orð by orðhluti dependencies ..')
+	with instrumentation.phase('listing'):
+		samsett_tasks = sort_samsett_tasks_by_dependencies(samsett_tasks)
+	wordCount = len(samsett_tasks)
+	samsett_skip = resume_skip(samsett_tasks, 'samsett', resume_from)
+	for index, task in enumerate(samsett_tasks[samsett_skip:], start=samsett_skip):
 		handler = task['handler']
 		ord_file = task['file']
 		if index % 100 == 0:
-			logman.info('Orð file "%s" (%s/%s)' % (
-				ord_file, index + 1, task_retries_arranged_count
-			))
+			logman.info('Orð %s of %s, file "%s"' % (index + 1, wordCount, ord_file, ))
 		else:
-			logman.debug('Orð file "%s" (%s/%s)' % (
-				ord_file, index + 1, task_retries_arranged_count
-			))
+			logman.debug('Orð %s of %s, file "%s"' % (index + 1, wordCount, ord_file, ))
 		isl_ord = handler()
-		isl_ord.load_from_file(ord_file)
-		_, changes_made = isl_ord.write_to_db()
+		with instrumentation.ordflokkur(handler):
+			isl_ord.load_from_file(ord_file)
+		changes_made = write_to_db(isl_ord)
 		if changes_made is True:
 			logman.debug('Orð %s in file "%s" was changed.' % (
 				isl_ord.data.kennistrengur, ord_file
 			))
-		index += 1
+		checkpoint.set_progress(
+			'samsett', index + 1, ord_file, isl_ord.data.kennistrengur, isl_ord.data.datahash
+		)
+	db.commit_batch(force=True)
+	checkpoint.set_progress('skammstafanir', 0, committed=True)
+	log_ordhluti_beygingar_cache_stats()
 	# skammstafanir
 	logman.info('Importing skammstafanir.')
-	for skammstofun_file in handlers.Skammstofun.get_files_list_sorted():
+	with instrumentation.phase('listing'):
+		skammstofun_files = handlers.Skammstofun.get_files_list_sorted()
+	skammstofun_skip = resume_skip(skammstofun_files, 'skammstafanir', resume_from)
+	for index, skammstofun_file in enumerate(
+		skammstofun_files[skammstofun_skip:], start=skammstofun_skip
+	):
 		logman.debug('Skammstöfun file "%s"' % (skammstofun_file, ))
 		skammstofun = handlers.Skammstofun()
-		skammstofun.load_from_file(skammstofun_file)
-		_, changes_made = skammstofun.write_to_db()
+		with instrumentation.ordflokkur(skammstofun):
+			skammstofun.load_from_file(skammstofun_file)
+		changes_made = write_to_db(skammstofun)
 		if changes_made is True:
 			logman.debug('Skammstöfun %s in file "%s" was changed.' % (
 				skammstofun.data.kennistrengur, skammstofun_file
 			))
+		checkpoint.set_progress(
+			'skammstafanir', index + 1, skammstofun_file, skammstofun.data.kennistrengur,
+			skammstofun.data.datahash
+		)
+	db.commit_batch(force=True)
 	logman.info('Done importing data from datafiles to database.')
 
 
+def resume_skip(files: list, phase: str, resume_from: dict | None) -> int:
+	"""
+	Usage:  skip = resume_skip(files, phase, resume_from)
+	Before: @files is the list of datafiles (or samsett tasks) for @phase in import order,
+			@resume_from is a checkpoint or None.
+	After:  @skip is the amount of @files committed according to @resume_from, raises
+			CheckpointError if @files don't match the checkpoint.
+	"""
+	skip = checkpoint.get_resume_index(resume_from, phase)
+	if skip is None:
+		skip = len(files)
+	elif skip > 0:
+		if skip > len(files):
+			raise CheckpointError(
+				'Checkpoint is at index %s of phase %s, but there are only %s datafiles.' % (
+					skip, phase, len(files)
+				)
+			)
+		last_file = files[skip - 1]
+		checkpoint.check_resume_datafile(
+			resume_from, last_file['file'] if isinstance(last_file, dict) else last_file
+		)
+	if skip > 0:
+		logman.info('Resuming, skipping %s of %s datafiles in phase %s.' % (
+			skip, len(files), phase
+		))
+	return skip
+
+
 def import_list_of_datafiles_to_db(files: list[str]):
 	handlers_map = handlers.get_handlers_map()
-	ord_files, skammstofun_files = handlers.Ord.sort_files_skammstafanir_from_ord(files)
-	kjarna_ord, samsett_ord = handlers.Ord.sort_files_to_kjarna_and_samsett_ord(ord_files)
+	with instrumentation.phase('listing'):
+		ord_files, skammstofun_files = handlers.Ord.sort_files_skammstafanir_from_ord(files)
+		kjarna_ord, samsett_ord = handlers.Ord.sort_files_to_kjarna_and_samsett_ord(ord_files)
 	# kjarna-orð
 	if len(kjarna_ord) == 0:
 		logman.info('No new or changed kjarna orð.')
@@ -127,61 +202,60 @@ def import_list_of_datafiles_to_db(files: list[str]):
 		logman.info('Importing changed or new kjarna orð.')
 	for kjarna_ord_file in kjarna_ord:
 		logman.info('Orð file "%s"' % (kjarna_ord_file, ))
-		handler = handlers_map[handlers.Ord.load_json(kjarna_ord_file)['flokkur']]
+		handler = handlers_map[handlers.Ord.load_json_fields(kjarna_ord_file)['flokkur']]
 		isl_ord = handler()
-		isl_ord.load_from_file(kjarna_ord_file)
-		_, changes_made = isl_ord.write_to_db()
+		with instrumentation.ordflokkur(handler):
+			isl_ord.load_from_file(kjarna_ord_file)
+		changes_made = write_to_db(isl_ord)
 		if changes_made is True:
 			logman.info('Orð %s in file "%s" was changed.' % (
 				isl_ord.data.kennistrengur, kjarna_ord_file
 			))
+	db.commit_batch(force=True)
 	# samsett-orð
-	samsett_ord_void_queue = deque()
 	if len(samsett_ord) == 0:
 		logman.info('No new or changed samsett orð.')
 	else:
 		logman.info('Importing changed or new samsett orð.')
+	samsett_tasks = []
 	for samsett_ord_file in samsett_ord:
-		logman.info('Orð file "%s"' % (samsett_ord_file, ))
-		handler = handlers_map[handlers.Ord.load_json(samsett_ord_file)['flokkur']]
-		isl_ord = handler()
-		try:
-			isl_ord.load_from_file(samsett_ord_file)
-			_, changes_made = isl_ord.write_to_db()
-			if changes_made is True:
-				logman.info('Orð %s in file "%s" was changed.' % (
-					isl_ord.data.kennistrengur, samsett_ord_file
-				))
-		except VoidKennistrengurError:
-			samsett_ord_void_queue.append(samsett_ord_file)
-	# retry void samsett-orð ( similar to arrange_task_retries below )
-	max_retries = 100 + (10 * len(files))  # just a minor safety from potential infinite loop
-	count_retries = 0
-	while True:
-		samsett_ord_file = None
-		try:
-			samsett_ord_file = samsett_ord_void_queue.popleft()
-		except IndexError:
-			break  # deque is empty
-		handler = handlers_map[handlers.Ord.load_json(samsett_ord_file)['flokkur']]
-		isl_ord = handler()
-		try:
+		samsett_tasks.append({
+			'handler': handlers_map[handlers.Ord.load_json_fields(samsett_ord_file)['flokkur']],
+			'file': samsett_ord_file
+		})
+	with instrumentation.phase('listing'):
+		samsett_tasks += get_dependent_samsett_tasks(kjarna_ord + samsett_ord)
+		samsett_tasks = sort_samsett_tasks_by_dependencies(samsett_tasks)
+	dependents_count = 0
+	dependents_changed_count = 0
+	for task in samsett_tasks:
+		samsett_ord_file = task['file']
+		logman.info('Orð file "%s"%s' % (
+			samsett_ord_file, ' (dependent)' if task.get('dependent') is True else ''
+		))
+		isl_ord = task['handler']()
+		with instrumentation.ordflokkur(isl_ord):
 			isl_ord.load_from_file(samsett_ord_file)
-			_, changes_made = isl_ord.write_to_db()
+		# beygingar of samsett orð are derived on load so changes to them only show in the
+		# datahash, storing it also marks the orð as edited for write-files
+		changes_made = write_to_db(isl_ord)
+		if task.get('dependent') is True:
+			dependents_count += 1
 			if changes_made is True:
-				logman.info('Orð %s in file "%s" was changed.' % (
+				dependents_changed_count += 1
+				logman.info('Derived data of orð %s in file "%s" was changed.' % (
 					isl_ord.data.kennistrengur, samsett_ord_file
 				))
-		except VoidKennistrengurError as err:
-			samsett_ord_void_queue.append(samsett_ord_file)
-			count_retries += 1
-			if count_retries > max_retries:
-				raise VoidKennistrengurError(
-					(
-						'import_list_of_datafiles_to_db: maximum amount of retries reached (%s),'
-						' %s'
-					) % (samsett_ord_file, err.msg, )
-				)
+		elif changes_made is True:
+			logman.info('Orð %s in file "%s" was changed.' % (
+				isl_ord.data.kennistrengur, samsett_ord_file
+			))
+	db.commit_batch(force=True)
+	if dependents_count > 0:
+		logman.info('Re-derived %s dependent samsett orð, %s of them changed.' % (
+			dependents_count, dependents_changed_count
+		))
+	log_ordhluti_beygingar_cache_stats()
 	# skammstafanir
 	if len(skammstofun_files) == 0:
 		logman.info('No new or changed skammstafanir.')
@@ -190,15 +264,57 @@ def import_list_of_datafiles_to_db(files: list[str]):
 	for skammstofun_file in skammstofun_files:
 		logman.info('Skammstöfun file "%s"' % (skammstofun_file, ))
 		skammstofun = handlers.Skammstofun()
-		skammstofun.load_from_file(skammstofun_file)
-		_, changes_made = skammstofun.write_to_db()
+		with instrumentation.ordflokkur(skammstofun):
+			skammstofun.load_from_file(skammstofun_file)
+		changes_made = write_to_db(skammstofun)
 		if changes_made is True:
 			logman.info('Skammstöfun %s in file "%s" was changed.' % (
 				skammstofun.data.kennistrengur, skammstofun_file
 			))
+	db.commit_batch(force=True)
 	logman.info('Done importing data from datafiles to database.')
 
 
+def get_dependent_samsett_tasks(files: list[str]) -> list[dict]:
+	"""
+	Usage:  tasks = get_dependent_samsett_tasks(files)
+	Before: @files is a list of changed orð datafiles about to be imported.
+	After:  @tasks is a list of dicts with 'handler', 'file' and 'dependent' for datafiles of
+			samsett orð in database derived from orð in @files, directly or transitively, which
+			aren't in @files themselves, so their derived beygingar get refreshed.
+	"""
+	kennistrengir = set(
+		handlers.Ord.load_json_fields(filename).get('kennistrengur') for filename in files
+	)
+	dependents = handlers.get_samsett_dependents(kennistrengir)
+	if len(dependents) == 0:
+		return []
+	logman.info('Found %s samsett orð dependent on changed orð.' % (len(dependents), ))
+	handlers_map = handlers.get_handlers_map()
+	files_set = set(files)
+	dependents = sorted(dependents)
+	isl_ord_records = []
+	for index in range(0, len(dependents), Query_Chunksize):
+		isl_ord_records += db.Session.query(isl.Ord).filter(
+			isl.Ord.Kennistrengur.in_(dependents[index:index + Query_Chunksize])
+		).all()
+	isl_ord_records.sort(key=lambda isl_ord_record: isl_ord_record.Ord_id)
+	tasks = []
+	for isl_ord_record in isl_ord_records:
+		handler = handlers_map[isl_ord_record.Ordflokkur.name]
+		# the samsett orð is loaded and derived when imported, its filename only needs its fields
+		ord_file = handler().load_filename_from_db(isl_ord_record)
+		if ord_file in files_set:
+			continue
+		if not os.path.isfile(os.path.join(handlers.Ord.datafiles_dir, ord_file)):
+			logman.warning('Datafile "%s" for dependent samsett orð %s not found, skipping.' % (
+				ord_file, isl_ord_record.Kennistrengur
+			))
+			continue
+		tasks.append({'handler': handler, 'file': ord_file, 'dependent': True})
+	return tasks
+
+
 def import_changed_datafiles_to_db():
 	"""
 	Go through datafiles in "lokaord/database/data" directory that have changed according to git
@@ -209,10 +325,29 @@ def import_changed_datafiles_to_db():
 	import_list_of_datafiles_to_db(files)
 
 
-def import_changed_datafiles_since_commit_to_db(sha_hash: str, files_import: list[str]):
+def import_changed_datafiles_by_manifest_to_db(datafiles_scan: dict):
+	"""
+	Go through datafiles in "lokaord/database/data" directory that are new or have changed since
+	last import according to manifest, see manifest.scan_datafiles.
+	"""
+	logman.info('Doing import for changed or new datafiles, according to manifest, to database ..')
+	import_list_of_datafiles_to_db(datafiles_scan['changed'])
+	report_deleted_datafiles(
+		datafiles_scan['deleted'],
+		set(entry['kennistrengur'] for entry in datafiles_scan['files'].values())
+	)
+
+
+def import_changed_datafiles_since_commit_to_db(
+	sha_hash: str, files_import: list[str]
+) -> dict[str, str]:
 	"""
 	Go through datafiles in "lokaord/database/data" directory that have changed according to git
 	since a specified commit.
+
+	The net change for the commit range is found with one tree to tree diff, with renames
+	detected. Returns dict of datafiles deleted in the range -> their kennistrengur, these are
+	reported but their orð are left in database.
 	"""
 	sha1_regex = re.compile(r'^[0-9a-fA-f]+$')
 	if bool(sha1_regex.match(sha_hash)) is False:
@@ -222,33 +357,225 @@ def import_changed_datafiles_since_commit_to_db(sha_hash: str, files_import: lis
 	)
 	repo_dir_abs = os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
 	repo = git.Repo(repo_dir_abs)
-	commit_range = f'{sha_hash}..HEAD'
-	files = []
+	files = set()
+	deleted = {}
 	datafiles_dir_rel = 'lokaord/database/data/'
 	dfdr_len = len(datafiles_dir_rel)
-	for commit in repo.iter_commits(commit_range):
-		diffs = commit.parents[0].diff(commit)
-		changed_files = [item.a_path for item in diffs]
-		for changed_file in changed_files:
-			if (
-				not changed_file.startswith(datafiles_dir_rel) or
-				not changed_file.endswith('.json') or
-				changed_file in files
-			):
-				continue
-			changed_file_abs = os.path.join(repo_dir_abs, changed_file)
-			if (
-				not os.path.exists(changed_file_abs) or
-				os.path.islink(changed_file_abs) or
-				not os.path.isfile(changed_file_abs)
-			):
-				continue
-			files.append(changed_file[dfdr_len:])
+	for diff in repo.commit(sha_hash).diff(repo.head.commit, paths=datafiles_dir_rel):
+		if diff.deleted_file is True:
+			if diff.a_path.endswith('.json'):
+				deleted[diff.a_path[dfdr_len:]] = json.loads(
+					diff.a_blob.data_stream.read()
+				).get('kennistrengur')
+			continue
+		changed_file = diff.b_path  # new path for renamed files
+		if not changed_file.startswith(datafiles_dir_rel) or not changed_file.endswith('.json'):
+			continue
+		changed_file_abs = os.path.join(repo_dir_abs, changed_file)
+		if (
+			not os.path.exists(changed_file_abs) or
+			os.path.islink(changed_file_abs) or
+			not os.path.isfile(changed_file_abs)
+		):
+			continue
+		files.add(changed_file[dfdr_len:])
 	logman.info('Found %s changed files.' % (len(files), ))
-	for file_import in files_import:
-		if file_import not in files:
-			files.append(file_import)
+	files.update(files_import)
+	files = sorted(files)
 	import_list_of_datafiles_to_db(files)
+	# a kennistrengur moved out of a deleted datafile is in a datafile added or changed in the range
+	report_deleted_datafiles(deleted, set(
+		handlers.Ord.load_json_fields(filename).get('kennistrengur') for filename in files
+	))
+	return deleted
+
+
+def report_deleted_datafiles(deleted: dict[str, str], kennistrengir_kept: set[str]):
+	"""
+	Usage:  report_deleted_datafiles(deleted, kennistrengir_kept)
+	Before: @deleted is a dict of deleted datafile -> kennistrengur it contained,
+			@kennistrengir_kept is a set of kennistrengir found in current datafiles, either all of
+			them or at least those of datafiles added or changed since @deleted were imported, as
+			a kennistrengur moved out of a deleted datafile can only have moved into one of those.
+	After:  Deleted datafiles whose kennistrengur is not kept (for example moved to another
+			datafile) have been logged with a hint on how to delete their orð from database.
+	"""
+	for deleted_file, kennistrengur in sorted(deleted.items()):
+		if kennistrengur in kennistrengir_kept:
+			continue
+		command = 'del-skammst' if deleted_file.startswith('skammstafanir/') else 'del-ord'
+		logman.warning('Datafile "%s" was deleted, remove its data from database with "%s %s".' % (
+			deleted_file, command, kennistrengur
+		))
+
+
+def write_to_db(isl_ord: handlers.Ord) -> bool:
+	"""
+	Usage:  changes_made = write_to_db(isl_ord)
+	Before: @isl_ord is a handler instance (orð or skammstöfun) with data loaded.
+	After:  If database has the same datahash stored for @isl_ord then writing was skipped, else
+			data has been written to database followed by its datahash. @changes_made is True if
+			database changes were made, including a changed datahash, which for samsett orð is
+			the only change when their derived beygingar change. A missing datahash backfilled on
+			an otherwise unchanged record is not counted as a change.
+	"""
+	with instrumentation.ordflokkur(isl_ord), instrumentation.phase('write'):
+		if isl_ord.is_unchanged_in_db():
+			logman.debug('Orð %s unchanged, skipping.' % (isl_ord.data.kennistrengur, ))
+			instrumentation.count_file(isl_ord, False)
+			return False
+		isl_record, changes_made = isl_ord.write_to_db()
+		changes_made = isl_ord.write_datahash_to_db(isl_record, changes_made) or changes_made
+		db.commit_batch()
+	instrumentation.count_file(isl_ord, changes_made)
+	return changes_made
+
+
+def log_ordhluti_beygingar_cache_stats():
+	cache_stats = handlers.get_ordhluti_beygingar_cache_stats()
+	logman.info('Orðhluti beygingar cache: %s hits, %s misses, hit rate %.1f%%.' % (
+		cache_stats['hits'], cache_stats['misses'], cache_stats['hit_rate'] * 100
+	))
+
+
+def init_worker(loglevel: int, instrumented: bool = False):
+	"""
+	initializer for importer worker processes, sets up logging to cli only, and recording stats
+	(see load_datafile_in_worker) if @instrumented
+	"""
+	level = None
+	for level_name, level_value in logman.Log_Levels.items():
+		if level_value == loglevel:
+			level = level_name
+	logman.init(level=level, log_to_file=False)
+	if instrumented is True:
+		instrumentation.start_worker()
+
+
+def discover_datafiles(folders):
+	"""
+	import pipeline stage, yields (handler, datafile) for datafiles in (handler, folder) @folders
+	"""
+	for handler, folder in folders:
+		with instrumentation.phase('listing'):
+			datafiles = handler.get_files_list(folder)
+		for datafile in datafiles:
+			yield (handler, datafile)
+
+
+def parse_kjarna_ord_datafiles(
+	datafiles, samsett_tasks: list[dict], keep_documents: bool = True, skip: int | None = 0,
+	resume_from: dict = None
+):
+	"""
+	Usage:  for handler, datafile in parse_kjarna_ord_datafiles(
+				datafiles, samsett_tasks, keep_documents, skip, resume_from
+			):
+				..
+	Before: @datafiles is an iterable of (handler, datafile), @samsett_tasks is a list, @skip is
+			amount of kjarna orð datafiles to skip when resuming from checkpoint @resume_from, None
+			to skip all.
+	After:  Datafiles have been parsed and classified, in order, see Ord.load_json_fields, and
+			(handler, datafile) yielded for kjarna orð datafiles not skipped. Samsett orð
+			datafiles have been appended to @samsett_tasks as dicts with 'handler' and 'file'.
+			Parsed documents of kjarna orð datafiles are kept in datafile_cache for
+			validate_kjarna_ord_datafiles only if @keep_documents is True (they are not loaded in
+			this process with --jobs) and the datafile isn't skipped, else only their fields.
+	"""
+	kjarna_index = 0
+	for handler, datafile in datafiles:
+		try:
+			json_data = handlers.Ord.load_json_fields(datafile)
+		except json.decoder.JSONDecodeError:
+			raise ValueError(f'File "{os.path.basename(datafile)}" has invalid JSON format.')
+		if 'samsett' in json_data:
+			samsett_tasks.append({'handler': handler, 'file': datafile})
+			continue
+		kjarna_index += 1
+		if keep_documents is False or skip is None or kjarna_index <= skip:
+			handlers.forget_datafile_document(datafile)
+		if skip is None:
+			continue
+		if kjarna_index <= skip:
+			if kjarna_index == skip:
+				checkpoint.check_resume_datafile(resume_from, datafile)
+			continue
+		yield (handler, datafile)
+	if skip is not None and kjarna_index < skip:
+		raise CheckpointError(
+			'Checkpoint is at index %s of phase kjarna, but there are only %s datafiles.' % (
+				skip, kjarna_index
+			)
+		)
+
+
+def validate_kjarna_ord_datafiles(
+	datafiles, executor: concurrent.futures.Executor = None, jobs: int = 1
+):
+	"""
+	Usage:  for isl_ord in validate_kjarna_ord_datafiles(datafiles, executor, jobs):
+				..
+	Before: @datafiles is an iterable of (handler, datafile) of kjarna orð datafiles, @executor is
+			optional process pool with @jobs workers.
+	After:  Datafiles have been loaded, in order, as handler instances with data validated and
+			hashed, see load_datafile, in @executor when provided with at most
+			@jobs * Worker_Chunksize datafiles in flight, where workers read and parse the
+			datafiles again themselves.
+	"""
+	in_flight = collections.deque()
+	in_flight_max = max(jobs, 1) * Worker_Chunksize
+	for handler, datafile in datafiles:
+		if executor is None:
+			yield load_datafile(handler, datafile)
+			continue
+		in_flight.append(executor.submit(load_datafile_in_worker, handler, datafile))
+		if len(in_flight) >= in_flight_max:
+			yield merge_worker_result(in_flight.popleft().result())
+	while len(in_flight) > 0:
+		yield merge_worker_result(in_flight.popleft().result())
+
+
+def log_pipeline_stats(import_pipeline: pipeline.Pipeline, written: int, seconds: float):
+	for stage_stats in import_pipeline.get_stats():
+		logman.info((
+			'Pipeline stage "%s": %s items, %.1f/s, queue %s/%s (max %s), backpressure %.1fs, '
+			'starved consumer %.1fs.'
+		) % (
+			stage_stats['name'], stage_stats['items'], stage_stats['items_per_second'],
+			stage_stats['queue_depth'], stage_stats['queue_size'], stage_stats['queue_depth_max'],
+			stage_stats['blocked_seconds'], stage_stats['starved_seconds']
+		))
+	logman.info('Pipeline stage "write": %s orð, %.1f/s.' % (
+		written, written / seconds if seconds > 0 else 0.0
+	))
+
+
+def load_datafile(handler: handlers.Ord, ord_file: str) -> handlers.Ord:
+	"""
+	Usage:  isl_ord = load_datafile(handler, ord_file)
+	Before: @handler is a handler class, @ord_file is relative path to a kjarna orð datafile.
+	After:  @isl_ord is a @handler instance with data read, validated and hashed from @ord_file,
+			database is not touched so this can be run in a worker process.
+	"""
+	isl_ord = handler()
+	with instrumentation.ordflokkur(handler):
+		isl_ord.load_from_file(ord_file)
+	return isl_ord
+
+
+def load_datafile_in_worker(handler: handlers.Ord, ord_file: str) -> tuple[handlers.Ord, dict]:
+	"""
+	load_datafile for worker processes, returns tuple of the handler instance and stats recorded
+	while loading it (None when not recording), see merge_worker_result
+	"""
+	isl_ord = load_datafile(handler, ord_file)
+	return (isl_ord, instrumentation.pop_stats())
+
+
+def merge_worker_result(result: tuple[handlers.Ord, dict]) -> handlers.Ord:
+	isl_ord, stats = result
+	instrumentation.merge_stats(stats)
+	return isl_ord
 
 
 def get_changed_and_untracked_data_files():
@@ -270,51 +597,81 @@ def get_changed_and_untracked_data_files():
 	return files
 
 
-def arrange_task_retries(task_retries: list) -> list:
+def sort_samsett_tasks_by_dependencies(tasks: list[dict]) -> list[dict]:
 	"""
-	arrange task retries of samsett-orð with void kennistrengur
-	task_retries is a list of dicts with 'handler' and 'file'
-	problem: when adding samsett orð we need all orðhlutar to be already added to the database, so
-	the order of import depends on samsetning orða
-	solution: order task_retries properly
+	Usage:  tasks_sorted = sort_samsett_tasks_by_dependencies(tasks)
+	Before: @tasks is a list of dicts with 'handler' and 'file' for samsett orð datafiles,
+			orðhlutar of these samsett orð should either be in @tasks or already in database.
+	After:  @tasks_sorted contains the same tasks topologically sorted on orðhluti dependencies, so
+			every samsett orð comes after the samsett orð it is combined from, otherwise original
+			order is kept. Raises SamsettDependencyError listing every missing orðhluti reference
+			and every circular definition found.
 	"""
-	max_retries = 100
-	task_retries_kennistrengir = set()
-	task_queue = deque()
-	for task in task_retries:
-		file_data = None
-		file_abspath = os.path.join(task['handler'].datafiles_dir, task['file'])
-		with open(file_abspath, mode='r', encoding='utf-8') as fi:
-			file_data = json.loads(fi.read())
+	kennistrengur_to_index = {}
+	task_dependencies = []
+	for index, task in enumerate(tasks):
+		file_data = handlers.Ord.load_json_fields(task['file'])
 		task['kennistrengur'] = file_data['kennistrengur']
-		task_retries_kennistrengir.add(file_data['kennistrengur'])
-		task['samsett_kennistrengir'] = []
-		for ordhluti in file_data['samsett']:
-			task['samsett_kennistrengir'].append(ordhluti['kennistrengur'])
-		task_queue.append(task)
-	kennistrengir_added = set()
-	arrangement_retries = {}
-	task_retries_arranged = []
-	while True:
-		task = None
-		try:
-			task = task_queue.popleft()
-		except IndexError:
-			break  # deque is empty
-		no_problem = True
-		# ef enginn orðhlutakennistrengur í task_retries_kennistrengir eða ef þeim kennistrengjum
-		# hefur verið bætt við þá er ekkert vandamál
-		for oh_k in task['samsett_kennistrengir']:
-			if oh_k in task_retries_kennistrengir and oh_k not in kennistrengir_added:
-				no_problem = False
-		if no_problem is True:
-			task_retries_arranged.append(task)
-			kennistrengir_added.add(task['kennistrengur'])
-			continue
-		if task['file'] not in arrangement_retries:
-			arrangement_retries[task['file']] = 0
-		arrangement_retries[task['file']] += 1
-		if arrangement_retries[task['file']] > max_retries:
-			raise Exception('Max retries reached for file "%s".' % (task['file'], ))
-		task_queue.append(task)
-	return task_retries_arranged
+		task['samsett_kennistrengir'] = [ohl['kennistrengur'] for ohl in file_data['samsett']]
+		kennistrengur_to_index[task['kennistrengur']] = index
+	db_kennistrengir = set(
+		kennistrengur for (kennistrengur, ) in db.Session.query(isl.Ord.Kennistrengur)
+	)
+	missing = []
+	dependents = [[] for _ in tasks]
+	in_degree = [0] * len(tasks)
+	for index, task in enumerate(tasks):
+		for oh_k in set(task['samsett_kennistrengir']):
+			if oh_k in kennistrengur_to_index:
+				dependents[kennistrengur_to_index[oh_k]].append(index)
+				in_degree[index] += 1
+			elif oh_k not in db_kennistrengir:
+				missing.append('  %s -> "%s"' % (task['file'], oh_k))
+	# Kahn's algorithm, heap keyed on original index keeps original order where possible
+	ready = [index for index in range(len(tasks)) if in_degree[index] == 0]
+	heapq.heapify(ready)
+	tasks_sorted = []
+	while ready:
+		index = heapq.heappop(ready)
+		tasks_sorted.append(tasks[index])
+		for dependent in dependents[index]:
+			in_degree[dependent] -= 1
+			if in_degree[dependent] == 0:
+				heapq.heappush(ready, dependent)
+	cycles = []
+	if len(tasks_sorted) < len(tasks):
+		cycles = find_samsett_cycles(tasks, kennistrengur_to_index, in_degree)
+	if len(missing) > 0 or len(cycles) > 0:
+		report = ''
+		if len(missing) > 0:
+			report += '\nMissing orðhluti references (file -> kennistrengur):\n%s' % (
+				'\n'.join(missing),
+			)
+		if len(cycles) > 0:
+			report += '\nCircular samsett definitions:\n%s' % (
+				'\n'.join('  %s' % (' -> '.join(cycle), ) for cycle in cycles),
+			)
+		raise SamsettDependencyError(report)
+	return tasks_sorted
+
+
+def find_samsett_cycles(
+	tasks: list[dict], kennistrengur_to_index: dict, in_degree: list[int]
+) -> list[list[str]]:
+	"""
+	find circular definitions among tasks left unsorted by sort_samsett_tasks_by_dependencies,
+	returns list of cycles, each cycle a list of kennistrengir starting and ending on the same one,
+	together passing through every task on a cycle, see graph.find_cycles
+	"""
+	unsorted = [index for index in range(len(tasks)) if in_degree[index] > 0]
+	unsorted_set = set(unsorted)
+	ordhluti_graph = {}
+	for index in unsorted:
+		ordhluti_graph[index] = sorted(set(
+			kennistrengur_to_index[oh_k] for oh_k in tasks[index]['samsett_kennistrengir']
+			if kennistrengur_to_index.get(oh_k) in unsorted_set
+		))
+	return [
+		[tasks[index]['kennistrengur'] for index in cycle]
+		for cycle in graph.find_cycles(ordhluti_graph)
+	]
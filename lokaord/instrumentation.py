@@ -0,0 +1,259 @@
+#!/usr/bin/python
+"""
+Instrumentation functionality
+
+Timing phases of importing datafiles to SQL database and counting files, changed orð, retries and
+queries per orðflokkur, reported as a summary table and a JSON record when the import is done, so
+throughput can be compared between data releases.
+"""
+from contextlib import contextmanager
+import threading
+import time
+
+from sqlalchemy import event
+
+from lokaord import logman
+
+# phases, time spent in a nested phase is not counted to the phase around it
+Import_Phases = (
+	'listing',  # listing and arranging datafiles
+	'parse',  # reading and parsing datafiles
+	'validate',  # validating data into structs
+	'derive',  # deriving beygingar of samsett orð, kennistrengur and datahash
+	'write',  # writing orð to database session
+	'commit',  # committing database session
+)
+
+# run-scoped stats, active within instrumented context (or in worker processes, see start_worker)
+Import_Stats = None
+Import_Stats_Lock = threading.Lock()  # pipeline stages add to stats from their threads
+Thread_State = threading.local()  # per thread stack of phases and current orðflokkur
+
+
+def new_stats() -> dict:
+	return {
+		'phases': dict((phase, {'seconds': 0.0, 'count': 0}) for phase in Import_Phases),
+		'ordflokkar': {},
+		'queries': 0,
+	}
+
+
+@contextmanager
+def instrumented(engine=None):
+	"""
+	Usage:  with instrumented(engine):
+				...
+	Before: @engine is optional SQLAlchemy engine to count queries on.
+	After:  Inside the context phases, files, retries and queries are recorded, see phase,
+			count_file and count_retries. Leaving the context without exception logs the summary,
+			see log_stats.
+	"""
+	global Import_Stats
+	Import_Stats = new_stats()
+	started = time.perf_counter()
+	if engine is not None:
+		event.listen(engine, 'before_cursor_execute', _count_query)
+	try:
+		yield
+		Import_Stats['seconds'] = time.perf_counter() - started
+		log_stats(Import_Stats)
+	finally:
+		if engine is not None:
+			event.remove(engine, 'before_cursor_execute', _count_query)
+		Import_Stats = None
+
+
+def start_worker():
+	"""
+	record stats in a worker process, collected with pop_stats and added up with merge_stats
+	"""
+	global Import_Stats
+	Import_Stats = new_stats()
+
+
+def pop_stats() -> dict | None:
+	"""
+	Usage:  stats = pop_stats()
+	Before: Nothing.
+	After:  @stats is what has been recorded since last call (None when not recording), recording
+			continues from zero.
+	"""
+	global Import_Stats
+	if Import_Stats is None:
+		return None
+	with Import_Stats_Lock:
+		stats = Import_Stats
+		Import_Stats = new_stats()
+	return stats
+
+
+def merge_stats(stats: dict | None):
+	"""
+	add @stats from pop_stats (for example from a worker process) to stats being recorded
+	"""
+	if Import_Stats is None or stats is None:
+		return
+	with Import_Stats_Lock:
+		for phase_name, phase_stats in stats['phases'].items():
+			Import_Stats['phases'][phase_name]['seconds'] += phase_stats['seconds']
+			Import_Stats['phases'][phase_name]['count'] += phase_stats['count']
+		for ordflokkur_name, ordflokkur_stats in stats['ordflokkar'].items():
+			counters = _get_ordflokkur_counters(ordflokkur_name)
+			for key, value in ordflokkur_stats.items():
+				counters[key] += value
+		Import_Stats['queries'] += stats['queries']
+
+
+def get_ordflokkur_name(handler) -> str:
+	"""
+	name to group stats of @handler (class or instance) by
+	"""
+	if handler.group is None:
+		return 'skammstöfun'
+	return handler.group.value
+
+
+@contextmanager
+def ordflokkur(handler):
+	"""
+	Usage:  with ordflokkur(handler):
+				...
+	Before: @handler is a handler class or instance.
+	After:  Phase time and queries inside the context (in this thread) are also counted to the
+			orðflokkur of @handler.
+	"""
+	if Import_Stats is None:
+		yield
+		return
+	state = _get_thread_state()
+	ordflokkur_before = state.ordflokkur
+	state.ordflokkur = get_ordflokkur_name(handler)
+	try:
+		yield
+	finally:
+		state.ordflokkur = ordflokkur_before
+
+
+@contextmanager
+def phase(name: str):
+	"""
+	Usage:  with phase(name):
+				...
+	Before: @name is one of Import_Phases.
+	After:  Time spent inside the context, except in phases nested within it, has been added to
+			phase @name, and to current orðflokkur if any.
+	"""
+	if Import_Stats is None:
+		yield
+		return
+	phases = _get_thread_state().phases
+	now = time.perf_counter()
+	if len(phases) > 0:
+		_add_phase_seconds(phases[-1][0], now - phases[-1][1], count=0)
+	phases.append([name, now])
+	try:
+		yield
+	finally:
+		now = time.perf_counter()
+		_add_phase_seconds(name, now - phases[-1][1], count=1)
+		phases.pop()
+		if len(phases) > 0:
+			phases[-1][1] = now
+
+
+def count_file(handler, changed: bool):
+	"""
+	count a datafile of @handler imported, @changed is True if it made changes to database
+	"""
+	if Import_Stats is None:
+		return
+	with Import_Stats_Lock:
+		counters = _get_ordflokkur_counters(get_ordflokkur_name(handler))
+		counters['files'] += 1
+		if changed is True:
+			counters['changed'] += 1
+
+
+def count_retries(handler, retries: int):
+	"""
+	count @retries, validation attempts made after a failed one, for a datafile of @handler
+	"""
+	if Import_Stats is None or retries <= 0:
+		return
+	with Import_Stats_Lock:
+		_get_ordflokkur_counters(get_ordflokkur_name(handler))['retries'] += retries
+
+
+def log_stats(stats: dict):
+	"""
+	Usage:  log_stats(stats)
+	Before: @stats has been recorded within instrumented context.
+	After:  A summary table of phases and orðflokkar has been logged, followed by @stats as a JSON
+			record (in the JSON log, see logman) with files/s rates added.
+	"""
+	files = sum(counters['files'] for counters in stats['ordflokkar'].values())
+	stats['files'] = files
+	stats['files_per_second'] = _per_second(files, stats['seconds'])
+	for phase_stats in stats['phases'].values():
+		phase_stats['files_per_second'] = _per_second(files, phase_stats['seconds'])
+	for counters in stats['ordflokkar'].values():
+		counters['files_per_second'] = _per_second(counters['files'], counters['seconds'])
+	lines = [
+		'Import stats, %s files in %.1fs, %.1f files/s, %s queries.' % (
+			files, stats['seconds'], stats['files_per_second'], stats['queries']
+		),
+		'  %-12s %10s %10s %12s' % ('phase', 'seconds', 'count', 'files/s'),
+	]
+	for phase_name, phase_stats in stats['phases'].items():
+		lines.append('  %-12s %10.1f %10s %12.1f' % (
+			phase_name, phase_stats['seconds'], phase_stats['count'],
+			phase_stats['files_per_second']
+		))
+	lines.append('  %-12s %10s %10s %10s %10s %10s %12s' % (
+		'orðflokkur', 'files', 'changed', 'retries', 'queries', 'seconds', 'files/s'
+	))
+	for ordflokkur_name, counters in sorted(stats['ordflokkar'].items()):
+		lines.append('  %-12s %10s %10s %10s %10s %10.1f %12.1f' % (
+			ordflokkur_name, counters['files'], counters['changed'], counters['retries'],
+			counters['queries'], counters['seconds'], counters['files_per_second']
+		))
+	logman.info('\n'.join(lines))
+	logman.info('Import stats JSON record.', extra={'data': {'import_stats': stats}})
+
+
+def _get_thread_state():
+	if not hasattr(Thread_State, 'phases'):
+		Thread_State.phases = []
+		Thread_State.ordflokkur = None
+	return Thread_State
+
+
+def _get_ordflokkur_counters(ordflokkur_name: str) -> dict:
+	if ordflokkur_name not in Import_Stats['ordflokkar']:
+		Import_Stats['ordflokkar'][ordflokkur_name] = {
+			'files': 0, 'changed': 0, 'retries': 0, 'queries': 0, 'seconds': 0.0
+		}
+	return Import_Stats['ordflokkar'][ordflokkur_name]
+
+
+def _add_phase_seconds(name: str, seconds: float, count: int):
+	ordflokkur_name = _get_thread_state().ordflokkur
+	with Import_Stats_Lock:
+		Import_Stats['phases'][name]['seconds'] += seconds
+		Import_Stats['phases'][name]['count'] += count
+		if ordflokkur_name is not None:
+			_get_ordflokkur_counters(ordflokkur_name)['seconds'] += seconds
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+	if Import_Stats is None:
+		return
+	ordflokkur_name = _get_thread_state().ordflokkur
+	with Import_Stats_Lock:
+		Import_Stats['queries'] += 1
+		if ordflokkur_name is not None:
+			_get_ordflokkur_counters(ordflokkur_name)['queries'] += 1
+
+
+def _per_second(amount: int, seconds: float) -> float:
+	return amount / seconds if seconds > 0 else 0.0
@@ -38,7 +38,7 @@ Log_Config = {
 		'\033[97;1m[\033[0m%(levelname)s\033[97;1m]\033[0m %(message)s '
 		'\033[90m(%(name)s|%(filename)s:%(lineno)d)\033[0m'
 	),
-	'json_format': ['ts', 'level', 'msg', 'pathname', 'lineno'],
+	'json_format': ['ts', 'level', 'msg', 'pathname', 'lineno', 'data'],  # data from extra
 	'time_format': '%Y-%m-%dT%H:%M:%S'
 }
 
@@ -65,7 +65,7 @@ class JSONFormatter(logging.Formatter):
 					raise ValueError('recordfield should be str')
 			self.recordfields = recordfields
 		else:
-			self.recordfields = ['ts', 'level', 'msg', 'pathname', 'lineno']
+			self.recordfields = ['ts', 'level', 'msg', 'pathname', 'lineno', 'data']
 
 	def format(self, record):
 		'''override ancestor class function to generate minified JSON string from log record'''
@@ -0,0 +1,129 @@
+#!/usr/bin/python
+"""
+Manifest functionality
+
+Keeping track of datafiles imported to SQL database without relying on git, so that changed
+datafiles can be found by comparing file stats and content hashes to the last successful import.
+"""
+import hashlib
+import json
+import os
+
+from lokaord import logman
+from lokaord import handlers
+
+Manifest_Version = 1
+
+
+def get_manifest_file(name: str) -> str:
+	"""
+	manifest lives next to the SQLite database file it describes
+	"""
+	if '/' in name or '.' in name:
+		raise Exception('Bad name provided!')
+	return os.path.join(
+		os.path.dirname(os.path.realpath(__file__)), 'database', 'disk', name, 'manifest.json'
+	)
+
+
+def load_manifest(name: str) -> dict | None:
+	"""
+	Usage:  files = load_manifest(name)
+	Before: @name is database name.
+	After:  @files is a dict of datafile path -> entry from the last written manifest, or None if
+			there is no (usable) manifest.
+	"""
+	manifest_file = get_manifest_file(name)
+	if not os.path.isfile(manifest_file):
+		return None
+	with open(manifest_file, mode='r', encoding='utf-8') as fi:
+		manifest = json.loads(fi.read())
+	if manifest.get('version') != Manifest_Version:
+		logman.warning('Ignoring manifest with unknown version "%s".' % (manifest.get('version'), ))
+		return None
+	return manifest['files']
+
+
+def write_manifest(name: str, files: dict):
+	"""
+	Usage:  write_manifest(name, files)
+	Before: @name is database name, @files is a dict of datafile path -> entry, as returned by
+			scan_datafiles, describing datafiles that have been successfully imported.
+	After:  manifest file has been (atomically) replaced.
+	"""
+	manifest_file = get_manifest_file(name)
+	manifest_file_tmp = '%s.tmp' % (manifest_file, )
+	with open(manifest_file_tmp, mode='w', encoding='utf-8') as fo:
+		fo.write(json.dumps(
+			{'version': Manifest_Version, 'files': files}, ensure_ascii=False, separators=(',', ':')
+		))
+	os.replace(manifest_file_tmp, manifest_file)
+	logman.info('Wrote manifest for %s datafiles.' % (len(files), ))
+
+
+def delete_manifest(name: str):
+	manifest_file = get_manifest_file(name)
+	if os.path.isfile(manifest_file):
+		os.remove(manifest_file)
+		logman.info('Deleted manifest.')
+
+
+def scan_datafiles(files: dict | None) -> dict:
+	"""
+	Usage:  scan = scan_datafiles(files)
+	Before: @files is a dict of datafile path -> entry from load_manifest, or None.
+	After:  @scan is a dict with 'files' containing manifest entries for current datafiles,
+			'changed' listing paths of new or changed datafiles and 'deleted' mapping datafiles in
+			@files that no longer exist to their kennistrengur. Only datafiles with changed size or
+			mtime are read and hashed, those with unchanged content hash are not listed as changed.
+	"""
+	if files is None:
+		files = {}
+	scanned_files = {}
+	changed = []
+	rehashed_count = 0
+	for datafile, stat in walk_datafiles(handlers.Ord.datafiles_dir):
+		entry = files.get(datafile)
+		if (
+			entry is not None and
+			entry['size'] == stat.st_size and
+			entry['mtime_ns'] == stat.st_mtime_ns
+		):
+			scanned_files[datafile] = entry
+			continue
+		with open(os.path.join(handlers.Ord.datafiles_dir, datafile), mode='rb') as fi:
+			content = fi.read()
+		rehashed_count += 1
+		content_hash = hashlib.sha256(content).hexdigest()
+		if entry is not None and entry['hash'] == content_hash:
+			scanned_files[datafile] = dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+			continue
+		data = json.loads(content)
+		scanned_files[datafile] = {
+			'size': stat.st_size,
+			'mtime_ns': stat.st_mtime_ns,
+			'hash': content_hash,
+			'kennistrengur': data.get('kennistrengur'),
+			'samsett': [ohl['kennistrengur'] for ohl in data.get('samsett') or []],
+		}
+		changed.append(datafile)
+	deleted = dict(
+		(datafile, entry['kennistrengur']) for datafile, entry in files.items()
+		if datafile not in scanned_files
+	)
+	logman.info('Scanned %s datafiles, hashed %s, %s new or changed, %s deleted.' % (
+		len(scanned_files), rehashed_count, len(changed), len(deleted)
+	))
+	return {'files': scanned_files, 'changed': changed, 'deleted': deleted}
+
+
+def walk_datafiles(directory: str, directory_rel: str = ''):
+	"""
+	yields (relative path, os.stat_result) for JSON datafiles within @directory, sorted by path
+	"""
+	for dir_entry in sorted(os.scandir(directory), key=lambda e: e.name):
+		path_rel = os.path.join(directory_rel, dir_entry.name)
+		if dir_entry.is_dir(follow_symlinks=False):
+			yield from walk_datafiles(dir_entry.path, path_rel)
+		elif dir_entry.is_file(follow_symlinks=False) and dir_entry.name.endswith('.json'):
+			yield (path_rel, dir_entry.stat())
@@ -0,0 +1,163 @@
+#!/usr/bin/python
+"""
+Pipeline functionality
+
+Running stages of work in threads connected by bounded queues, so that stages overlap and a stage
+is held back (backpressure) when the stage after it can't keep up.
+"""
+import queue
+import threading
+import time
+
+Queue_Poll_Seconds = 0.1
+Stage_End = object()  # put on stage queue when the stage is done
+
+
+class Stage:
+	"""
+	Pipeline stage, a thread running @transform over items from @source and putting the items it
+	yields on a bounded queue, which the next stage (or the consumer) reads by iterating over the
+	stage. Use through Pipeline.
+	"""
+
+	def __init__(
+		self, name: str, transform, source, queue_size: int, stopping: threading.Event
+	):
+		self.name = name
+		self.transform = transform
+		self.source = source
+		self.queue = queue.Queue(maxsize=queue_size)
+		self.queue_size = queue_size
+		self.stopping = stopping
+		self.error = None
+		self.items = 0
+		self.queue_depth_max = 0
+		self.blocked_seconds = 0.0  # waiting for room on full queue, i.e. backpressure
+		self.starved_seconds = 0.0  # consumer waiting for items on empty queue
+		self.started = None
+		self.finished = None
+		self.thread = threading.Thread(target=self._run, name='pipeline-%s' % (name, ), daemon=True)
+
+	def start(self):
+		self.started = time.perf_counter()
+		self.thread.start()
+
+	def _run(self):
+		try:
+			for item in self.transform(self.source):
+				if self._put(item) is False:
+					return
+				self.items += 1
+		except BaseException as err:
+			self.error = err
+		finally:
+			self.finished = time.perf_counter()
+			self._put(Stage_End)
+
+	def _put(self, item) -> bool:
+		try:
+			self.queue.put_nowait(item)
+		except queue.Full:
+			blocked_since = time.perf_counter()
+			while True:
+				if self.stopping.is_set():
+					return False
+				try:
+					self.queue.put(item, timeout=Queue_Poll_Seconds)
+					break
+				except queue.Full:
+					continue
+			self.blocked_seconds += time.perf_counter() - blocked_since
+		self.queue_depth_max = max(self.queue_depth_max, self.queue.qsize())
+		return True
+
+	def __iter__(self):
+		while True:
+			try:
+				item = self.queue.get_nowait()
+			except queue.Empty:
+				starved_since = time.perf_counter()
+				while True:
+					if self.stopping.is_set():
+						return
+					try:
+						item = self.queue.get(timeout=Queue_Poll_Seconds)
+						break
+					except queue.Empty:
+						continue
+				self.starved_seconds += time.perf_counter() - starved_since
+			if item is Stage_End:
+				break
+			yield item
+		if self.error is not None:
+			raise self.error
+
+	def get_stats(self) -> dict:
+		"""
+		Usage:  stats = stage.get_stats()
+		Before: @stage has been started.
+		After:  @stats is a dict with current queue depth, max queue depth seen, amount of items
+				passed on, throughput in items per second and seconds spent blocked on a full queue
+				(backpressure) and seconds the consumer spent waiting on an empty queue.
+		"""
+		elapsed = (self.finished or time.perf_counter()) - self.started
+		return {
+			'name': self.name,
+			'items': self.items,
+			'queue_depth': self.queue.qsize(),
+			'queue_depth_max': self.queue_depth_max,
+			'queue_size': self.queue_size,
+			'items_per_second': self.items / elapsed if elapsed > 0 else 0.0,
+			'blocked_seconds': self.blocked_seconds,
+			'starved_seconds': self.starved_seconds,
+		}
+
+
+class Pipeline:
+	"""
+	Chain of stages, each running in its own thread, the last stage is consumed by iterating over
+	the pipeline in the calling thread.
+
+	Usage:  pipeline = Pipeline(source, queue_size)
+			pipeline.add_stage(name, transform)
+			..
+			with pipeline:
+				for item in pipeline:
+					..
+	Before: @source is an iterable of items for the first stage, @queue_size is the maximum amount
+			of items waiting between stages. Each @transform is a function taking an iterable of
+			items from the previous stage and returning an iterable (usually a generator) of items
+			for the next stage.
+	After:  Items have been passed through the stages in order. An exception raised in a stage is
+			re-raised in the calling thread after the items yielded before it. Leaving the context
+			stops and joins the stage threads, also when the consumer stops early.
+	"""
+
+	def __init__(self, source, queue_size: int = 256):
+		if queue_size < 1:
+			raise ValueError('Pipeline queue size should be positive.')
+		self.source = source
+		self.queue_size = queue_size
+		self.stopping = threading.Event()
+		self.stages = []
+
+	def add_stage(self, name: str, transform):
+		source = self.stages[-1] if len(self.stages) > 0 else self.source
+		self.stages.append(Stage(name, transform, source, self.queue_size, self.stopping))
+
+	def __enter__(self):
+		for stage in self.stages:
+			stage.start()
+		return self
+
+	def __exit__(self, exc_type, exc_value, exc_traceback):
+		self.stopping.set()
+		for stage in self.stages:
+			stage.thread.join()
+		return False
+
+	def __iter__(self):
+		return iter(self.stages[-1])
+
+	def get_stats(self) -> list[dict]:
+		return [stage.get_stats() for stage in self.stages]
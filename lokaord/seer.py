@@ -23,7 +23,7 @@ import git
 
 from lokaord import logman
 from lokaord.database.models.utils import TimestampIsoformat as ts_iso
-from lokaord.handlers import DecimalJSONEncoder, MyIndentJSONEncoder
+from lokaord.handlers import DecimalJSONEncoder, dumps_datafile_json
 from lokaord.version import __version__ as version
 
 if platform.system() == 'Linux':
@@ -871,10 +871,7 @@ def webpack(
 				file_queue.append(file_path)
 				continue
 		webpack_data['count'] = len(webpack_data['orð'])
-		webpack_data_json_pretty = json.dumps(
-			webpack_data, indent='\t', ensure_ascii=False, separators=(',', ': '),
-			cls=MyIndentJSONEncoder
-		)
+		webpack_data_json_pretty = dumps_datafile_json(webpack_data)
 		webpack_data_json_min = json.dumps(
 			webpack_data, separators=(',', ':'), ensure_ascii=False, sort_keys=True,
 			cls=DecimalJSONEncoder
@@ -927,10 +924,7 @@ def webpack(
 			added_kennistrengir.add(kennistrengur)
 			skamm_count += 1
 		webpack_skamm_data['count'] = len(webpack_skamm_data['skammstafanir'])
-		webpack_data_json_pretty = json.dumps(
-			webpack_skamm_data, indent='\t', ensure_ascii=False, separators=(',', ': '),
-			cls=MyIndentJSONEncoder
-		)
+		webpack_data_json_pretty = dumps_datafile_json(webpack_skamm_data)
 		webpack_data_json_min = json.dumps(
 			webpack_skamm_data, separators=(',', ':'), ensure_ascii=False, sort_keys=True,
 			cls=DecimalJSONEncoder
@@ -0,0 +1,157 @@
+#!/usr/bin/python
+"""
+Validator functionality
+
+Checking datafiles without building a database, every error found is collected and reported
+instead of stopping at the first one.
+"""
+import collections
+import concurrent.futures
+import json
+import multiprocessing
+import os
+from decimal import Decimal
+
+from lokaord import handlers
+from lokaord import importer
+from lokaord import logman
+from lokaord import manifest
+
+
+def validate_datafiles(jobs: int = 1) -> list[str]:
+	"""
+	Usage:  errors = validate_datafiles(jobs)
+	Before: @jobs is amount of worker processes to validate datafiles in.
+	After:  Every datafile in "lokaord/database/data" has been checked, see validate_datafile, and
+			references from samsett orð and skammstafanir checked to exist in datafiles.
+			@errors is a sorted list of error strings, each starting with the datafile path, which
+			have also been logged.
+	"""
+	logman.info('Validating datafiles ..')
+	datafiles = [datafile for datafile, _ in manifest.walk_datafiles(handlers.Ord.datafiles_dir)]
+	logman.info('Found %s datafiles.' % (len(datafiles), ))
+	if jobs > 1:
+		logman.info('Validating datafiles using %s worker processes.' % (jobs, ))
+		with concurrent.futures.ProcessPoolExecutor(
+			max_workers=jobs,
+			mp_context=multiprocessing.get_context('spawn'),
+			initializer=importer.init_worker,
+			initargs=(logman.Logger.level, )
+		) as executor:
+			results = list(executor.map(
+				validate_datafile, datafiles, chunksize=importer.Worker_Chunksize
+			))
+	else:
+		results = list(map(validate_datafile, datafiles))
+	errors = []
+	datafiles_by_kennistrengur = collections.defaultdict(list)
+	for result in results:
+		errors += result['errors']
+		if result['kennistrengur'] is not None:
+			datafiles_by_kennistrengur[result['kennistrengur']].append(result['file'])
+	for kennistrengur, kennistrengur_datafiles in datafiles_by_kennistrengur.items():
+		if len(kennistrengur_datafiles) > 1:
+			for datafile in kennistrengur_datafiles:
+				errors.append('%s: kennistrengur "%s" is also in %s.' % (
+					datafile, kennistrengur, ', '.join(
+						'"%s"' % (other, ) for other in kennistrengur_datafiles if other != datafile
+					)
+				))
+	for result in results:
+		for reference in result['references']:
+			if reference not in datafiles_by_kennistrengur:
+				errors.append('%s: reference to missing kennistrengur "%s".' % (
+					result['file'], reference
+				))
+	errors.sort()
+	for error in errors:
+		logman.error(error)
+	samsett_count = sum(1 for result in results if result['samsett'] is True)
+	logman.info((
+		'Validated %s datafiles, found %s errors. Datahash of %s samsett orð datafiles not '
+		'checked, it depends on beygingar derived from database.'
+	) % (len(results), len(errors), samsett_count))
+	return errors
+
+
+def validate_datafile(datafile: str) -> dict:
+	"""
+	Usage:  result = validate_datafile(datafile)
+	Before: @datafile is relative path to datafile within "lokaord/database/data".
+	After:  @result is a dict with 'file', 'kennistrengur', 'samsett', 'references' (kennistrengir
+			of orðhlutar or frasi orð) and 'errors', a list of error strings for the datafile:
+			invalid JSON, data not fitting any struct, kennistrengur or filename not matching the
+			data and (except for samsett orð) stored datahash not matching the data. Database is
+			not touched so this can be run in a worker process.
+	"""
+	result = {
+		'file': datafile, 'kennistrengur': None, 'samsett': False, 'references': [], 'errors': []
+	}
+	errors = result['errors']
+	datafile_abs = os.path.join(handlers.Ord.datafiles_dir, datafile)
+	try:
+		with open(datafile_abs, mode='r', encoding='utf-8') as fi:
+			data = json.loads(fi.read(), parse_float=Decimal)
+	except (json.decoder.JSONDecodeError, UnicodeDecodeError) as err:
+		errors.append('%s: invalid JSON, %s' % (datafile, err))
+		return result
+	if not isinstance(data, dict):
+		errors.append('%s: datafile should contain a JSON object.' % (datafile, ))
+		return result
+	if 'skammstöfun' in data:
+		handler = handlers.Skammstofun
+		result['references'] = [
+			frasi for frasi in data.get('frasi') or [] if isinstance(frasi, str)
+		]
+	else:
+		handler = handlers.get_handlers_map().get(data.get('flokkur'))
+		if handler is None:
+			errors.append('%s: unknown flokkur "%s".' % (datafile, data.get('flokkur')))
+			return result
+		if isinstance(data.get('samsett'), list):
+			result['samsett'] = True
+			result['references'] = [
+				ohl['kennistrengur'] for ohl in data['samsett']
+				if isinstance(ohl, dict) and isinstance(ohl.get('kennistrengur'), str)
+			]
+	isl_ord = handler()
+	file_data = dict(data)
+	merking = isl_ord.detect_merking_in_filename(os.path.basename(datafile))
+	if merking is not None and 'merking' not in data:
+		data['merking'] = merking
+	try:
+		isl_ord.load_from_dict(data, datafile, derive_samsett=False)
+	except ValueError as err:
+		errors.append('%s: %s' % (datafile, summarize_load_error(str(err))))
+		if isinstance(file_data.get('kennistrengur'), str):
+			# so orð referring to it aren't reported as missing references as well
+			result['kennistrengur'] = file_data['kennistrengur']
+		return result
+	result['kennistrengur'] = isl_ord.data.kennistrengur
+	if file_data.get('kennistrengur') != isl_ord.data.kennistrengur:
+		errors.append('%s: kennistrengur is "%s", should be "%s".' % (
+			datafile, file_data.get('kennistrengur'), isl_ord.data.kennistrengur
+		))
+	if isl_ord.make_filename() != datafile:
+		errors.append('%s: filename should be "%s".' % (datafile, isl_ord.make_filename()))
+	if result['samsett'] is False and file_data.get('hash') != isl_ord.data.datahash:
+		errors.append('%s: hash is "%s", should be "%s".' % (
+			datafile, file_data.get('hash'), isl_ord.data.datahash
+		))
+	return result
+
+
+def summarize_load_error(message: str) -> str:
+	"""
+	keep the validation errors from a Ord.load_from_dict error message and drop tracebacks
+	"""
+	lines = []
+	keep = True
+	for line in message.splitlines():
+		if line.startswith('Traceback'):
+			keep = False
+		elif 'ValidationError:' in line:
+			keep = True
+		if keep is True and line.strip() not in ('', '◈◈◈') and 'errors.pydantic.dev' not in line:
+			lines.append(line)
+	return '\n'.join(lines)
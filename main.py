@@ -1,5 +1,6 @@
 #!/usr/bin/python
 import datetime
+import os
 from pathlib import Path
 import sys
 
@@ -38,6 +39,11 @@ def common(
 	log_directory: Annotated[
 		Path, Option('--log-directory', '-ldir', help='Directory to write logs in.')
 	] = './logs/',
+	log_json: Annotated[
+		Optional[bool], Option(
+			'--log-json', '-lj', help='Also write logs to a JSON lines log file.'
+		)
+	] = False,
 	role: Annotated[lokaord.LoggerRoles, Option('--role', '-r')] = 'cli'
 ):
 	lokaord.Ts = datetime.datetime.now()
@@ -48,7 +54,9 @@ def common(
 		raise typer.BadParameter(f'Please ensure provided log-directory "{log_directory}" exists.')
 	if not log_directory.is_dir():
 		raise typer.BadParameter(f'Provided log-directory "{log_directory}" is not a directory.')
-	lokaord.logman.init(logger_name, level=loglevel, role=role, output_dir=log_directory)
+	lokaord.logman.init(
+		logger_name, level=loglevel, role=role, output_dir=log_directory, log_to_json=log_json
+	)
 	if len(sys.argv) <= 1:
 		print(
 			'Usage: lokaord [OPTIONS] COMMAND1 [ARGS]... [COMMAND2 [ARGS]...]...\n'
@@ -59,11 +67,87 @@ def common(
 @app.command('build-db', help='Import words from JSON datafiles to database.')
 def build_db(
 	rebuild: Annotated[Optional[bool], Option('--rebuild', '-r')] = False,
-	changes_only: Annotated[Optional[bool], Option('--changes-only', '-ch')] = False
+	changes_only: Annotated[Optional[bool], Option('--changes-only', '-ch')] = False,
+	bulk: Annotated[
+		Optional[bool], Option('--bulk', '-bu', help='Defer commits and write in batches.')
+	] = False,
+	bulk_batch_size: Annotated[
+		int, Option(
+			'--bulk-batch-size', '-bbs', help='Orð per commit in bulk mode, 0 for once per phase.'
+		)
+	] = 0,
+	jobs: Annotated[
+		int, Option('--jobs', '-j', help='Worker processes for reading and validating datafiles.')
+	] = 1,
+	use_manifest: Annotated[
+		Optional[bool], Option(
+			'--manifest', '-ma', help='Find changes by datafile manifest instead of git.'
+		)
+	] = False,
+	doc_cache_size: Annotated[
+		int, Option(
+			'--doc-cache', '-dc',
+			help='Parsed datafiles kept in memory, 0 to keep only fields needed for sorting.'
+		)
+	] = 32768,
+	resume: Annotated[
+		Optional[bool], Option(
+			'--resume', '-re', help='Continue an interrupted import from its last checkpoint.'
+		)
+	] = False,
+	dedup_fallbeygingar: Annotated[
+		Optional[bool], Option(
+			'--dedup', '-dd', help='Store identical fallbeygingar once, see the dedup-db command.'
+		)
+	] = False,
+	db_profile: Annotated[
+		lokaord.DbProfile, Option(
+			'--db-profile', '-dbp',
+			help='Database connection profile, "build" is faster but not durable until done.'
+		)
+	] = 'default'
 ):
 	if rebuild and changes_only:
 		raise typer.BadParameter('build-db: --rebuild and --changes-only are mutually exclusive.')
-	lokaord.build_db(rebuild=rebuild, changes_only=changes_only)
+	if resume and (rebuild or changes_only):
+		raise typer.BadParameter(
+			'build-db: --resume can\'t be used with --rebuild or --changes-only.'
+		)
+	if bulk_batch_size < 0:
+		raise typer.BadParameter('build-db: --bulk-batch-size should be zero or positive.')
+	if jobs < 1:
+		raise typer.BadParameter('build-db: --jobs should be one or more.')
+	if doc_cache_size < 0:
+		raise typer.BadParameter('build-db: --doc-cache should be zero or positive.')
+	lokaord.build_db(
+		rebuild=rebuild, changes_only=changes_only, bulk=bulk, bulk_batch_size=bulk_batch_size,
+		jobs=jobs, use_manifest=use_manifest, doc_cache_size=doc_cache_size, resume=resume,
+		dedup_fallbeygingar=dedup_fallbeygingar, db_profile=db_profile.value
+	)
+
+
+@app.command('dedup-db', help=(
+	'Migrate database to content-addressed fallbeygingar, identical ones stored once and shared.'
+))
+def dedup_db():
+	lokaord.dedup_db()
+
+
+@app.command('gc-db', help='Delete fallbeygingar no longer referenced by any orð.')
+def gc_db():
+	lokaord.gc_db()
+
+
+@app.command(help='Validate JSON datafiles without building database, exit code 1 on errors.')
+def validate(
+	jobs: Annotated[
+		int, Option('--jobs', '-j', help='Worker processes for validating datafiles.')
+	] = os.cpu_count() or 1
+):
+	if jobs < 1:
+		raise typer.BadParameter('validate: --jobs should be one or more.')
+	if lokaord.validate(jobs=jobs) > 0:
+		raise typer.Exit(code=1)
 
 
 @app.command('backup-db', help='Create backup of current SQLite database file.')
@@ -80,8 +164,18 @@ def use_backup(name: str = None, filename = None):
 def write_files(
 	timestamp: Annotated[Optional[datetime.datetime], Option('--timestamp', '-ts')] = None,
 	time_offset: Annotated[Optional[lokaord.TimeOffset], Option('--time-offset', '-to')] = None,
-	this_run: Annotated[Optional[bool], Option('--this-run', '-tr')] = False
+	this_run: Annotated[Optional[bool], Option('--this-run', '-tr')] = False,
+	jobs: Annotated[
+		int, Option('--jobs', '-j', help='Worker processes for writing datafiles.')
+	] = 1,
+	verify: Annotated[
+		Optional[bool], Option(
+			'--verify', '-ve', help='Compare full content of datafiles instead of their hash.'
+		)
+	] = False
 ):
+	if jobs < 1:
+		raise typer.BadParameter('write-files: --jobs should be one or more.')
 	if timestamp is not None and time_offset is not None:
 		logman.warning('Both timestamp and time_offset specified, using timestamp.')
 	ts = timestamp
@@ -91,7 +185,7 @@ def write_files(
 		if ts is not None:
 			logman.warning('Overriding timestamp with this_run.')
 		ts = lokaord.Ts
-	lokaord.write_files(ts)
+	lokaord.write_files(ts, jobs=jobs, verify=verify)
 
 
 @app.command(help='Build word search.')
@@ -161,9 +255,15 @@ def runtime():
 def init(
 	rebuild: Annotated[Optional[bool], Option('--rebuild', '-r')] = False,
 	update_readme: Annotated[Optional[bool], Option('--update-readme', '-ur')] = False,
-	blind: Annotated[Optional[bool], Option('--blind', '-b')] = False
+	blind: Annotated[Optional[bool], Option('--blind', '-b')] = False,
+	db_profile: Annotated[
+		lokaord.DbProfile, Option(
+			'--db-profile', '-dbp',
+			help='Database connection profile, "build" is faster but not durable until done.'
+		)
+	] = 'default'
 ):
-	lokaord.build_db(rebuild=rebuild)
+	lokaord.build_db(rebuild=rebuild, db_profile=db_profile.value)
 	lokaord.write_files()
 	if blind is False:
 		lokaord.build_sight()
@@ -0,0 +1,93 @@
+#!/usr/bin/python
+"""
+Test fixtures
+
+Tests are run from repository root with "python -m pytest tests". Tests needing a database use
+fixture_db, a small SQLite database built from a dependency-closed subset of the datafiles.
+"""
+import os
+
+import pytest
+
+from lokaord import handlers
+from lokaord import importer
+from lokaord import logman
+from lokaord import manifest
+from lokaord.database import db
+
+# datafiles the fixture database is built from, along with what they depend on and the first
+# kjarna and samsett orð datafile in each orðflokkur folder, see get_fixture_datafiles
+Fixture_Seeds = [
+	'lysingarord/afbragðsgóður.json',  # samsett from smáorð, nafnorð and lýsingarorð
+	'nafnord/Afríkuútgerð-kvk.json',  # samsett from samsett orð "útgerð"
+	'nafnord/kaldavatn-hk.json',  # samsett with lýsingarorð myndir orðhluti
+	'sagnord/hunsa.json',  # samsett sagnorð
+	'skammstafanir/2G.json',
+]
+
+
+def pytest_configure(config):
+	if logman.Logger is None:
+		logman.init('tests', level='warn', log_to_file=False)
+
+
+@pytest.fixture(scope='session')
+def datafiles_index() -> dict[str, str]:
+	"""
+	kennistrengur -> datafile path (relative to "lokaord/database/data") for every datafile
+	"""
+	index = {}
+	for datafile, _ in manifest.walk_datafiles(handlers.Ord.datafiles_dir):
+		kennistrengur, _ = handlers.read_datafile_tail(
+			os.path.join(handlers.Ord.datafiles_dir, datafile)
+		)
+		index[kennistrengur] = datafile
+	return index
+
+
+def get_fixture_datafiles(index: dict[str, str]) -> list[str]:
+	"""
+	Fixture_Seeds and the first kjarna and samsett orð datafile in each folder, with the orðhlutar
+	and frasi they depend on, transitively
+	"""
+	seeds = list(Fixture_Seeds)
+	for handler in handlers.list_handlers():
+		for folder in handler.get_folders():
+			kjarna_ord, samsett_ord = None, None
+			for datafile in handler.get_files_list(folder):
+				if 'samsett' in handlers.Ord.load_json_fields(datafile):
+					samsett_ord = samsett_ord or datafile
+				else:
+					kjarna_ord = kjarna_ord or datafile
+				if kjarna_ord is not None and samsett_ord is not None:
+					break
+			seeds += [datafile for datafile in (kjarna_ord, samsett_ord) if datafile is not None]
+	datafiles = set()
+	while len(seeds) > 0:
+		datafile = seeds.pop()
+		if datafile in datafiles:
+			continue
+		datafiles.add(datafile)
+		data = handlers.Ord.load_json(datafile)
+		seeds += [index[ohl['kennistrengur']] for ohl in data.get('samsett') or []]
+		seeds += [index[kennistrengur] for kennistrengur in data.get('frasi') or []]
+	return sorted(datafiles)
+
+
+@pytest.fixture(scope='session')
+def fixture_db(tmp_path_factory, datafiles_index) -> list[str]:
+	"""
+	database connection to a database with the datafiles of get_fixture_datafiles imported,
+	returns the list of those datafiles, tests changing the database should restore it
+	"""
+	sqlite_db_file = tmp_path_factory.mktemp('db') / 'db.sqlite'
+	db.setup_connection('sqlite:///%s' % (sqlite_db_file, ))
+	db.init_db()
+	handlers.set_fallbeyging_dedup(False)
+	datafiles = get_fixture_datafiles(datafiles_index)
+	importer.import_list_of_datafiles_to_db(datafiles)
+	yield datafiles
+	db.Session.remove()
+	db.Engine.dispose()
+	db.Engine = None
+	db.Session = None
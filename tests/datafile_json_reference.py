@@ -0,0 +1,72 @@
+#!/usr/bin/python
+"""
+Reference datafile JSON encoder
+
+MyIndentJSONEncoder as it was before dumps_datafile_json, post-processing the tokens of the stdlib
+encoder, kept for differential checks of dumps_datafile_json (see test_datafile_json and
+bin/benchmarks/datafile_json.py).
+"""
+from decimal import Decimal
+import json
+import random
+import string
+
+
+def dumps(data) -> str:
+	return json.dumps(
+		data, indent='\t', ensure_ascii=False, separators=(',', ': '), cls=MyIndentJSONEncoder
+	)
+
+
+class MyIndentJSONEncoder(json.JSONEncoder):
+	'''
+	json encoder for doing a little bit of custom json string indentation
+
+	this encoder class is a complete hack, but the damn thing works and I'm running with it
+	'''
+	r_strengur = ''.join(
+		random.choices(string.ascii_uppercase + string.ascii_lowercase + string.digits, k=20)
+	)
+
+	def default(self, obj):
+		if isinstance(obj, Decimal):
+			return (
+				f'<-FJARLAEGJA_GAESALAPPIR_{self.r_strengur}'
+				f'{obj.normalize():f}'
+				f'FJARLAEGJA_GAESALAPPIR_{self.r_strengur}->'
+			)
+		return super(MyIndentJSONEncoder, self).default(obj)
+
+	def iterencode(self, o, _one_shot=False):
+		list_lvl = 0
+		keys_to_differently_encode = [
+			'ág', 'mg', 'kk', 'kvk', 'hk', 'et', 'ft', 'stýrir', 'fylgiorð', 'beygingar'
+		]
+		state = 0
+		for s in super(MyIndentJSONEncoder, self).iterencode(o, _one_shot=False):
+			if state == 0:
+				if s.startswith('"') and s.endswith('"') and s[1:-1] in keys_to_differently_encode:
+					state += 1
+			elif state == 1:
+				if s == ': ':
+					state += 1
+				else:
+					state = 0
+			elif state == 2:
+				if s.startswith('['):
+					list_lvl += 1
+					s = ''.join([x.strip() for x in s.split('\n')])
+				elif 0 < list_lvl:
+					s = ''.join([x.strip() for x in s.split('\n')])
+					if s and s.startswith(','):
+						s = ', ' + s[1:]
+				if s.endswith(']'):
+					list_lvl -= 1
+					state = 0
+				if s.endswith('}'):
+					state = 0
+			if f'"<-FJARLAEGJA_GAESALAPPIR_{self.r_strengur}' in s:
+				s = s.replace(f'"<-FJARLAEGJA_GAESALAPPIR_{self.r_strengur}', '')
+			if f'FJARLAEGJA_GAESALAPPIR_{self.r_strengur}->"' in s:
+				s = s.replace(f'FJARLAEGJA_GAESALAPPIR_{self.r_strengur}->"', '')
+			yield s
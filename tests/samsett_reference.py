@@ -0,0 +1,130 @@
+#!/usr/bin/python
+"""
+Reference derivation of samsett orð beygingar
+
+The derivation as it was before Ord.prepend_to_beygingar, deep copying beygingar of orðhlutar and
+prepending to them in place, kept for differential checks of Ord.derive_beygingar_from_samsett
+(see test_samsett_derivation and bin/benchmarks/samsett_derivation.py). Orðhlutar are loaded
+through the same orðhluti beygingar cache, which this code never changes.
+"""
+import copy
+
+from lokaord import handlers
+
+
+def load_ord(handler: handlers.Ord, datafile: str) -> handlers.Ord:
+	"""
+	load samsett orð datafile with @handler, with beygingar derived by
+	derive_beygingar_from_samsett instead of Ord.derive_beygingar_from_samsett
+	"""
+	isl_ord = handler()
+	isl_ord.load_from_dict(handlers.Ord.load_json(datafile), datafile, derive_samsett=False)
+	derived = derive_beygingar_from_samsett(isl_ord, isl_ord.data.dict())
+	isl_ord.data = type(isl_ord.data)(**derived)
+	isl_ord.data.datahash = isl_ord.get_data_hash()
+	return isl_ord
+
+
+def derive_beygingar_from_samsett(isl_ord: handlers.Ord, data: dict) -> dict:
+	preserve_keys = ['fleiryrt', 'stýrir']
+	derived = copy.deepcopy(data)
+	# delete current beygingar from orð data
+	for key in data:
+		if key not in isl_ord.non_inherited_keys_via_samsett_ord:
+			del derived[key]
+	derived_beygingar = merge_ordhlutar(isl_ord, derived['samsett'])
+	# add derived beygingar to orð data
+	for key in derived_beygingar:
+		if key in isl_ord.non_inherited_keys_via_samsett_ord:
+			raise ValueError('Should not happen!')
+		derived[key] = derived_beygingar[key]
+	for key in preserve_keys:
+		if key in data:
+			derived[key] = data[key]
+	if data['flokkur'] == 'lýsingarorð' and 'mynd' in data['samsett'][-1]:
+		derived['óbeygjanlegt'] = True
+	return derived
+
+
+def merge_ordhlutar(isl_ord: handlers.Ord, samsett: list[dict]) -> dict:
+	if 'mynd' in samsett[-1]:
+		return {}
+	if 'myndir' in samsett[-1]:
+		beygingar = get_lo_myndir_beygingar(isl_ord, samsett[-1])
+		beygingar = isl_ord.apply_beygingar_filters(beygingar, samsett[-1])
+	else:
+		beygingar = copy.deepcopy(isl_ord.ordhluti_get_beygingar(samsett[-1]))
+	for ordhluti in reversed(samsett[:-1]):
+		if 'mynd' in ordhluti:
+			beygingar = prepend_str_to_dict(isl_ord, ordhluti['mynd'], beygingar)
+		elif 'myndir' in ordhluti:
+			lo_myndir_beygingar = get_lo_myndir_beygingar(isl_ord, ordhluti)
+			beygingar = merge_dict_to_dict(isl_ord, lo_myndir_beygingar, beygingar)
+		else:
+			oh_beygingar = copy.deepcopy(isl_ord.ordhluti_get_beygingar(ordhluti))
+			beygingar = merge_dict_to_dict(isl_ord, oh_beygingar, beygingar)
+	return beygingar
+
+
+def get_lo_myndir_beygingar(isl_ord: handlers.Ord, ordhluti: dict) -> dict:
+	# copies of the fallbeygingar picked by Ord.get_lo_myndir_beygingar, with ág and mg sharing a
+	# list as they did
+	lo_myndir_beygingar = isl_ord.get_lo_myndir_beygingar(ordhluti)
+	fallbeyging_et = list(lo_myndir_beygingar['et']['ág'])
+	fallbeyging_ft = list(lo_myndir_beygingar['ft']['ág'])
+	return {
+		'et': {'ág': fallbeyging_et, 'mg': fallbeyging_et},
+		'ft': {'ág': fallbeyging_ft, 'mg': fallbeyging_ft}
+	}
+
+
+def prepend_str_to_dict(isl_ord: handlers.Ord, ord_str: str, ord_dict: dict) -> dict:
+	for key in ord_dict:
+		if key in isl_ord.unprefixed_keys_via_samsett_ord:
+			continue
+		if isinstance(ord_dict[key], str):
+			ord_dict[key] = '%s%s' % (ord_str, ord_dict[key])
+		elif isinstance(ord_dict[key], list):
+			for i in range(0, len(ord_dict[key])):
+				if ord_dict[key][i] is None:
+					continue
+				elif isinstance(ord_dict[key][i], str):
+					ord_dict[key][i] = '%s%s' % (ord_str, ord_dict[key][i])
+				elif isinstance(ord_dict[key][i], dict):
+					ord_dict[key][i] = prepend_str_to_dict(isl_ord, ord_str, ord_dict[key][i])
+		elif isinstance(ord_dict[key], dict):
+			ord_dict[key] = prepend_str_to_dict(isl_ord, ord_str, ord_dict[key])
+	return ord_dict
+
+
+def merge_dict_to_dict(isl_ord: handlers.Ord, pre_dict: dict, ord_dict: dict) -> dict:
+	for key in ord_dict:
+		if key in isl_ord.unprefixed_keys_via_samsett_ord:
+			continue
+		if key not in pre_dict:
+			raise ValueError('Key "%s" missing from pre_dict.' % (key, ))
+		if isinstance(ord_dict[key], str):
+			if not isinstance(pre_dict[key], str):
+				raise ValueError('Key pre_dict["%s"] should be str.' % (key, ))
+			ord_dict[key] = '%s%s' % (pre_dict[key], ord_dict[key])
+		elif isinstance(ord_dict[key], list):
+			if not isinstance(pre_dict[key], list):
+				raise ValueError('Key pre_dict["%s"] should be list.' % (key, ))
+			for i in range(0, len(ord_dict[key])):
+				if ord_dict[key][i] is None:
+					continue
+				elif isinstance(ord_dict[key][i], str):
+					if not isinstance(pre_dict[key][i], str):
+						raise ValueError('Key pre_dict["%s"][%s] should be str.' % (key, i))
+					ord_dict[key][i] = '%s%s' % (pre_dict[key][i], ord_dict[key][i])
+				elif isinstance(ord_dict[key][i], dict):
+					if not isinstance(pre_dict[key][i], dict):
+						raise ValueError('Key pre_dict["%s"][%s] should be dict.' % (key, i))
+					ord_dict[key][i] = merge_dict_to_dict(
+						isl_ord, pre_dict[key][i], ord_dict[key][i]
+					)
+		elif isinstance(ord_dict[key], dict):
+			if not isinstance(pre_dict[key], dict):
+				raise ValueError('Key pre_dict["%s"] should be dict.' % (key, ))
+			ord_dict[key] = merge_dict_to_dict(isl_ord, pre_dict[key], ord_dict[key])
+	return ord_dict
@@ -0,0 +1,51 @@
+#!/usr/bin/python
+from decimal import Decimal
+import json
+import os
+
+import datafile_json_reference
+import pytest
+
+from lokaord import handlers
+from lokaord import manifest
+
+Edge_Cases = [
+	{},
+	{'et': [], 'ft': {}, 'samsett': []},
+	{'kk': [None, True, False, 1, -2, Decimal('1E+3'), Decimal('0.50'), Decimal('-0.0')]},
+	{'beygingar': ['a"b', 'c\\d', 'e\nf', 'ð­þ', '\x00']},
+	{'et': {'ág': ['hestur', None], 'mg': ['hestinum', '']}},
+	{'gildi': Decimal('3.14'), 'x': [[1, {}], {'y': []}], 'stýrir': {'et': ['þf']}},
+	{'fylgiorð': ['', None], 'ft': [Decimal('2.500')], 'hk': []},
+]
+
+
+def test_datafiles_round_trip():
+	# every datafile on disk is exactly what dumps_datafile_json writes for its parsed data
+	mismatches = []
+	count = 0
+	for datafile, _ in manifest.walk_datafiles(handlers.Ord.datafiles_dir):
+		with open(os.path.join(handlers.Ord.datafiles_dir, datafile), mode='rb') as fi:
+			content = fi.read()
+		data = json.loads(content, parse_float=Decimal)
+		if handlers.dumps_datafile_json(data).encode('utf-8') != content:
+			mismatches.append(datafile)
+		count += 1
+	assert count > 0
+	assert mismatches == []
+
+
+@pytest.mark.parametrize('data', Edge_Cases)
+def test_matches_reference(data):
+	assert handlers.dumps_datafile_json(data) == datafile_json_reference.dumps(data)
+
+
+def test_nested_in_inline_list():
+	# differs from the reference encoder, see dumps_datafile_json
+	data = {'beygingar': [{'a': 1}, {'b': [1, Decimal('2.0')]}], 'ft': [['a'], []]}
+	assert handlers.dumps_datafile_json(data) == (
+		'{\n\t"beygingar": [{"a": 1}, {"b": [1, 2]}],\n\t"ft": [["a"], []]\n}'
+	)
+	assert datafile_json_reference.dumps({'beygingar': [{'a': 1}], 'ft': [['a']]}) == (
+		'{\n\t"beygingar": [{"a":1}\n\t],\n\t"ft": [["a"]\n\t]\n}'
+	)
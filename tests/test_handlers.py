@@ -0,0 +1,95 @@
+#!/usr/bin/python
+from contextlib import contextmanager
+
+import sqlalchemy
+
+from lokaord import handlers
+from lokaord import importer
+from lokaord.database import db
+from lokaord.database.models import isl
+
+
+# most queries load_from_db may run for one orð, with derived orðhluti beygingar cached, the
+# orðflokkur record, one IN query per beygingar table and for samsett orð the orðhluti chain
+Load_From_Db_Max_Queries = {'Sagnord': 3}
+Load_From_Db_Max_Queries_Default = 2
+
+
+@contextmanager
+def count_queries():
+	counter = {'queries': 0}
+
+	def count_query(*args):
+		counter['queries'] += 1
+	sqlalchemy.event.listen(db.Engine, 'before_cursor_execute', count_query)
+	try:
+		yield counter
+	finally:
+		sqlalchemy.event.remove(db.Engine, 'before_cursor_execute', count_query)
+
+
+def load_ord(datafile: str) -> handlers.Ord:
+	fields = handlers.Ord.load_json_fields(datafile)
+	isl_ord = handlers.get_handlers_map()[fields['flokkur']]()
+	isl_ord.load_from_file(datafile)
+	return isl_ord
+
+
+def test_ordhluti_beygingar_invalidated_transitively(fixture_db):
+	# Afríkuútgerð <- útgerð (samsett) <- gerð, cached beygingar of útgerð are derived from gerð
+	afrikuutgerd = 'nafnord/Afríkuútgerð-kvk.json'
+	gerd = 'nafnord/gerð-kvk.json'
+	assert load_ord(afrikuutgerd).data.et.ág[0] == 'Afríkuútgerð'
+	isl_gerd = load_ord(gerd)
+	isl_gerd.data.et.ág[0] = 'gjörð'
+	isl_gerd.data.datahash = isl_gerd.get_data_hash()
+	try:
+		importer.write_to_db(isl_gerd)
+		assert load_ord(afrikuutgerd).data.et.ág[0] == 'Afríkuútgjörð'
+	finally:
+		importer.write_to_db(load_ord(gerd))
+	assert load_ord(afrikuutgerd).data.et.ág[0] == 'Afríkuútgerð'
+
+
+def test_filename_from_db_matches_datafile(fixture_db):
+	handlers_map = handlers.get_handlers_map()
+	datafiles = set()
+	for isl_ord_record in db.Session.query(isl.Ord):
+		handler = handlers_map[isl_ord_record.Ordflokkur.name]
+		datafiles.add(handler().load_filename_from_db(isl_ord_record))
+	assert datafiles == set(
+		datafile for datafile in fixture_db if not datafile.startswith('skammstafanir')
+	)
+
+
+def test_load_from_db_query_count(fixture_db):
+	handlers_map = handlers.get_handlers_map()
+	isl_ord_records = db.Session.query(isl.Ord).order_by(isl.Ord.Ord_id).all()
+	for isl_ord_record in isl_ord_records:  # fill orðhluti beygingar cache
+		handlers_map[isl_ord_record.Ordflokkur.name]().load_from_db(isl_ord_record)
+	for isl_ord_record in isl_ord_records:
+		handler = handlers_map[isl_ord_record.Ordflokkur.name]
+		with count_queries() as counter:
+			handler().load_from_db(isl_ord_record)
+		assert counter['queries'] <= Load_From_Db_Max_Queries.get(
+			handler.__name__, Load_From_Db_Max_Queries_Default
+		), isl_ord_record.Kennistrengur
+
+
+def test_prefetched_ord_range(fixture_db):
+	handlers_map = handlers.get_handlers_map()
+	isl_ord_records = db.Session.query(isl.Ord).order_by(isl.Ord.Ord_id).all()
+	datahashes = []
+	for isl_ord_record in isl_ord_records:
+		isl_ord = handlers_map[isl_ord_record.Ordflokkur.name]()
+		isl_ord.load_from_db(isl_ord_record)
+		datahashes.append(isl_ord.data.datahash)
+	ord_id_range = (isl_ord_records[0].Ord_id, isl_ord_records[-1].Ord_id)
+	with count_queries() as counter, handlers.prefetched_ord_range(ord_id_range):
+		for index, isl_ord_record in enumerate(isl_ord_records):
+			isl_ord = handlers_map[isl_ord_record.Ordflokkur.name]()
+			isl_ord.load_from_db(isl_ord_record)
+			assert isl_ord.data.datahash == datahashes[index], isl_ord_record.Kennistrengur
+	# orðflokkur records, Fallbeyging and Sagnbeyging rows, orðhlutar and fleiryrt samtengingar,
+	# the range being small
+	assert counter['queries'] <= len(handlers.Ordflokkur_Models) + 4
@@ -0,0 +1,145 @@
+#!/usr/bin/python
+import collections
+import concurrent.futures
+import datetime
+import multiprocessing
+import os
+import time
+
+import pytest
+import sqlalchemy
+
+from lokaord import handlers
+from lokaord import importer
+from lokaord import logman
+from lokaord import pipeline
+from lokaord.database import db
+from lokaord.database.models import isl
+
+Datafiles = [
+	(handlers.Nafnord, 'nafnord/gerð-kvk.json'),
+	(handlers.Nafnord, 'nafnord/útgerð-kvk.json'),
+	(handlers.Lysingarord, 'lysingarord/afbragðsgóður.json'),
+	(handlers.Lysingarord, 'lysingarord/góður.json'),
+]
+
+
+@pytest.mark.parametrize('jobs,skip', [(1, 0), (2, 0), (1, None)])
+def test_only_samsett_ord_documents_kept_after_loading_kjarna_ord(jobs, skip):
+	# kjarna orð documents are either handed out to load_json or not loaded in this process
+	with (
+		handlers.datafile_cache(),
+		concurrent.futures.ProcessPoolExecutor(
+			max_workers=jobs, mp_context=multiprocessing.get_context('spawn'),
+			initializer=importer.init_worker, initargs=(logman.Logger.level, )
+		) as executor
+	):
+		samsett_tasks = []
+		loaded = list(importer.validate_kjarna_ord_datafiles(
+			importer.parse_kjarna_ord_datafiles(Datafiles, samsett_tasks, jobs == 1, skip),
+			executor if jobs > 1 else None, jobs
+		))
+		assert [isl_ord.data.kennistrengur for isl_ord in loaded] == (
+			['no-gerð-kvk', 'lo-góður'] if skip is not None else []
+		)
+		assert [task['file'] for task in samsett_tasks] == [
+			'nafnord/útgerð-kvk.json', 'lysingarord/afbragðsgóður.json'
+		]
+		assert set(handlers.Datafile_Documents) == set(
+			os.path.join(handlers.Ord.datafiles_dir, task['file']) for task in samsett_tasks
+		)
+		assert len(handlers.Datafile_Fields) == len(Datafiles)
+
+
+def test_dependent_samsett_tasks(fixture_db):
+	tasks = importer.get_dependent_samsett_tasks([
+		'nafnord/gerð-kvk.json', 'nafnord/útgerð-kvk.json'
+	])
+	assert [task['file'] for task in tasks] == ['nafnord/Afríkuútgerð-kvk.json']
+	assert all(task['dependent'] is True for task in tasks)
+
+
+def test_missing_datahash_backfilled_without_edit(fixture_db):
+	# as after use-backup, where Datahash is added to the restored database without data
+	tables = [isl.Ord.__table__, isl.Skammstofun.__table__]
+	edited = datetime.datetime(2000, 1, 1)
+	datahashes = {}
+	for table in tables:
+		datahashes[table.name] = db.Session.execute(
+			sqlalchemy.select(table.c.Kennistrengur, table.c.Datahash, table.c.Edited)
+		).all()
+		db.Session.execute(sqlalchemy.update(table).values(Datahash=None, Edited=edited))
+	db.Session.commit()
+	db.Session.expire_all()
+	try:
+		for _ in range(2):
+			importer.import_list_of_datafiles_to_db(fixture_db)
+			db.Session.expire_all()
+			for table in tables:
+				rows = db.Session.execute(
+					sqlalchemy.select(table.c.Kennistrengur, table.c.Datahash, table.c.Edited)
+				).all()
+				assert len(rows) > 0
+				assert set((row[0], row[1]) for row in rows) == set(
+					(row[0], row[1]) for row in datahashes[table.name]
+				)
+				assert all(row[2] == edited for row in rows)
+	finally:
+		for table in tables:
+			for kennistrengur, _, original_edited in datahashes[table.name]:
+				db.Session.execute(sqlalchemy.update(table).where(
+					table.c.Kennistrengur == kennistrengur
+				).values(Edited=original_edited))
+		db.Session.commit()
+		db.Session.expire_all()
+
+
+class SlowLookupDocuments(collections.OrderedDict):
+	"""
+	datafile cache documents giving other threads a turn within membership checks, so a stage
+	checking for a document and then taking it out races the parse stage evicting it
+	"""
+
+	def __contains__(self, key):
+		found = super().__contains__(key)
+		time.sleep(0.001)
+		return found
+
+
+def test_pipeline_with_small_doc_cache():
+	# parse stage runs ahead of the validate stage by up to Pipeline_Queue_Size datafiles, evicting
+	# documents from the datafile cache while load_json in the validate stage takes them out
+	datafiles = []
+	for handler in (handlers.Nafnord, handlers.Lysingarord):
+		kjarna_ord_count = 0
+		for datafile in handler.get_files_list(handler.get_folders()[0]):
+			datafiles.append((handler, datafile))
+			if 'samsett' not in handlers.Ord.load_json_fields(datafile):
+				kjarna_ord_count += 1
+			if kjarna_ord_count == 500:
+				break
+	with handlers.datafile_cache(documents_size=8):
+		handlers.Datafile_Documents = SlowLookupDocuments()
+		samsett_tasks = []
+		import_pipeline = pipeline.Pipeline(datafiles, queue_size=importer.Pipeline_Queue_Size)
+		import_pipeline.add_stage('parse', lambda datafiles: (
+			importer.parse_kjarna_ord_datafiles(datafiles, samsett_tasks)
+		))
+		import_pipeline.add_stage('validate', importer.validate_kjarna_ord_datafiles)
+		with import_pipeline:
+			loaded = [isl_ord.filename for isl_ord in import_pipeline]
+		assert len(handlers.Datafile_Fields) == len(datafiles)
+	assert len(loaded) > 0
+	assert len(loaded) + len(samsett_tasks) == len(datafiles)
+
+
+def test_samsett_cycles_through_one_node():
+	# A -> B -> A and A -> C -> A, D depends on the cycles without being on one
+	samsett = {'A': ['B', 'C'], 'B': ['A'], 'C': ['x', 'A'], 'D': ['A'], 'E': ['E']}
+	tasks = [
+		{'kennistrengur': kennistrengur, 'samsett_kennistrengir': ordhlutar}
+		for kennistrengur, ordhlutar in samsett.items()
+	]
+	kennistrengur_to_index = dict((task['kennistrengur'], i) for i, task in enumerate(tasks))
+	cycles = importer.find_samsett_cycles(tasks, kennistrengur_to_index, [1] * len(tasks))
+	assert cycles == [['A', 'B', 'A'], ['C', 'A', 'C'], ['E', 'E']]
@@ -0,0 +1,58 @@
+#!/usr/bin/python
+import copy
+
+import samsett_reference
+
+from lokaord import handlers
+
+
+def get_samsett_datafiles(datafiles: list[str]) -> list[tuple[handlers.Ord, str]]:
+	handlers_map = handlers.get_handlers_map()
+	samsett_datafiles = []
+	for datafile in datafiles:
+		fields = handlers.Ord.load_json_fields(datafile)
+		if 'samsett' in fields:
+			samsett_datafiles.append((handlers_map[fields['flokkur']], datafile))
+	return samsett_datafiles
+
+
+def test_derivation_matches_reference(fixture_db):
+	samsett_datafiles = get_samsett_datafiles(fixture_db)
+	assert len(samsett_datafiles) > 0
+	for handler, datafile in samsett_datafiles:
+		isl_ord = handler()
+		isl_ord.load_from_file(datafile)
+		assert isl_ord.data.datahash == (
+			samsett_reference.load_ord(handler, datafile).data.datahash
+		), datafile
+
+
+def test_derivation_leaves_cached_beygingar_unchanged(fixture_db):
+	# derived beygingar are built from beygingar in the orðhluti beygingar cache without copying
+	# them, changing derived beygingar in place must not reach the cache
+	samsett_datafiles = get_samsett_datafiles(fixture_db)
+	loaded = []
+	for handler, datafile in samsett_datafiles:
+		isl_ord = handler()
+		isl_ord.load_from_file(datafile)
+		loaded.append(isl_ord.data.dict())
+	cache = copy.deepcopy(handlers.Ordhluti_Beygingar_Cache)
+	assert len(cache) > 0
+	for index, (handler, datafile) in enumerate(samsett_datafiles):
+		isl_ord = handler()
+		isl_ord.load_from_file(datafile)
+		assert isl_ord.data.dict() == loaded[index], datafile
+		scribble(isl_ord.derive_beygingar_from_samsett(isl_ord.data.dict()))
+	assert handlers.Ordhluti_Beygingar_Cache == cache
+
+
+def scribble(value):
+	"""
+	change every str within lists and dicts of @value in place
+	"""
+	items = value.items() if isinstance(value, dict) else enumerate(value)
+	for key, item in list(items):
+		if isinstance(item, str):
+			value[key] = '~%s' % (item, )
+		elif isinstance(item, (dict, list)):
+			scribble(item)